@@ -0,0 +1,9 @@
+"""
+API 벤치마크
+
+    python -m benchmarks run --tasks 2000 --iterations 50 --output before.json
+    python -m benchmarks compare before.json after.json
+
+임시 SQLite DB 에 bulk 경로(tasks.seeds)로 데이터를 만들고,
+tasks/urls.py, users/urls.py 의 모든 엔드포인트를 Django test client 와 실제 서버(wsgiref)로 호출합니다.
+"""
@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import sys
+
+from .dataset import seed_dataset, setup_django
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="데이터를 만들고 모든 엔드포인트를 측정합니다.")
+    run.add_argument("--users", type=int, default=50)
+    run.add_argument("--tasks", type=int, default=2000)
+    run.add_argument("--subtasks", type=int, default=3, help="task 당 subtask 수")
+    run.add_argument("--iterations", type=int, default=30, help="엔드포인트 당 요청 수")
+    run.add_argument("--concurrency", type=int, default=1, help="동시에 요청하는 클라이언트 수")
+    run.add_argument(
+        "--mode",
+        choices=["client", "server", "both"],
+        default="both",
+        help="client: Django test client, server: 실제 HTTP 서버(wsgiref)",
+    )
+    run.add_argument("--only", action="append", help="label 에 이 문자열이 포함된 엔드포인트만")
+    run.add_argument("--output", "-o", help="결과 JSON 파일 (기본: 표준 출력)")
+    run.add_argument("--database", help="SQLite 파일 경로 (기본: 임시 파일, 끝나면 삭제)")
+    run.add_argument(
+        "--allow-errors",
+        action="store_true",
+        help="오류 응답이 있어도 실패(exit 1)로 끝내지 않습니다.",
+    )
+
+    compare = commands.add_parser("compare", help="두 결과 JSON 을 비교합니다.")
+    compare.add_argument("before")
+    compare.add_argument("after")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+
+    if options.command == "compare":
+        from .runner import compare
+
+        with open(options.before) as before, open(options.after) as after:
+            compare(json.load(before), json.load(after))
+        return
+
+    database = setup_django(options.database)
+    try:
+        from .endpoints import ENDPOINTS
+        from .runner import failed_endpoints, metadata, run
+
+        log = lambda message: print(message, file=sys.stderr)  # noqa: E731
+        log(f"seeding {options.users} users, {options.tasks} tasks ...")
+        ctx = seed_dataset(options.users, options.tasks, options.subtasks)
+
+        endpoints = [
+            endpoint
+            for endpoint in ENDPOINTS
+            if not options.only or any(name in endpoint.label for name in options.only)
+        ]
+        modes = ["client", "server"] if options.mode == "both" else [options.mode]
+        results = run(endpoints, ctx, modes, options.iterations, options.concurrency, log=log)
+
+        report = json.dumps(
+            {"meta": metadata(options, ctx), "results": results},
+            ensure_ascii=False,
+            indent=2,
+        )
+        if options.output:
+            with open(options.output, "w", encoding="utf-8") as output:
+                output.write(report + "\n")
+        else:
+            print(report)
+
+        failed = failed_endpoints(results)
+        if failed:
+            # 오류 응답은 시간 통계에서 빠지므로 요청 수가 줄어든 결과입니다.
+            log("오류 응답이 있는 엔드포인트: " + ", ".join(f"[{mode}] {label}" for mode, label in failed))
+            if not options.allow_errors:
+                sys.exit(1)
+    finally:
+        if options.database is None:
+            from django.db import connections
+
+            connections.close_all()
+            os.remove(database)
+
+
+if __name__ == "__main__":
+    main()
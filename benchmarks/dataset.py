@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+BENCH_PASSWORD = "benchpassword"
+
+
+def setup_django(database=None):
+    """
+    벤치마크 전용 SQLite 파일을 사용하도록 설정한 뒤 django.setup() 합니다.
+    저장소에 migration 이 없으므로 migrate --run-syncdb 로 테이블을 만듭니다.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+    if database is None:
+        handle, database = tempfile.mkstemp(prefix="bench-", suffix=".sqlite3")
+        os.close(handle)
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = database
+    # 서버 스레드와 동시에 쓰는 경우 잠금을 기다리도록 합니다.
+    settings.DATABASES["default"].setdefault("OPTIONS", {})["timeout"] = 30
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    return database
+
+
+def seed_dataset(users, tasks, subtasks_per_task):
+    """
+    bulk_create 경로로 데이터를 만들고 벤치마크에서 사용할 값을 반환합니다.
+    유저 비밀번호 해시는 한 번만 계산합니다.
+    """
+    from tasks.models import Task, SubTask
+    from tasks.seeds import seed
+
+    seeded = seed(
+        users=users,
+        tasks=tasks,
+        subtasks_per_task=subtasks_per_task,
+        prefix="bench",
+        password=BENCH_PASSWORD,
+    )
+    user = seeded["users"][0]
+    task_pks = list(
+        Task.objects.filter(create_user=user).order_by("pk").values_list("pk", flat=True)[:50]
+    )
+    subtask_pairs = list(
+        SubTask.objects.filter(task_id__in=task_pks)
+        .order_by("pk")
+        .values_list("task_id", "pk")[:50]
+    )
+    if not subtask_pairs:
+        raise ValueError("subtask 가 있어야 합니다. --subtasks 를 1 이상으로 지정해주세요.")
+    return {
+        "username": user.username,
+        "password": BENCH_PASSWORD,
+        "user_pk": user.pk,
+        "team": user.team,
+        "task_pks": task_pks,
+        "subtask_pairs": subtask_pairs,
+        "counts": {
+            "users": len(seeded["users"]),
+            "teams": len(seeded["teams"]),
+            "tasks": len(seeded["tasks"]),
+            "subtasks": len(seeded["subtasks"]),
+        },
+    }
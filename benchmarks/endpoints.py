@@ -0,0 +1,212 @@
+import itertools
+import threading
+
+from django.urls import reverse
+
+_unique = itertools.count()
+_unique_lock = threading.Lock()
+
+
+def unique():
+    with _unique_lock:
+        return next(_unique)
+
+
+class Endpoint:
+    """
+    벤치마크할 요청 하나
+
+    setup(ctx, transport, index) 는 측정 전에 실행되어 요청에 필요한 상태(새 task 등)를 만듭니다.
+    args / query / data 는 (ctx, state, index) 를 받아 URL 인자, 쿼리 문자열, 요청 본문을 만듭니다.
+    inline_setup 이면 setup 을 요청 직전에 실행합니다. (로그아웃 전에 다시 로그인하는 경우)
+    """
+
+    def __init__(
+        self,
+        label,
+        url_name,
+        method="GET",
+        args=None,
+        query=None,
+        data=None,
+        setup=None,
+        login=True,
+        inline_setup=False,
+        max_iterations=None,
+    ):
+        self.label = label
+        self.url_name = url_name
+        self.method = method
+        self.args = args
+        self.query = query
+        self.data = data
+        self.setup = setup
+        self.login = login
+        self.inline_setup = inline_setup
+        self.max_iterations = max_iterations
+
+    def prepare(self, ctx, transport, index):
+        state = self.setup(ctx, transport, index) if self.setup else None
+        path = reverse(self.url_name, args=self.args(ctx, state, index) if self.args else None)
+        if self.query:
+            path += self.query(ctx, state, index)
+        data = self.data(ctx, state, index) if self.data else None
+        return path, data
+
+
+# 측정 전에 만드는 데이터
+
+
+def fresh_task(ctx, subtasks=0):
+    from tasks.models import Task, SubTask, Team
+
+    task = Task.objects.create(
+        title=f"bench task {unique()}",
+        content="bench",
+        create_user_id=ctx["user_pk"],
+    )
+    team = Team.objects.get(name=ctx["team"])
+    for _ in range(subtasks):
+        subtask = SubTask.objects.create(
+            task=task,
+            subtask_create_user_id=ctx["user_pk"],
+            sub_title="bench subtask",
+            sub_content="bench",
+        )
+        subtask.team.add(team)
+    return task
+
+
+def fresh_subtask(ctx):
+    return fresh_task(ctx, subtasks=1).subtasks.get()
+
+
+# seed 한 공유 행은 조회 / 수정처럼 행을 지우거나 늘리지 않는 요청에서만 사용합니다.
+# 삭제, 완료 처리, subtask 추가는 요청마다 fresh_task / fresh_subtask 로 만든 행을 사용해서
+# 다른 요청이 이미 바꾼 행(404 등)을 측정하지 않도록 합니다.
+
+
+def task_pk(ctx, state, index):
+    return [ctx["task_pks"][index % len(ctx["task_pks"])]]
+
+
+def subtask_pair(ctx, state, index):
+    return list(ctx["subtask_pairs"][index % len(ctx["subtask_pairs"])])
+
+
+def login(ctx, transport, index):
+    transport.login(ctx["username"], ctx["password"])
+
+
+TASK_ENDPOINTS = [
+    Endpoint("task-list", "task-list"),
+    Endpoint("task-list?team", "task-list", query=lambda ctx, state, index: f"?team={ctx['team']}"),
+    Endpoint("task-team-list", "task-team-list"),
+    Endpoint("task-create GET", "task-create"),
+    Endpoint(
+        "task-create POST",
+        "task-create",
+        method="POST",
+        data=lambda ctx, state, index: {"title": f"bench {index}", "content": "bench"},
+    ),
+    # 전체 동기화/내보내기는 데이터 전체를 읽으므로 반복 횟수를 줄입니다.
+    Endpoint("task-changes", "task-changes", max_iterations=5),
+    Endpoint("task-export", "task-export", max_iterations=5),
+    Endpoint("task-search", "task-search", query=lambda ctx, state, index: "?q=Task+7"),
+    Endpoint(
+        "task-search?team",
+        "task-search",
+        query=lambda ctx, state, index: f"?q=Task+7&team={ctx['team']}",
+    ),
+    Endpoint(
+        "subtask-bulk-complete POST",
+        "subtask-bulk-complete",
+        method="POST",
+        setup=lambda ctx, transport, index: fresh_task(ctx, subtasks=5),
+        data=lambda ctx, task, index: {
+            "subtask_pks": list(task.subtasks.values_list("pk", flat=True)),
+            "is_complete": True,
+        },
+    ),
+    Endpoint("task-detail GET", "task-detail", args=task_pk),
+    Endpoint(
+        "task-detail PUT",
+        "task-detail",
+        method="PUT",
+        args=task_pk,
+        data=lambda ctx, state, index: {"title": f"bench 수정 {index}"},
+    ),
+    Endpoint(
+        "task-detail DELETE",
+        "task-detail",
+        method="DELETE",
+        setup=lambda ctx, transport, index: fresh_task(ctx, subtasks=2),
+        args=lambda ctx, task, index: [task.pk],
+    ),
+    Endpoint("subtask-list", "subtask-list", args=task_pk),
+    Endpoint("new-subtask GET", "new-subtask", args=task_pk),
+    Endpoint(
+        "new-subtask POST",
+        "new-subtask",
+        method="POST",
+        setup=lambda ctx, transport, index: fresh_task(ctx),
+        args=lambda ctx, task, index: [task.pk],
+        data=lambda ctx, state, index: {
+            "sub_title": f"bench {index}",
+            "sub_content": "bench",
+            "team": [ctx["team"]],
+        },
+    ),
+    Endpoint(
+        "bulk-subtask POST",
+        "bulk-subtask",
+        method="POST",
+        setup=lambda ctx, transport, index: fresh_task(ctx),
+        args=lambda ctx, task, index: [task.pk],
+        data=lambda ctx, task, index: [
+            {"sub_title": f"bench {number}", "team": [ctx["team"]]} for number in range(10)
+        ],
+    ),
+    Endpoint("subtask-detail GET", "subtask-detail", args=subtask_pair),
+    Endpoint(
+        "subtask-detail PUT",
+        "subtask-detail",
+        method="PUT",
+        args=subtask_pair,
+        data=lambda ctx, state, index: {"sub_title": f"bench 수정 {index}"},
+    ),
+    Endpoint(
+        "subtask-detail DELETE",
+        "subtask-detail",
+        method="DELETE",
+        setup=lambda ctx, transport, index: fresh_subtask(ctx),
+        args=lambda ctx, subtask, index: [subtask.task_id, subtask.pk],
+    ),
+]
+
+USER_ENDPOINTS = [
+    Endpoint("signup GET", "signup", login=False),
+    Endpoint(
+        "signup POST",
+        "signup",
+        method="POST",
+        login=False,
+        data=lambda ctx, state, index: {
+            "username": f"benchsignup{unique()}",
+            "password": "benchpassword",
+            "team": ctx["team"],
+        },
+    ),
+    Endpoint("login GET", "login", login=False),
+    Endpoint(
+        "login POST",
+        "login",
+        method="POST",
+        login=False,
+        data=lambda ctx, state, index: {"username": ctx["username"], "password": ctx["password"]},
+    ),
+    Endpoint("logout GET", "logout"),
+    Endpoint("logout POST", "logout", method="POST", setup=login, inline_setup=True),
+]
+
+ENDPOINTS = TASK_ENDPOINTS + USER_ENDPOINTS
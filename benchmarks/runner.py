@@ -0,0 +1,210 @@
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.db import connection
+
+from config.metrics import registry
+
+setup_lock = threading.Lock()
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def queries_per_request(endpoint):
+    """
+    MetricsMiddleware 가 URL 이름 별로 기록한 쿼리 수 평균
+    (실제 서버에서도 같은 프로세스의 서버 스레드에서 기록되므로 그대로 읽을 수 있습니다.)
+    """
+    histogram = registry.histogram("http_request_db_queries", endpoint.url_name, endpoint.method)
+    _, total, count = histogram.snapshot()
+    return round(total / count, 2) if count else None
+
+
+def is_error(status):
+    return not str(status).isdigit() or int(status) >= 400
+
+
+def run_endpoint(endpoint, ctx, make_transport, iterations, concurrency):
+    iterations = min(iterations, endpoint.max_iterations or iterations)
+    workers = min(concurrency, iterations)
+    per_worker = [iterations // workers + (index < iterations % workers) for index in range(workers)]
+    ready = threading.Barrier(workers + 1)
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def worker(worker_index):
+        transport = make_transport()
+        try:
+            offset = sum(per_worker[:worker_index])
+            prepared = []
+            try:
+                # SQLite 는 동시에 쓰면 잠금 오류가 나므로 측정하지 않는 준비 단계는 한 워커씩 실행합니다.
+                with setup_lock:
+                    if endpoint.login:
+                        transport.login(ctx["username"], ctx["password"])
+                    if not endpoint.inline_setup:
+                        prepared = [
+                            endpoint.prepare(ctx, transport, offset + number)
+                            for number in range(per_worker[worker_index])
+                        ]
+            except BaseException:
+                # 준비 중 실패하면 다른 워커가 barrier 에서 기다리지 않도록 합니다.
+                ready.abort()
+                raise
+            ready.wait()
+
+            for number in range(per_worker[worker_index]):
+                if endpoint.inline_setup:
+                    path, data = endpoint.prepare(ctx, transport, offset + number)
+                else:
+                    path, data = prepared[number]
+                start = time.perf_counter()
+                try:
+                    status = transport.request(endpoint.method, path, data)
+                except Exception as error:
+                    status = type(error).__name__
+                elapsed = time.perf_counter() - start
+                with lock:
+                    # 오류 응답(404, 잠금 오류 등)은 시간 통계에 넣지 않고 따로 셉니다.
+                    if not is_error(status):
+                        latencies.append(elapsed)
+                    statuses[str(status)] = statuses.get(str(status), 0) + 1
+        finally:
+            transport.close()
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(worker, index) for index in range(workers)]
+        try:
+            ready.wait()
+        except threading.BrokenBarrierError:
+            # barrier 를 깨뜨린 워커의 예외를 보여줍니다.
+            for future in futures:
+                error = future.exception()
+                if error is not None and not isinstance(error, threading.BrokenBarrierError):
+                    raise error
+            raise
+        # 로그인, 데이터 준비가 끝난 뒤부터 측정합니다.
+        registry.clear()
+        start = time.perf_counter()
+        for future in futures:
+            future.result()
+        wall = time.perf_counter() - start
+
+    errors = sum(count for status, count in statuses.items() if is_error(status))
+    return {
+        "method": endpoint.method,
+        "url_name": endpoint.url_name,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "statuses": statuses,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+        "queries_per_request": queries_per_request(endpoint),
+    }
+
+
+def format_ms(value):
+    return f"{value:>9.2f}ms" if value is not None else f"{'-':>11}"
+
+
+def failed_endpoints(results):
+    """
+    오류 응답이 있었던 (mode, label) 목록
+    """
+    return [
+        (mode, label)
+        for mode, endpoints in results.items()
+        for label, result in endpoints.items()
+        if result["errors"]
+    ]
+
+
+def run(endpoints, ctx, modes, iterations, concurrency, log=print):
+    from .transports import BenchServer, ClientTransport, ServerTransport
+
+    results = {}
+    for mode in modes:
+        results[mode] = {}
+        if mode == "client":
+            server = None
+            make_transport = ClientTransport
+        else:
+            server = BenchServer().__enter__()
+            make_transport = lambda: ServerTransport(server.port)  # noqa: E731
+        try:
+            for endpoint in endpoints:
+                result = run_endpoint(endpoint, ctx, make_transport, iterations, concurrency)
+                results[mode][endpoint.label] = result
+                log(
+                    f"[{mode}] {endpoint.label:<28} p50 {format_ms(result['p50_ms'])}  "
+                    f"p99 {format_ms(result['p99_ms'])}  {result['throughput_rps']:>8.1f} req/s  "
+                    f"queries {result['queries_per_request']}  errors {result['errors']}"
+                    + (f"  !! {result['statuses']}" if result["errors"] else "")
+                )
+        finally:
+            if server is not None:
+                server.__exit__(None, None, None)
+    return results
+
+
+def metadata(options, ctx):
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "dataset": ctx["counts"],
+        "iterations": options.iterations,
+        "concurrency": options.concurrency,
+    }
+
+
+def compare(before, after, log=print):
+    """
+    두 결과 파일의 p50 / p95 / 쿼리 수를 비교합니다.
+    """
+    log(f"before {before['meta'].get('commit')}  ->  after {after['meta'].get('commit')}")
+    for mode, endpoints in after["results"].items():
+        for label, result in endpoints.items():
+            previous = before["results"].get(mode, {}).get(label)
+            if previous is None:
+                continue
+            changes = []
+            for key in ("p50_ms", "p95_ms"):
+                if previous[key] and result[key]:
+                    changes.append(f"{key} {(result[key] - previous[key]) / previous[key]:+.1%}")
+            if previous["queries_per_request"] != result["queries_per_request"]:
+                changes.append(
+                    f"queries {previous['queries_per_request']} -> {result['queries_per_request']}"
+                )
+            if previous.get("errors") or result.get("errors"):
+                changes.append(f"errors {previous.get('errors')} -> {result.get('errors')}")
+            log(f"[{mode}] {label:<28} {'  '.join(changes)}")
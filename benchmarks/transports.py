@@ -0,0 +1,116 @@
+import http.client
+import json
+import threading
+from http.cookies import SimpleCookie
+
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+from django.urls import reverse
+
+
+class ClientTransport:
+    """
+    Django test client 로 요청합니다. (네트워크, WSGI 서버 비용 제외)
+    """
+
+    name = "client"
+
+    def __init__(self):
+        self.client = Client()
+
+    def login(self, username, password):
+        self.request("POST", reverse("login"), {"username": username, "password": password})
+
+    def request(self, method, path, data=None):
+        kwargs = {}
+        if data is not None:
+            kwargs = {"data": json.dumps(data), "content_type": "application/json"}
+        response = getattr(self.client, method.lower())(path, **kwargs)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class BenchServer:
+    """
+    wsgiref 기반 Django 개발 서버(요청마다 스레드)를 백그라운드 스레드에서 실행합니다.
+    """
+
+    def __init__(self):
+        self.httpd = ThreadedWSGIServer(("127.0.0.1", 0), QuietRequestHandler)
+        self.httpd.set_app(get_wsgi_application())
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class ServerTransport:
+    """
+    실제 HTTP 로 요청합니다. 세션 / CSRF 쿠키를 직접 관리합니다.
+    """
+
+    name = "server"
+
+    def __init__(self, port):
+        self.port = port
+        self.connection = None
+        self.cookies = SimpleCookie()
+
+    def login(self, username, password):
+        self.request("POST", reverse("login"), {"username": username, "password": password})
+
+    def request(self, method, path, data=None):
+        headers = {"Host": "127.0.0.1"}
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode()
+            headers["Content-Type"] = "application/json"
+        if self.cookies:
+            headers["Cookie"] = "; ".join(
+                f"{name}={morsel.value}" for name, morsel in self.cookies.items()
+            )
+            if "csrftoken" in self.cookies:
+                headers["X-CSRFToken"] = self.cookies["csrftoken"].value
+
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+            try:
+                self.connection.request(method, path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # 서버가 keep-alive 연결을 닫은 경우 한 번 다시 연결합니다.
+                self.close()
+                if attempt:
+                    raise
+
+        for header in response.headers.get_all("Set-Cookie") or []:
+            self.cookies.load(header)
+        # 삭제 API 는 204 응답에도 본문({"message": ...})을 보내는데, http.client 는 204 / 304 의 본문을 읽지 않습니다.
+        # 남은 본문을 다음 응답으로 읽으면 BadStatusLine 으로 요청을 다시 보내게 되므로(이미 지운 행 → 404) 연결을 닫습니다.
+        if response.getheader("Connection", "").lower() == "close" or response.status in (204, 304):
+            self.close()
+        return response.status
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
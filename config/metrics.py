@@ -0,0 +1,236 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+# 요청 하나 동안의 쿼리 수, DB 시간을 모으는 객체
+# async view 의 ORM 은 다른 스레드에서 실행되므로 스레드 로컬 대신 contextvar 를 사용합니다.
+_current_request = ContextVar("request_metrics", default=None)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    """
+    누적 bucket 카운트와 합계만 보관하는 고정 bucket 히스토그램
+    observe 는 bisect 한 번과 정수 덧셈이므로 요청마다 호출해도 부담이 적습니다.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class MetricsRegistry:
+    """
+    (metric 이름, endpoint, method) 별 히스토그램 모음
+    """
+
+    metrics = {
+        "http_request_duration_seconds": ("요청 처리 시간(wall time)", DURATION_BUCKETS),
+        "http_request_db_queries": ("요청 당 SQL 쿼리 수", QUERY_BUCKETS),
+        "http_request_db_duration_seconds": ("요청 당 SQL 실행 시간 합계", DURATION_BUCKETS),
+        "http_request_serialization_duration_seconds": (
+            "응답 렌더링(JSON 직렬화) 시간",
+            DURATION_BUCKETS,
+        ),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._gauges = {}
+
+    def register_gauge(self, name, help_text, func, kind="gauge"):
+        """
+        render 할 때 func() 로 현재 값을 읽는 지표 (대기열 길이 등)
+        kind 는 Prometheus TYPE 입니다. (누적 값이면 counter)
+        """
+        with self._lock:
+            self._gauges[name] = (help_text, kind, func)
+
+    def histogram(self, name, endpoint, method):
+        key = (name, endpoint, method)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(
+                    key, Histogram(self.metrics[name][1])
+                )
+        return histogram
+
+    def observe(self, endpoint, method, stats):
+        self.histogram("http_request_duration_seconds", endpoint, method).observe(stats.wall_time)
+        self.histogram("http_request_db_queries", endpoint, method).observe(stats.queries)
+        self.histogram("http_request_db_duration_seconds", endpoint, method).observe(stats.db_time)
+        self.histogram(
+            "http_request_serialization_duration_seconds", endpoint, method
+        ).observe(stats.serialization_time)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self):
+        """
+        Prometheus text exposition format
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+
+        lines = []
+        for name, (help_text, _) in self.metrics.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, endpoint, method), histogram in histograms:
+                if metric != name:
+                    continue
+                labels = f'endpoint="{endpoint}",method="{method}"'
+                counts, total, count = histogram.snapshot()
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {total}")
+                lines.append(f"{name}_count{{{labels}}} {count}")
+
+        with self._lock:
+            gauges = sorted(self._gauges.items())
+        for name, (help_text, kind, func) in gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {func()}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "serialization_time", "wall_time", "_render_start")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+        self.wall_time = 0.0
+        self._render_start = None
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += time.perf_counter() - start
+        stats.queries += 1
+
+
+def install_query_wrapper(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# 이후에 열리는 연결(async view 가 사용하는 ORM 스레드 포함)에는 연결 시점에 설치합니다.
+connection_created.connect(install_query_wrapper)
+
+
+class MetricsMiddleware:
+    """
+    URL 이름(task-list, subtask-detail 등) 별로 쿼리 수, DB 시간, 직렬화 시간, 전체 시간을 기록합니다.
+    쿼리는 연결에 설치한 execute wrapper 로 세고, 직렬화 시간은 DRF Response 의 render 시간입니다.
+    StreamingHttpResponse 는 응답 헤더를 돌려주기까지의 시간만 기록됩니다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        # 미들웨어 생성 전에 이미 열려있던 현재 스레드의 연결
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(connection)
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        return self.finish(request, response, stats, start)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        return self.finish(request, response, stats, start)
+
+    def process_template_response(self, request, response):
+        stats = _current_request.get()
+        if stats is not None:
+            stats._render_start = time.perf_counter()
+
+            def rendered(response):
+                stats.serialization_time = time.perf_counter() - stats._render_start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, stats, start):
+        stats.wall_time = time.perf_counter() - start
+        match = getattr(request, "resolver_match", None)
+        endpoint = (match.view_name if match else None) or "unmatched"
+        registry.observe(endpoint, request.method, stats)
+        return response
+
+
+def metrics_view(request):
+    """
+    관리자 전용 Prometheus 지표 API
+    GET /metrics/
+    """
+    if not (request.user.is_authenticated and request.user.is_staff):
+        return HttpResponse("관리자만 조회할 수 있습니다.", status=403)
+    return HttpResponse(
+        registry.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -41,6 +41,7 @@ INSTALLED_APPS = SYSTEM_APPS + THIRD_PARTY_APPS + CUSTOM_APPS
 
 
 MIDDLEWARE = [
+    "config.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -120,6 +121,22 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Cache
+# CACHE_URL 이 없으면 프로세스 로컬 메모리 캐시를 사용합니다. (예: CACHE_URL=redis://127.0.0.1:6379/1)
+
+# 로그인 시도 제한(users.throttling.CacheBackend) 전용 캐시
+# default 캐시는 가득 차면 항목을 지우므로(cull) 시도 기록이 지워지지 않도록 따로 둡니다.
+# 여러 서버 프로세스가 함께 세려면 THROTTLE_CACHE_URL 에 항목을 지우지 않는(noeviction) redis 를 지정합니다.
+THROTTLE_CACHE = env.cache("THROTTLE_CACHE_URL", default="locmemcache://throttle")
+if THROTTLE_CACHE["BACKEND"].endswith("LocMemCache"):
+    THROTTLE_CACHE.setdefault("OPTIONS", {})["MAX_ENTRIES"] = 1_000_000
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+    "throttle": THROTTLE_CACHE,
+}
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -127,6 +144,46 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.User"
 
+# API 인증: Authorization: Bearer <token> (로그인 응답의 token), 없으면 세션
+# BasicAuthentication 은 사용하지 않습니다.
+
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "users.authentication.BearerTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+    ],
+}
+
+# 토큰 유효 기간(초), 검증한 토큰 → 유저 LRU 크기와 다시 조회하기까지의 시간(초)
+TOKEN_MAX_AGE = env.int("TOKEN_MAX_AGE", default=60 * 60 * 24 * 7)
+TOKEN_USER_CACHE_SIZE = 1024
+TOKEN_USER_CACHE_TTL = 60
+
+# 회원가입 / 로그인의 비밀번호 해시 전용 스레드 수와 대기열 크기 (가득 차면 429)
+PASSWORD_HASH_WORKERS = env.int("PASSWORD_HASH_WORKERS", default=min(4, os.cpu_count() or 1))
+PASSWORD_HASH_QUEUE_SIZE = env.int("PASSWORD_HASH_QUEUE_SIZE", default=32)
+
+# 로그인 시도 제한: WINDOW 초 동안 실패한 시도가 username 별 / IP 별 LIMIT 회를 넘으면 429
+# 여러 서버 프로세스가 함께 세려면 users.throttling.CacheBackend (THROTTLE_CACHE_URL 의 캐시)를 사용합니다.
+LOGIN_THROTTLE_BACKEND = env(
+    "LOGIN_THROTTLE_BACKEND", default="users.throttling.MemoryBackend"
+)
+LOGIN_THROTTLE_USERNAME_LIMIT = 5
+LOGIN_THROTTLE_IP_LIMIT = 20
+LOGIN_THROTTLE_WINDOW = 60
+
+# 변경분 동기화: 더 내려줄 행이 없으면 토큰 위치를 이 시간(초)만큼 되돌려, 늦게 커밋된 변경분을 다시 확인합니다.
+# 가장 오래 걸리는 쓰기 트랜잭션보다 길어야 합니다.
+TASK_SYNC_OVERLAP_SECONDS = env.int("TASK_SYNC_OVERLAP_SECONDS", default=5)
+# 삭제 기록(Tombstone) 보관 기간(일): python manage.py prune_tombstones 로 지우며, 이보다 오래된 since 토큰은 거부합니다.
+TASK_SYNC_TOMBSTONE_DAYS = env.int("TASK_SYNC_TOMBSTONE_DAYS", default=30)
+
+# 일정 검색 색인: 비어 있으면 SQLite(FTS5 지원)는 tasks.search.Fts5Backend, 그 외 DB 는 tasks.search.InvertedIndexBackend
+TASK_SEARCH_BACKEND = env("TASK_SEARCH_BACKEND", default="")
+
+# SQL 로그는 비용이 크므로 SQL_LOG=True 일 때만 콘솔에 출력합니다.
+# 쿼리 수, DB 시간은 /metrics/ 에서 URL 별로 확인할 수 있습니다.
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -136,10 +193,11 @@ LOGGING = {
             "class": "logging.StreamHandler",
         },
     },
-    "loggers": {
-        "django.db.backends": {
-            "level": "DEBUG",
-            "handlers": ["console"],
-        },
-    },
+    "loggers": {},
 }
+
+if env.bool("SQL_LOG", default=False):
+    LOGGING["loggers"]["django.db.backends"] = {
+        "level": "DEBUG",
+        "handlers": ["console"],
+    }
@@ -0,0 +1,36 @@
+import os
+
+# .env 없이도 테스트를 실행할 수 있도록 기본값을 둡니다.
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+from .settings import *  # noqa: E402, F401, F403
+from .settings import LOGGING  # noqa: E402
+
+# 테스트 전용 설정 (pytest.ini 에서 사용합니다.)
+
+# PBKDF2 는 유저마다 수십 ms 가 걸리므로 테스트에서는 MD5 로 해시합니다.
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
+
+# pytest -n 으로 병렬 실행할 때 워커마다 별도의 메모리 DB 를 사용합니다.
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+
+# CACHE_URL(redis 등)을 설정해도 워커끼리 캐시를 공유하지 않도록 합니다.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "throttle": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "throttle",
+    },
+}
+
+# SQL_LOG 를 설정해도 테스트 중에는 SQL 을 콘솔에 출력하지 않습니다.
+LOGGING = {**LOGGING, "loggers": {}}
@@ -1,8 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from config.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics/", metrics_view, name="metrics"),
     path("api/v1/users/", include("users.urls")),
     path("api/v1/tasks/", include("tasks.urls")),
+    path("api/v1/async/tasks/", include("tasks.async_urls")),
 ]
@@ -0,0 +1,82 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _consume(response):
+    # StreamingHttpResponse 는 내용을 읽을 때 쿼리가 실행되므로 측정 구간 안에서 모두 읽습니다.
+    if getattr(response, "streaming", False):
+        b"".join(response.streaming_content)
+    return response
+
+
+@pytest.fixture()
+def query_budget(db):
+    """
+    데이터 크기를 바꿔가며 같은 요청을 보내고, 쿼리 수가 예산 이하이며 데이터 크기와 상관없이 일정한지 확인합니다.
+
+        def test_task_list(query_budget):
+            query_budget(
+                setup=lambda n: make_tasks(n),        # n 개 크기의 데이터를 만들고 요청에 필요한 값을 반환
+                request=lambda data: client.get(...), # setup 이 반환한 값으로 요청
+                max_queries=3,
+            )
+
+    setup 은 크기마다 한 번씩 호출되며, 앞 크기에서 만든 데이터는 그대로 남아 있습니다.
+    측정 전에 캐시를 비우므로 캐시가 없을 때의 쿼리 수를 측정합니다.
+    """
+
+    def check(setup, request, max_queries, sizes=(2, 8), status_code=None):
+        counts = {}
+        for size in sizes:
+            data = setup(size)
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = _consume(request(data))
+            # 다음 요청이 시작되면 connection.queries 가 초기화되므로 미리 꺼내둡니다.
+            captured = [query["sql"] for query in queries.captured_queries]
+
+            if status_code is not None:
+                assert response.status_code == status_code, (
+                    f"size={size}: status {response.status_code} != {status_code}"
+                )
+            else:
+                assert response.status_code < 400, (
+                    f"size={size}: status {response.status_code}"
+                )
+            counts[size] = captured
+
+        sql = "\n".join(
+            f"  size={size}: {len(queries)} queries" for size, queries in counts.items()
+        )
+        largest = counts[max(sizes)]
+        if len({len(queries) for queries in counts.values()}) > 1:
+            raise QueryBudgetExceeded(
+                "데이터 크기에 따라 쿼리 수가 늘어납니다. (N+1)\n"
+                + sql
+                + "\n"
+                + "\n".join(f"    {query}" for query in largest)
+            )
+        if len(largest) > max_queries:
+            raise QueryBudgetExceeded(
+                f"쿼리 수가 예산({max_queries})을 넘었습니다.\n"
+                + sql
+                + "\n"
+                + "\n".join(f"    {query}" for query in largest)
+            )
+        return len(largest)
+
+    return check
+
+
+@pytest.fixture(autouse=True)
+def _reset_login_throttle():
+    # 로그인 시도 제한은 프로세스 메모리에 남으므로 테스트마다 비웁니다.
+    from users.throttling import login_throttle
+
+    login_throttle.backend.clear()
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Task, SubTask, Team
+from . import search
+from .models import Task, SubTask, Team, Tombstone
+from .pagination import EstimatedCountPaginator
 
 
 # Register your models here.
@@ -23,6 +25,15 @@ class TaskAdmin(admin.ModelAdmin):
         "title",
         "content",
     )
+    # 큰 테이블에서 전체 개수(COUNT(*))를 세지 않습니다.
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def get_search_results(self, request, queryset, search_term):
+        # LIKE '%...%' 전체 검색 대신 검색 색인(tasks.search)에서 단어로 찾습니다.
+        if not search.tokenize(search_term):
+            return queryset, False
+        return search.search_index.filter_queryset(queryset, "task", search_term), False
 
 
 @admin.register(SubTask)
@@ -41,6 +52,18 @@ class SubTaskAdmin(admin.ModelAdmin):
     list_display_links = ("pk", "task")
     list_filter = ("is_complete",)
     search_fields = ("sub_title", "sub_content")
+    # task, 작성자를 join 하고 팀을 prefetch 해서 행마다 조회하지 않습니다. (SubTask.__str__ 포함)
+    list_select_related = ("task", "subtask_create_user")
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_team_names()
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search.tokenize(search_term):
+            return queryset, False
+        return search.search_index.filter_queryset(queryset, "subtask", search_term), False
 
 
 @admin.register(Team)
@@ -54,3 +77,17 @@ class TeamAdmin(admin.ModelAdmin):
         "name",
     )
     search_fields = ("name",)
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = (
+        "pk",
+        "kind",
+        "object_pk",
+        "task_pk",
+        "deleted_at",
+    )
+    list_filter = ("kind",)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
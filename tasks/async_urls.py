@@ -0,0 +1,14 @@
+from django.urls import path
+from . import async_views
+
+urlpatterns = [
+    path("", async_views.TaskListView.as_view(), name="async-task-list"),
+    path("myteam/", async_views.MyTaskListView.as_view(), name="async-task-team-list"),
+    path("events/", async_views.TaskEventStreamView.as_view(), name="task-events"),
+    path("<int:task_pk>/", async_views.TaskDetailView.as_view(), name="async-task-detail"),
+    path(
+        "<int:task_pk>/subtasks/",
+        async_views.SubTaskListView.as_view(),
+        name="async-subtask-list",
+    ),
+]
@@ -0,0 +1,226 @@
+import asyncio
+import json
+
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework.exceptions import ValidationError
+
+from users.authentication import aget_user
+from .cache import aget_team_payload
+from .events import broker
+from .models import Task, SubTask, Team
+from .pagination import KeysetPagination
+from .rows import asubtask_list, task_list_rows
+from .serializers import (
+    TaskSerializer,
+    SubTaskSerializer,
+)
+
+
+def json_response(data, status=200, **kwargs):
+    return JsonResponse(
+        data,
+        status=status,
+        safe=False,
+        json_dumps_params={"ensure_ascii": False},
+        **kwargs,
+    )
+
+
+def subtask_queryset():
+    # serializer 가 task.create_user.team, team 이름을 읽으므로 미리 함께 조회합니다.
+    # async view 에서는 지연 조회(lazy query)가 SynchronousOnlyOperation 을 일으킵니다.
+    return SubTask.objects.with_related()
+
+
+class AsyncAPIView(View):
+    """
+    async 조회 API 의 공통 처리
+    DRF 의 APIView 는 동기 전용이므로 Django 의 async class-based view 를 사용하고,
+    응답 형식(에러 메시지 포함)은 tasks.views 와 같게 맞춥니다.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except ValidationError as error:
+            return json_response(error.detail, status=400)
+
+    def not_found(self):
+        return json_response({"detail": "게시글을 찾을 수 없습니다."}, status=404)
+
+
+class TaskListView(AsyncAPIView):
+    """
+    일정 리스트 API (async)
+    GET /api/v1/async/tasks/
+    GET /api/v1/async/tasks/?team=팀이름
+    """
+
+    async def get(self, request):
+        team_name = request.GET.get("team")
+
+        if team_name:
+            team = await Team.objects.filter(name=team_name).only("pk").afirst()
+            team_id = team.pk if team else None
+
+            task_pagination = KeysetPagination(request, "task_cursor")
+            subtask_pagination = KeysetPagination(request, "subtask_cursor")
+            tasks_with_team = await task_pagination.apaginate_queryset(
+                Task.objects.for_team_page(team_id).list_values()
+            )
+            subtasks_with_team = await subtask_pagination.apaginate_queryset(
+                SubTask.objects.for_team(team_id).list_values()
+            )
+
+            return json_response(
+                {
+                    "tasks": task_list_rows(tasks_with_team),
+                    "subtasks": await asubtask_list(subtasks_with_team),
+                    "next_task_cursor": task_pagination.next_cursor,
+                    "next_subtask_cursor": subtask_pagination.next_cursor,
+                }
+            )
+
+        pagination = KeysetPagination(request)
+        all_tasks = await pagination.apaginate_queryset(Task.objects.list_values())
+
+        return json_response(
+            {
+                "results": task_list_rows(all_tasks),
+                "next_cursor": pagination.next_cursor,
+            }
+        )
+
+
+class MyTaskListView(AsyncAPIView):
+    """
+    내가 포함 된 팀의 일정 리스트 API (async)
+    GET /api/v1/async/tasks/myteam/
+    """
+
+    async def get(self, request):
+        user = await aget_user(request)
+        if not user.is_authenticated:
+            return json_response({"message": "로그인이 필요합니다."}, status=401)
+
+        team_id = user.team_ref_id
+
+        async def build_payload():
+            task_pagination = KeysetPagination(request, "task_cursor")
+            subtask_pagination = KeysetPagination(request, "subtask_cursor")
+            tasks_my_team = await task_pagination.apaginate_queryset(
+                Task.objects.for_team_page(team_id).list_values()
+            )
+            subtasks_with_my_team = await subtask_pagination.apaginate_queryset(
+                SubTask.objects.for_team(team_id).list_values()
+            )
+            return {
+                "tasks": task_list_rows(tasks_my_team),
+                "subtasks": await asubtask_list(subtasks_with_my_team),
+                "next_task_cursor": task_pagination.next_cursor,
+                "next_subtask_cursor": subtask_pagination.next_cursor,
+            }
+
+        # 동기 view 와 같은 캐시 키를 사용하므로 payload 를 서로 공유합니다.
+        hit, payload = await aget_team_payload(team_id, request.GET, build_payload)
+
+        return json_response(payload, headers={"X-Cache": "HIT" if hit else "MISS"})
+
+
+class TaskDetailView(AsyncAPIView):
+    """
+    일정 상세 정보 API (async)
+    GET /api/v1/async/tasks/<int:task_pk>/
+    """
+
+    async def get_object(self, task_pk):
+        try:
+            return await Task.objects.with_subtask_counts().aget(pk=task_pk)
+        except Task.DoesNotExist:
+            return None
+
+    async def get_subtasks(self, task_pk):
+        return [subtask async for subtask in subtask_queryset().filter(task_id=task_pk)]
+
+    async def get(self, request, task_pk):
+        # async ORM 쿼리는 한 스레드(thread_sensitive)에서 차례로 실행되므로 gather 해도 동시에 실행되지 않습니다.
+        # task 가 없으면 subtask 를 조회하지 않도록 차례로 조회합니다.
+        task = await self.get_object(task_pk)
+        if task is None:
+            return self.not_found()
+        subtasks = await self.get_subtasks(task_pk)
+
+        return json_response(
+            {
+                "task": TaskSerializer(task).data,
+                "subtask": SubTaskSerializer(subtasks, many=True).data,
+            }
+        )
+
+
+class SubTaskListView(AsyncAPIView):
+    """
+    task_pk에 해당하는 subtask 리스트 API (async)
+    GET /api/v1/async/tasks/<int:task_pk>/subtasks/
+    """
+
+    async def get(self, request, task_pk):
+        if not await Task.objects.filter(pk=task_pk).aexists():
+            return self.not_found()
+
+        subtasks = [subtask async for subtask in subtask_queryset().filter(task_id=task_pk)]
+        return json_response(SubTaskSerializer(subtasks, many=True).data)
+
+
+class TaskEventStreamView(AsyncAPIView):
+    """
+    내 팀의 task, subtask 변경 이벤트 스트림 API (Server-Sent Events)
+    GET /api/v1/async/tasks/events/
+    ASGI 서버에서 실행해야 하며, 연결이 유지되는 동안 이벤트를 보냅니다.
+    """
+
+    heartbeat_interval = 15
+    retry_ms = 3000
+
+    async def get(self, request):
+        user = await aget_user(request)
+        if not user.is_authenticated:
+            return json_response({"message": "로그인이 필요합니다."}, status=401)
+        if user.team_ref_id is None:
+            return json_response({"message": "소속된 팀이 없습니다."}, status=403)
+
+        response = StreamingHttpResponse(
+            self.stream(user.team_ref_id),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx 등 프록시가 응답을 모아두지 않도록 합니다.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, team_id):
+        subscriber = broker.subscribe(team_id)
+        try:
+            yield f"retry: {self.retry_ms}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.get(), timeout=self.heartbeat_interval
+                    )
+                except asyncio.TimeoutError:
+                    # 연결이 끊기지 않도록 주기적으로 주석을 보냅니다.
+                    yield ": keepalive\n\n"
+                    continue
+                yield self.format_event(event)
+        finally:
+            broker.unsubscribe(subscriber)
+
+    def format_event(self, event):
+        event = dict(event)
+        event_id = event.pop("id", None)
+        lines = [f"event: {event['type']}"]
+        if event_id is not None:
+            lines.insert(0, f"id: {event_id}")
+        lines.append(f"data: {json.dumps(event, ensure_ascii=False)}")
+        return "\n".join(lines) + "\n\n"
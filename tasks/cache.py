@@ -0,0 +1,183 @@
+import hashlib
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from config.metrics import registry
+from users.models import User
+from .models import SubTask
+
+GLOBAL_VERSION_KEY = "tasks:version:global"
+TEAM_VERSION_KEY = "tasks:version:team:{team_id}"
+PAYLOAD_KEY = "tasks:myteam:{team_id}:{version}:{params}"
+PAYLOAD_TIMEOUT = 60 * 10
+
+
+class CacheStats:
+    """
+    프로세스 내 hit/miss 카운터
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def hit_ratio(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return self.hits / total if total else 0.0
+
+
+stats = CacheStats()
+
+registry.register_gauge(
+    "team_list_cache_hits_total",
+    "내 팀 리스트 payload 캐시 hit 수",
+    lambda: stats.hits,
+    kind="counter",
+)
+registry.register_gauge(
+    "team_list_cache_misses_total",
+    "내 팀 리스트 payload 캐시 miss 수",
+    lambda: stats.misses,
+    kind="counter",
+)
+registry.register_gauge(
+    "team_list_cache_hit_ratio",
+    "내 팀 리스트 payload 캐시 hit 비율",
+    stats.hit_ratio,
+)
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # 키가 만료/삭제된 뒤에도 예전 payload 와 겹치지 않도록 시간 기반 값으로 시작합니다.
+        cache.add(key, time.time_ns())
+        version = cache.get(key)
+    return version
+
+
+async def _aget_version(key):
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns())
+        version = await cache.aget(key)
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns())
+
+
+def task_team_ids(task_ids):
+    """
+    task 작성자의 팀 id 목록
+    """
+    return User.objects.filter(create_user__in=task_ids).values_list(
+        "team_ref_id", flat=True
+    )
+
+
+def subtask_team_ids(subtask_ids):
+    """
+    subtask 에 할당된 팀 id 목록
+    """
+    return SubTask.team.through.objects.filter(subtask_id__in=subtask_ids).values_list(
+        "team_id", flat=True
+    )
+
+
+def global_version():
+    """
+    작성자의 팀 변경 / import 처럼 여러 팀의 리스트가 함께 바뀔 때 올라가는 버전
+    """
+    return _get_version(GLOBAL_VERSION_KEY)
+
+
+def team_version(team_id):
+    return f"{global_version()}.{_get_version(TEAM_VERSION_KEY.format(team_id=team_id))}"
+
+
+async def ateam_version(team_id):
+    return f"{await _aget_version(GLOBAL_VERSION_KEY)}.{await _aget_version(TEAM_VERSION_KEY.format(team_id=team_id))}"
+
+
+def bump_team_versions(team_ids):
+    """
+    트랜잭션이 커밋된 뒤에 버전을 올려서, 커밋 전 데이터가 새 버전으로 캐시되지 않도록 합니다.
+    """
+    keys = {TEAM_VERSION_KEY.format(team_id=team_id) for team_id in team_ids if team_id is not None}
+    transaction.on_commit(lambda: [_bump_version(key) for key in keys])
+
+
+def bump_all_team_versions():
+    transaction.on_commit(lambda: _bump_version(GLOBAL_VERSION_KEY))
+
+
+def _params_digest(query_params):
+    params = "&".join(
+        f"{name}={query_params.get(name, '')}"
+        for name in ("task_cursor", "subtask_cursor", "page_size")
+    )
+    return hashlib.md5(params.encode()).hexdigest()
+
+
+def payload_key(team_id, query_params):
+    return PAYLOAD_KEY.format(
+        team_id=team_id,
+        version=team_version(team_id),
+        params=_params_digest(query_params),
+    )
+
+
+def get_team_payload(team_id, query_params, build_payload):
+    """
+    팀 버전이 포함된 키로 직렬화된 payload 를 캐시합니다.
+    쓰기가 일어나면 signals 에서 팀 버전을 올리므로 예전 payload 는 다시 조회되지 않습니다.
+    (hit 여부, payload) 를 반환합니다.
+    """
+    key = payload_key(team_id, query_params)
+    payload = cache.get(key)
+    if payload is not None:
+        stats.hit()
+        return True, payload
+
+    stats.miss()
+    payload = build_payload()
+    cache.set(key, payload, PAYLOAD_TIMEOUT)
+    return False, payload
+
+
+async def aget_team_payload(team_id, query_params, build_payload):
+    """
+    get_team_payload 의 async 버전, build_payload 는 coroutine 함수입니다.
+    """
+    key = PAYLOAD_KEY.format(
+        team_id=team_id,
+        version=await ateam_version(team_id),
+        params=_params_digest(query_params),
+    )
+    payload = await cache.aget(key)
+    if payload is not None:
+        stats.hit()
+        return True, payload
+
+    stats.miss()
+    payload = await build_payload()
+    await cache.aset(key, payload, PAYLOAD_TIMEOUT)
+    return False, payload
@@ -0,0 +1,102 @@
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import global_version
+from .models import Task, SubTask, Team
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def etag_condition(etag_func):
+    """
+    APIView 의 get 메서드용 데코레이터
+    직렬화 전에 가벼운 집계 쿼리로 ETag 를 계산하고,
+    If-None-Match 와 같으면 행을 조회하지 않고 304 를 반환합니다.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def inner(view, request, *args, **kwargs):
+            etag = etag_func(request, *args, **kwargs)
+            if etag is None:
+                return method(view, request, *args, **kwargs)
+
+            if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+            if etag in if_none_match or "*" in if_none_match:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                response["ETag"] = etag
+            return response
+
+        return inner
+
+    return decorator
+
+
+def task_etag(request, task_pk, *args):
+    """
+    task 와 task 의 subtask 들의 (modified_at 최댓값, 개수)
+    task 가 없으면 None 을 반환해서 view 가 404 를 처리하도록 합니다.
+    """
+    state = (
+        Task.objects.filter(pk=task_pk)
+        .annotate(
+            subtask_modified_at=Max("subtasks__modified_at"),
+            subtask_count=Count("subtasks"),
+        )
+        .values_list("modified_at", "subtask_modified_at", "subtask_count", "create_user__team")
+        .first()
+    )
+    if state is None:
+        return None
+    return make_etag(request.path, state)
+
+
+def requested_team_id(request):
+    """
+    ?team=팀이름 에 해당하는 Team pk (없는 팀이면 None)
+    ETag 계산과 view 에서 같은 값을 쓰므로 request 에 보관해서 한 번만 조회합니다.
+    """
+    if not hasattr(request, "_requested_team_id"):
+        team_name = request.query_params.get("team")
+        request._requested_team_id = (
+            Team.objects.filter(name=team_name).values_list("pk", flat=True).first()
+        )
+    return request._requested_team_id
+
+
+def task_list_etag(request):
+    """
+    조회 조건에 해당하는 task (와 subtask) 들의 (modified_at 최댓값, 개수)
+    응답의 team 은 작성자의 팀이므로, 작성자의 팀이 바뀌면 올라가는 전역 캐시 버전도 함께 넣습니다.
+    """
+    params = [
+        request.query_params.get(name)
+        for name in ("team", "cursor", "task_cursor", "subtask_cursor", "page_size")
+    ]
+    params.append(global_version())
+    tasks = Task.objects.all()
+    team_name = request.query_params.get("team")
+    if team_name:
+        team_id = requested_team_id(request)
+        tasks = Task.objects.for_team(team_id)
+        params.append(
+            sorted(
+                SubTask.objects.for_team(team_id)
+                .aggregate(modified_at=Max("modified_at"), count=Count("pk"))
+                .items()
+            )
+        )
+    params.append(
+        sorted(tasks.aggregate(modified_at=Max("modified_at"), count=Count("pk")).items())
+    )
+    return make_etag(request.path, params)
@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+import threading
+
+from django.db import transaction
+
+
+class Subscriber:
+    """
+    SSE 연결 하나에 해당하는 구독자
+    큐는 구독자의 event loop 에서만 다루고, 다른 스레드에서는 call_soon_threadsafe 로 넘깁니다.
+    """
+
+    def __init__(self, team_id, loop, maxsize):
+        self.team_id = team_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 느린 구독자 때문에 메모리가 늘어나지 않도록, 쌓인 이벤트를 버리고 다시 조회하라고 알립니다.
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class EventBroker:
+    """
+    프로세스 내 팀 별 pub/sub
+    같은 프로세스(ASGI 서버)에서 일어난 변경만 전달하므로, 워커가 여러 개라면 워커마다 따로 동작합니다.
+    """
+
+    queue_size = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._ids = itertools.count(1)
+
+    def subscribe(self, team_id, loop=None):
+        subscriber = Subscriber(team_id, loop or asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(team_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.team_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.team_id]
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def publish(self, team_ids, event):
+        with self._lock:
+            subscribers = [
+                subscriber
+                for team_id in set(team_ids)
+                for subscriber in self._subscribers.get(team_id, ())
+            ]
+        self._deliver(subscribers, event)
+
+    def publish_all(self, event):
+        with self._lock:
+            subscribers = [
+                subscriber
+                for subscribers in self._subscribers.values()
+                for subscriber in subscribers
+            ]
+        self._deliver(subscribers, event)
+
+    def _deliver(self, subscribers, event):
+        if not subscribers:
+            return
+        event = {"id": next(self._ids), **event}
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.put, event)
+            except RuntimeError:
+                # 연결이 끊겨 event loop 가 닫힌 구독자
+                self.unsubscribe(subscriber)
+
+
+broker = EventBroker()
+
+
+def publish_event(team_ids, event):
+    """
+    트랜잭션이 커밋된 뒤에 팀 구독자에게 이벤트를 보냅니다.
+    """
+    if not broker.has_subscribers():
+        return
+    team_ids = {team_id for team_id in team_ids if team_id is not None}
+    if team_ids:
+        transaction.on_commit(lambda: broker.publish(team_ids, event))
+
+
+def publish_resync():
+    """
+    bulk import 처럼 변경 범위가 큰 경우 모든 구독자에게 다시 조회하라고 알립니다.
+    """
+    if broker.has_subscribers():
+        transaction.on_commit(lambda: broker.publish_all({"type": "resync"}))
@@ -0,0 +1,87 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from .models import Task, SubTask
+
+
+def export_queryset():
+    """
+    task 와 subtask, subtask 의 팀을 함께 읽는 queryset
+    iterator(chunk_size=...) 와 함께 쓰면 prefetch 도 chunk 단위로만 실행됩니다.
+    """
+    subtasks = (
+        SubTask.objects.select_related("subtask_create_user")
+        .prefetch_related("team")
+        .order_by("pk")
+    )
+    return (
+        Task.objects.select_related("create_user")
+        .prefetch_related(Prefetch("subtasks", queryset=subtasks))
+        .order_by("pk")
+    )
+
+
+def task_row(task):
+    return {
+        "task_pk": task.pk,
+        "create_user": task.create_user.username,
+        "team": task.create_user.team,
+        "title": task.title,
+        "content": task.content,
+        "is_complete": task.is_complete,
+        "completed_date": task.completed_date,
+        "created_at": task.created_at,
+        "modified_at": task.modified_at,
+        "subtasks": [
+            {
+                "subtask_pk": subtask.pk,
+                "subtask_create_user": subtask.subtask_create_user.username,
+                "team": [team.name for team in subtask.team.all()],
+                "sub_title": subtask.sub_title,
+                "sub_content": subtask.sub_content,
+                "is_complete": subtask.is_complete,
+                "completed_date": subtask.completed_date,
+                "created_at": subtask.created_at,
+                "modified_at": subtask.modified_at,
+            }
+            for subtask in task.subtasks.all()
+        ],
+    }
+
+
+def ndjson_line(task):
+    return json.dumps(task_row(task), cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def iter_ndjson(chunk_size=1000):
+    """
+    한 줄에 task 하나(subtask 포함)씩 NDJSON 으로 만듭니다.
+    한 번에 chunk_size 개의 task 만 메모리에 올라갑니다.
+    """
+    for task in export_queryset().iterator(chunk_size=chunk_size):
+        yield ndjson_line(task)
+
+
+def export_chunk(after_pk, chunk_size):
+    """
+    pk 가 after_pk 보다 큰 task 를 chunk_size 개 읽어 NDJSON 문자열과 마지막 pk 를 반환합니다.
+    """
+    tasks = list(export_queryset().filter(pk__gt=after_pk)[:chunk_size])
+    return "".join(ndjson_line(task) for task in tasks), tasks[-1].pk if tasks else None
+
+
+async def aiter_ndjson(chunk_size=1000):
+    """
+    ASGI 용 iter_ndjson
+    StreamingHttpResponse 에 동기 iterator 를 넘기면 ASGI 에서는 전체를 메모리에 모은 뒤 보내므로,
+    chunk 마다 sync_to_async 로 읽고(pk keyset) 바로 내보냅니다.
+    """
+    after_pk = 0
+    while True:
+        content, after_pk = await sync_to_async(export_chunk)(after_pk, chunk_size)
+        if after_pk is None:
+            return
+        yield content
@@ -0,0 +1,88 @@
+from functools import lru_cache
+
+from django.contrib.auth.hashers import make_password
+
+from users.models import User
+from . import search
+from .models import Team, Task, SubTask
+
+
+# 테스트용 데이터 생성 함수
+# create_user / objects.create 반복 대신 비밀번호 해시를 재사용하고 bulk_create 로 만듭니다.
+# signals 를 거치지 않으므로 subtask 카운터는 미리 채우고 검색 색인은 직접 갱신합니다. 캐시 버전이나 이벤트는 갱신하지 않습니다.
+
+
+@lru_cache(maxsize=None)
+def hashed_password(password):
+    """
+    같은 비밀번호의 해시는 한 번만 계산합니다.
+    """
+    return make_password(password)
+
+
+def make_user(username, password="test123", team=User.TeamChoices.Danbi, **fields):
+    """
+    User.save() 를 거쳐 team_ref 를 채웁니다.
+    """
+    user = User(username=username, password=hashed_password(password), team=team, **fields)
+    user.save()
+    return user
+
+
+def make_teams(names):
+    Team.objects.bulk_create([Team(name=name) for name in names], ignore_conflicts=True)
+    teams = {team.name: team for team in Team.objects.filter(name__in=names)}
+    return [teams[name] for name in names]
+
+
+def make_tasks(user, count=1, subtasks=0, teams=("Danbi", "Supie"), subtask_user=None, **fields):
+    """
+    task 를 count 개 만들고, task 마다 subtask 를 subtasks 개씩 만들어 teams 를 모두 할당합니다.
+    subtask 가 없어도 teams 는 만들어 둡니다. (팀 이름으로 subtask 를 등록하는 요청용)
+    """
+    make_teams(teams)
+    fields.setdefault("title", "Task 제목")
+    fields.setdefault("content", "Task 내용")
+    tasks = Task.objects.bulk_create(
+        [Task(create_user=user, subtask_total=subtasks, **fields) for _ in range(count)]
+    )
+    search.search_index.index_tasks(tasks)
+    if subtasks:
+        make_subtasks(tasks, subtasks, teams, user=subtask_user or user)
+    return tasks
+
+
+def make_task(user, subtasks=0, teams=("Danbi", "Supie"), **fields):
+    return make_tasks(user, 1, subtasks, teams, **fields)[0]
+
+
+def make_subtasks(tasks, per_task, teams=("Danbi", "Supie"), user=None):
+    """
+    task 카운터는 호출하는 쪽에서 맞춰야 합니다. (make_tasks 는 subtask_total 을 미리 채웁니다.)
+    """
+    team_objects = make_teams(teams)
+    subtasks = SubTask.objects.bulk_create(
+        [
+            SubTask(
+                task=task,
+                subtask_create_user=user or task.create_user,
+                sub_title=f"SubTask 제목 {index}",
+                sub_content="SubTask 내용",
+            )
+            for task in tasks
+            for index in range(per_task)
+        ]
+    )
+    SubTaskTeam = SubTask.team.through
+    SubTaskTeam.objects.bulk_create(
+        [
+            SubTaskTeam(subtask_id=subtask.pk, team_id=team.pk)
+            for subtask in subtasks
+            for team in team_objects
+        ]
+    )
+    search.search_index.index_subtasks(subtasks)
+    for subtask in subtasks:
+        # DB 에서 읽은 것처럼 완료 여부를 보관해서, 이후 save() 시 카운터 signals 가 동작하게 합니다.
+        subtask._loaded_is_complete = subtask.is_complete
+    return subtasks
@@ -0,0 +1,211 @@
+import csv
+import json
+from itertools import groupby, islice
+
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from users.models import User
+from . import search
+from .cache import bump_all_team_versions
+from .events import publish_resync
+from .models import ImportCheckpoint, Task, SubTask, Team
+
+CSV_TEAM_SEPARATOR = "|"
+
+
+class ImportRecordError(Exception):
+    pass
+
+
+def read_ndjson(file):
+    """
+    export_tasks 와 같은 형식: 한 줄에 task 하나, subtasks 는 task 안에 포함
+    JSON 이 잘못된 줄은 중단하지 않고 ImportRecordError 를 레코드 대신 넘깁니다. (TaskImporter 가 오류로 기록)
+    """
+    for line in file:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                yield ImportRecordError(f"잘못된 JSON 입니다: {error}")
+
+
+def _csv_bool(value):
+    return str(value).strip().lower() in ("1", "true", "t", "yes", "y")
+
+
+def read_csv(file):
+    """
+    한 줄에 subtask 하나, 같은 task_ref 가 연속된 줄은 같은 task 입니다.
+    subtask 가 없는 task 는 sub_title, sub_content, team 을 비워둡니다.
+    팀이 여러 개이면 team 컬럼에 "Danbi|Supie" 처럼 적습니다.
+    """
+    rows = csv.DictReader(file)
+    for _, task_rows in groupby(rows, key=lambda row: row["task_ref"]):
+        task_rows = list(task_rows)
+        first = task_rows[0]
+        yield {
+            "create_user": first["create_user"],
+            "title": first["title"],
+            "content": first.get("content", ""),
+            "is_complete": _csv_bool(first.get("is_complete")),
+            "completed_date": first.get("completed_date") or None,
+            "subtasks": [
+                {
+                    "subtask_create_user": row.get("subtask_create_user") or first["create_user"],
+                    "team": [name for name in (row.get("team") or "").split(CSV_TEAM_SEPARATOR) if name],
+                    "sub_title": row.get("sub_title") or None,
+                    "sub_content": row.get("sub_content") or None,
+                    "is_complete": _csv_bool(row.get("sub_is_complete")),
+                    "completed_date": row.get("sub_completed_date") or None,
+                }
+                for row in task_rows
+                if row.get("sub_title") or row.get("sub_content") or row.get("team")
+            ],
+        }
+
+
+def _datetime(value):
+    if not value:
+        return None
+    # 형식이 맞지 않으면 None, 형식은 맞지만 없는 날짜이면 ValueError 이므로 둘 다 오류로 처리합니다.
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"잘못된 날짜입니다: {value}")
+    return parsed
+
+
+class TaskImporter:
+    """
+    task / subtask / subtask 팀을 batch 단위로 bulk_create 합니다.
+    User, Team 은 시작할 때 한 번 읽어둔 {이름: pk} 맵으로 찾고,
+    처리한 레코드 수는 batch 와 같은 트랜잭션에서 ImportCheckpoint 에 기록합니다.
+    (파일에 따로 기록하면 커밋과 기록 사이에 중단되었을 때 이어서 가져오면서 같은 행이 중복됩니다.)
+    """
+
+    def __init__(self, batch_size=1000, checkpoint_key=None):
+        self.batch_size = batch_size
+        self.checkpoint_key = checkpoint_key
+        self.user_pks = dict(User.objects.values_list("username", "pk"))
+        self.team_pks = dict(Team.objects.values_list("name", "pk"))
+        self.processed = 0
+        self.tasks_created = 0
+        self.subtasks_created = 0
+        self.errors = []
+
+    def read_checkpoint(self):
+        if not self.checkpoint_key:
+            return 0
+        checkpoint = ImportCheckpoint.objects.filter(key=self.checkpoint_key).first()
+        return checkpoint.processed if checkpoint else 0
+
+    def write_checkpoint(self, processed):
+        # import_batch 의 트랜잭션 안에서 호출됩니다.
+        if self.checkpoint_key:
+            ImportCheckpoint.objects.update_or_create(
+                key=self.checkpoint_key, defaults={"processed": processed}
+            )
+
+    def clear_checkpoint(self):
+        if self.checkpoint_key:
+            ImportCheckpoint.objects.filter(key=self.checkpoint_key).delete()
+
+    def run(self, records, resume=True, on_batch=None):
+        if resume:
+            self.processed = self.read_checkpoint()
+            records = islice(records, self.processed, None)
+
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                break
+            self.import_batch(batch)
+            self.processed += len(batch)
+            if on_batch:
+                on_batch(self)
+
+        self.clear_checkpoint()
+
+    def resolve(self, record, index):
+        """
+        레코드의 username / 팀 이름을 pk 로 바꿉니다. 찾을 수 없으면 ImportRecordError
+        """
+        line = self.processed + index + 1
+        try:
+            create_user_id = self.user_pks[record["create_user"]]
+        except KeyError:
+            raise ImportRecordError(f"{line}: 존재하지 않는 유저입니다: {record.get('create_user')}")
+
+        subtasks = []
+        for subtask in record.get("subtasks") or []:
+            username = subtask.get("subtask_create_user") or record["create_user"]
+            if username not in self.user_pks:
+                raise ImportRecordError(f"{line}: 존재하지 않는 유저입니다: {username}")
+            unknown_teams = [name for name in subtask.get("team") or [] if name not in self.team_pks]
+            if unknown_teams:
+                raise ImportRecordError(f"{line}: 존재하지 않는 팀입니다: {', '.join(unknown_teams)}")
+            subtasks.append(
+                (
+                    SubTask(
+                        subtask_create_user_id=self.user_pks[username],
+                        sub_title=subtask.get("sub_title"),
+                        sub_content=subtask.get("sub_content"),
+                        is_complete=bool(subtask.get("is_complete")),
+                        completed_date=_datetime(subtask.get("completed_date")),
+                    ),
+                    [self.team_pks[name] for name in dict.fromkeys(subtask.get("team") or [])],
+                )
+            )
+
+        task = Task(
+            create_user_id=create_user_id,
+            title=record["title"],
+            content=record.get("content") or "",
+            is_complete=bool(record.get("is_complete")),
+            completed_date=_datetime(record.get("completed_date")),
+            subtask_total=len(subtasks),
+            subtask_done=sum(subtask.is_complete for subtask, _ in subtasks),
+        )
+        return task, subtasks
+
+    def import_batch(self, batch):
+        resolved = []
+        for index, record in enumerate(batch):
+            if isinstance(record, ImportRecordError):
+                self.errors.append(f"{self.processed + index + 1}: {record}")
+                continue
+            try:
+                resolved.append(self.resolve(record, index))
+            except ImportRecordError as error:
+                self.errors.append(str(error))
+            except (KeyError, TypeError, ValueError) as error:
+                self.errors.append(f"{self.processed + index + 1}: 잘못된 레코드입니다: {error!r}")
+
+        SubTaskTeam = SubTask.team.through
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create([task for task, _ in resolved])
+
+            subtask_teams = []
+            for task, subtasks in resolved:
+                for subtask, team_pks in subtasks:
+                    subtask.task = task
+                    subtask_teams.append((subtask, team_pks))
+            SubTask.objects.bulk_create([subtask for subtask, _ in subtask_teams])
+
+            SubTaskTeam.objects.bulk_create(
+                [
+                    SubTaskTeam(subtask_id=subtask.pk, team_id=team_pk)
+                    for subtask, team_pks in subtask_teams
+                    for team_pk in team_pks
+                ]
+            )
+            # bulk_create 는 signals 를 거치지 않으므로 검색 색인을 갱신하고 팀 캐시를 한 번에 무효화
+            search.search_index.index_tasks(tasks)
+            search.search_index.index_subtasks([subtask for subtask, _ in subtask_teams])
+            bump_all_team_versions()
+            publish_resync()
+            self.write_checkpoint(self.processed + len(batch))
+
+        self.tasks_created += len(tasks)
+        self.subtasks_created += len(subtask_teams)
@@ -0,0 +1,78 @@
+import os
+import resource
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks.export import iter_ndjson
+from tasks.seeds import seed_subtasks, seed_tasks, seed_teams, seed_users
+
+
+class Command(BaseCommand):
+    help = (
+        "NDJSON export 의 처리 시간과 최대 메모리(peak RSS)를 측정합니다. "
+        "seed 데이터는 트랜잭션 안에서 만들고 끝나면 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=1_000_000)
+        parser.add_argument("--subtasks-per-task", type=int, default=1)
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--seed-batch", type=int, default=20_000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write(f"seeding {options['tasks']} tasks...")
+            teams = seed_teams()
+            users = seed_users(100, teams, prefix="benchexport")
+            # seed 한 객체가 메모리에 남아 측정에 섞이지 않도록 나눠서 만듭니다.
+            remaining = options["tasks"]
+            while remaining > 0:
+                batch = min(remaining, options["seed_batch"])
+                tasks = seed_tasks(users, batch, options["subtasks_per_task"])
+                seed_subtasks(tasks, options["subtasks_per_task"], teams)
+                remaining -= batch
+            del tasks
+
+            baseline = self.reset_peak_rss()
+            start = time.perf_counter()
+            count = 0
+            size = 0
+            for line in iter_ndjson(chunk_size=options["chunk_size"]):
+                count += 1
+                size += len(line)
+            elapsed = time.perf_counter() - start
+            peak = self.peak_rss()
+
+            self.stdout.write(f"rows           {count}")
+            self.stdout.write(f"bytes          {size}")
+            self.stdout.write(f"seconds        {elapsed:.2f}")
+            self.stdout.write(f"rows/s         {count / elapsed:.0f}")
+            self.stdout.write(f"baseline RSS   {baseline / 1024:.1f} MiB")
+            self.stdout.write(f"peak RSS       {peak / 1024:.1f} MiB")
+
+            transaction.set_rollback(True)
+
+    def reset_peak_rss(self):
+        """
+        리눅스에서는 /proc/self/clear_refs 로 peak RSS(VmHWM)를 현재 값으로 되돌립니다.
+        그 외 환경에서는 프로세스 시작 이후의 최댓값(ru_maxrss)을 그대로 사용합니다.
+        """
+        try:
+            with open("/proc/self/clear_refs", "w") as clear_refs:
+                clear_refs.write("5")
+        except OSError:
+            pass
+        return self.peak_rss()
+
+    def peak_rss(self):
+        """
+        KiB 단위 peak RSS
+        """
+        if os.path.exists("/proc/self/status"):
+            with open("/proc/self/status") as status:
+                for line in status:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1])
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
@@ -0,0 +1,111 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.models import SubTask, Task
+from tasks.pagination import KeysetPagination
+from tasks.seeds import seed
+
+
+class Command(BaseCommand):
+    help = (
+        "리스트 API 쿼리의 EXPLAIN QUERY PLAN 과 실행 시간을 Meta.indexes 적용 전/후로 비교합니다. "
+        "seed 데이터(기본 약 1M 행)는 트랜잭션 안에서 만들고 끝나면 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=250_000)
+        parser.add_argument("--subtasks-per-task", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write(
+                f"seeding {options['tasks']} tasks x {options['subtasks_per_task']} subtasks..."
+            )
+            seeded = seed(
+                users=700,
+                tasks=options["tasks"],
+                subtasks_per_task=options["subtasks_per_task"],
+                prefix="benchindex",
+            )
+            team_id = seeded["users"][0].team_ref_id
+            middle_task = seeded["tasks"][len(seeded["tasks"]) // 2]
+            middle_subtask = seeded["subtasks"][len(seeded["subtasks"]) // 2]
+            queries = self.get_queries(team_id, middle_task, middle_subtask)
+
+            self.drop_indexes()
+            self.stdout.write(self.style.MIGRATE_HEADING("\n=== before (Meta.indexes 없음)"))
+            self.run_queries(queries, options["repeat"])
+
+            self.create_indexes()
+            self.stdout.write(self.style.MIGRATE_HEADING("\n=== after (Meta.indexes 적용)"))
+            self.run_queries(queries, options["repeat"])
+
+            transaction.set_rollback(True)
+
+    def page(self, queryset, cursor_obj=None, cursor_query_param="cursor"):
+        params = {}
+        if cursor_obj is not None:
+            params[cursor_query_param] = KeysetPagination.encode_cursor(cursor_obj)
+        request = Request(APIRequestFactory().get("/", params))
+        return KeysetPagination(request, cursor_query_param).get_page_queryset(queryset)
+
+    def get_queries(self, team_id, middle_task, middle_subtask):
+        return {
+            "task-list (1 page)": self.page(Task.objects.with_subtask_counts()),
+            "task-list (deep page)": self.page(
+                Task.objects.with_subtask_counts(), middle_task
+            ),
+            "task-list?team= tasks": self.page(
+                Task.objects.with_subtask_counts().for_team_page(team_id),
+                middle_task,
+                "task_cursor",
+            ),
+            "task-team-list subtasks": self.page(
+                SubTask.objects.for_team(team_id), middle_subtask, "subtask_cursor"
+            ),
+            "subtask-list": SubTask.objects.filter(task_id=middle_task.pk),
+            "open subtasks per task": SubTask.objects.filter(
+                task_id=middle_task.pk, is_complete=False
+            ),
+            "completed count per task": SubTask.objects.filter(
+                task_id=middle_task.pk, is_complete=True
+            ).values("pk"),
+        }
+
+    def run_queries(self, queries, repeat):
+        for name, queryset in queries.items():
+            self.stdout.write(self.style.SQL_TABLE(f"\n[{name}]"))
+            self.stdout.write(queryset.explain())
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                f"median {statistics.median(timings):.2f}ms / max {max(timings):.2f}ms"
+            )
+
+    def model_indexes(self):
+        for model in (Task, SubTask):
+            for index in model._meta.indexes:
+                yield model, index
+
+    def drop_indexes(self):
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model, index in self.model_indexes():
+                cursor.execute(str(index.remove_sql(model, editor)))
+            cursor.execute("ANALYZE")
+
+    def create_indexes(self):
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model, index in self.model_indexes():
+                cursor.execute(str(index.create_sql(model, editor)))
+            cursor.execute("ANALYZE")
@@ -0,0 +1,79 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+
+from tasks.models import Task
+from tasks.pagination import KeysetPagination
+from tasks.seeds import seed
+
+
+class Command(BaseCommand):
+    help = (
+        "keyset 페이지네이션 벤치마크: 1페이지부터 깊은 페이지까지 task-list 응답 시간을 측정합니다. "
+        "seed 데이터는 트랜잭션 안에서 만들고 끝나면 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=200_000)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--pages", default="1,10,100,1000,10000")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        page_size = options["page_size"]
+        pages = [int(page) for page in options["pages"].split(",")]
+        max_page = options["tasks"] // page_size
+        pages = [page for page in pages if page <= max_page]
+
+        with transaction.atomic():
+            self.stdout.write(f"seeding {options['tasks']} tasks...")
+            seed(users=100, tasks=options["tasks"], prefix="benchpage")
+
+            ordered = Task.objects.order_by("created_at", "pk")
+            client = Client()
+            url = reverse("task-list")
+
+            self.stdout.write(
+                f"{'page':>8} {'keyset p50(ms)':>16} {'keyset p95(ms)':>16} {'offset p50(ms)':>16}"
+            )
+            for page in pages:
+                offset = (page - 1) * page_size
+                params = {"page_size": page_size}
+                if offset:
+                    # 이전 페이지 마지막 행으로 cursor 를 만듭니다 (측정 구간 밖).
+                    params["cursor"] = KeysetPagination.encode_cursor(
+                        ordered[offset - 1]
+                    )
+
+                keyset_timings = self.measure(
+                    lambda: client.get(url, params), options["repeat"]
+                )
+                offset_timings = self.measure(
+                    lambda: list(ordered[offset : offset + page_size]),
+                    options["repeat"],
+                )
+                self.stdout.write(
+                    f"{page:>8} "
+                    f"{statistics.median(keyset_timings):>16.2f} "
+                    f"{self.percentile(keyset_timings, 95):>16.2f} "
+                    f"{statistics.median(offset_timings):>16.2f}"
+                )
+
+            transaction.set_rollback(True)
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def percentile(self, timings, percent):
+        ordered = sorted(timings)
+        index = min(len(ordered) - 1, round(len(ordered) * percent / 100))
+        return ordered[index]
@@ -0,0 +1,79 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from tasks import search
+from tasks.models import Task
+from tasks.seeds import seed_tasks, seed_teams, seed_users
+
+
+class Command(BaseCommand):
+    help = (
+        "검색 벤치마크: task 수를 늘려가며 일치하는 문서 수가 같은 검색의 시간을 "
+        "FTS5 / 메모리 역색인 / LIKE '%...%' (기존 admin 검색)로 비교합니다. "
+        "seed 데이터는 트랜잭션 안에서 만들고 끝나면 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,50000")
+        parser.add_argument("--matches", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite" or not search.fts5_available():
+            raise CommandError("FTS5 를 지원하는 SQLite 에서 실행해주세요.")
+        sizes = sorted(int(size) for size in options["sizes"].split(","))
+        repeat = options["repeat"]
+        fts = search.Fts5Backend()
+        fts.create_table()
+
+        with transaction.atomic():
+            teams = seed_teams()
+            users = seed_users(10, teams, prefix="benchsearch")
+            needles = Task.objects.bulk_create(
+                [
+                    Task(create_user=users[0], title=f"분기 결산 {index}", content="결산 자료")
+                    for index in range(options["matches"])
+                ]
+            )
+            fts.index_tasks(needles)
+
+            self.stdout.write(
+                f"{'rows':>8} {'matches':>8} {'fts5 p50(ms)':>13} {'memory p50(ms)':>15} {'like p50(ms)':>13}"
+            )
+            seeded = 0
+            for size in sizes:
+                # seed_tasks 는 설정된 검색 색인(search.search_index)에 색인하므로 FTS5 에도 직접 색인합니다.
+                fts.index_tasks(seed_tasks(users, size - seeded))
+                seeded = size
+                memory = search.InvertedIndexBackend()
+                memory.rebuild()
+
+                cases = [
+                    lambda: fts.search("결산", None, 0, 20),
+                    lambda: memory.search("결산", None, 0, 20),
+                    lambda: list(
+                        Task.objects.filter(
+                            Q(title__icontains="결산") | Q(content__icontains="결산")
+                        ).values_list("pk", flat=True)
+                    ),
+                ]
+                matches = len(cases[2]())
+                timings = [statistics.median(self.measure(func, repeat)) for func in cases]
+                self.stdout.write(
+                    f"{size + len(needles):>8} {matches:>8} "
+                    f"{timings[0]:>13.3f} {timings[1]:>15.3f} {timings[2]:>13.3f}"
+                )
+
+            transaction.set_rollback(True)
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
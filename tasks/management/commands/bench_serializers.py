@@ -0,0 +1,70 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks.models import Task, SubTask
+from tasks.rows import subtask_list, task_list_rows
+from tasks.seeds import seed
+from tasks.serializers import SubTaskListSerializer, TaskListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "목록 직렬화 벤치마크: TaskListSerializer / SubTaskListSerializer 와 "
+        ".values() 기반 tasks.rows 직렬화를 같은 행 수로 비교합니다. "
+        "seed 데이터는 트랜잭션 안에서 만들고 끝나면 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+
+        with transaction.atomic():
+            self.stdout.write(f"seeding {rows} tasks, {rows} subtasks...")
+            seed(users=50, tasks=rows, subtasks_per_task=1, prefix="benchrows")
+
+            tasks = Task.objects.order_by("created_at", "pk")[:rows]
+            subtasks = SubTask.objects.order_by("created_at", "pk")[:rows]
+            cases = [
+                (
+                    "task",
+                    lambda: TaskListSerializer(tasks.with_subtask_counts(), many=True).data,
+                    lambda: task_list_rows(tasks.list_values()),
+                ),
+                (
+                    "subtask",
+                    lambda: SubTaskListSerializer(subtasks.with_related(), many=True).data,
+                    lambda: subtask_list(list(subtasks.list_values())),
+                ),
+            ]
+
+            self.stdout.write(
+                f"{'list':>8} {'serializer p50(ms)':>20} {'values p50(ms)':>16} {'speedup':>9}"
+            )
+            for name, serializer_func, values_func in cases:
+                # 두 방식의 결과가 같은지 먼저 확인합니다.
+                if serializer_func() != values_func():
+                    raise AssertionError(f"{name}: 직렬화 결과가 다릅니다.")
+
+                serializer_ms = statistics.median(self.measure(serializer_func, repeat))
+                values_ms = statistics.median(self.measure(values_func, repeat))
+                self.stdout.write(
+                    f"{name:>8} {serializer_ms:>20.2f} {values_ms:>16.2f} "
+                    f"{serializer_ms / values_ms:>8.1f}x"
+                )
+
+            transaction.set_rollback(True)
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tasks.models import SubTask
+from tasks.seeds import seed
+
+
+class Command(BaseCommand):
+    help = (
+        "subtask 생성 처리량 비교: new-subtask 를 N번 호출하는 경우와 bulk-subtask 한 번 호출하는 경우. "
+        "seed 데이터는 트랜잭션 안에서 만들고 끝나면 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = options["count"]
+
+        with transaction.atomic():
+            seeded = seed(users=1, tasks=2, prefix="benchbulk")
+            user = seeded["users"][0]
+            single_task, bulk_task = seeded["tasks"]
+            team_names = [user.team]
+
+            client = APIClient()
+            client.force_authenticate(user=user)
+
+            single_url = reverse("new-subtask", args=[single_task.pk])
+            start = time.perf_counter()
+            for index in range(count):
+                client.post(
+                    single_url,
+                    {"sub_title": f"SubTask {index}", "sub_content": "내용", "team": team_names},
+                    format="json",
+                )
+            single_elapsed = time.perf_counter() - start
+
+            bulk_url = reverse("bulk-subtask", args=[bulk_task.pk])
+            payload = [
+                {"sub_title": f"SubTask {index}", "sub_content": "내용", "team": team_names}
+                for index in range(count)
+            ]
+            start = time.perf_counter()
+            response = client.post(bulk_url, payload, format="json")
+            bulk_elapsed = time.perf_counter() - start
+
+            assert response.status_code == 201, response.data
+            assert SubTask.objects.filter(task=single_task).count() == count
+            assert SubTask.objects.filter(task=bulk_task).count() == count
+
+            self.stdout.write(f"{'path':>8} {'seconds':>10} {'subtasks/s':>12}")
+            self.stdout.write(f"{'single':>8} {single_elapsed:>10.3f} {count / single_elapsed:>12.1f}")
+            self.stdout.write(f"{'bulk':>8} {bulk_elapsed:>10.3f} {count / bulk_elapsed:>12.1f}")
+
+            transaction.set_rollback(True)
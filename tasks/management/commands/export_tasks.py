@@ -0,0 +1,30 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from tasks.export import iter_ndjson
+
+
+class Command(BaseCommand):
+    help = "전체 task, subtask 를 NDJSON 으로 내보냅니다. (기본: 표준 출력)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", "-o", help="저장할 파일 경로")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        output = (
+            open(options["output"], "w", encoding="utf-8")
+            if options["output"]
+            else sys.stdout
+        )
+        count = 0
+        try:
+            for line in iter_ndjson(chunk_size=options["chunk_size"]):
+                output.write(line)
+                count += 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+        self.stderr.write(self.style.SUCCESS(f"{count}개 task를 내보냈습니다."))
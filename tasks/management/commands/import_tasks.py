@@ -0,0 +1,64 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.importer import TaskImporter, read_csv, read_ndjson
+
+
+class Command(BaseCommand):
+    help = (
+        "NDJSON(export_tasks 형식) 또는 CSV 파일에서 task, subtask, 팀 할당을 가져옵니다. "
+        "batch 마다 커밋하고 checkpoint 를 남기므로 중단되면 같은 명령으로 이어서 진행합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="가져올 파일 경로 (.ndjson / .jsonl / .csv)")
+        parser.add_argument("--format", choices=["ndjson", "csv"], help="기본: 확장자로 판단")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--checkpoint", help="checkpoint 이름 (기본: 파일의 절대 경로)")
+        parser.add_argument(
+            "--no-resume",
+            action="store_true",
+            help="checkpoint 를 무시하고 처음부터 가져옵니다.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"파일이 없습니다: {path}")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 합니다.")
+
+        file_format = options["format"] or ("csv" if path.endswith(".csv") else "ndjson")
+        reader = read_csv if file_format == "csv" else read_ndjson
+        importer = TaskImporter(
+            batch_size=options["batch_size"],
+            checkpoint_key=options["checkpoint"] or os.path.abspath(path),
+        )
+
+        start = time.perf_counter()
+
+        def report(importer):
+            elapsed = time.perf_counter() - start
+            rows = importer.tasks_created + importer.subtasks_created
+            self.stderr.write(
+                f"{importer.processed} records, {rows} rows ({rows / elapsed:.0f} rows/s)"
+            )
+
+        with open(path, encoding="utf-8", newline="") as file:
+            importer.run(reader(file), resume=not options["no_resume"], on_batch=report)
+
+        elapsed = time.perf_counter() - start
+        rows = importer.tasks_created + importer.subtasks_created
+        for error in importer.errors[:20]:
+            self.stderr.write(self.style.WARNING(error))
+        if len(importer.errors) > 20:
+            self.stderr.write(self.style.WARNING(f"... 외 {len(importer.errors) - 20}건"))
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"task {importer.tasks_created}개, subtask {importer.subtasks_created}개를 "
+                f"{elapsed:.2f}초 동안 가져왔습니다. ({rows / elapsed if elapsed else 0:.0f} rows/s, "
+                f"건너뜀 {len(importer.errors)}건)"
+            )
+        )
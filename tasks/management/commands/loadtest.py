@@ -0,0 +1,173 @@
+import asyncio
+import statistics
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.models import Task
+from tasks.seeds import seed
+
+# 동기 API 와 async API 가 같은 경로 구조를 가지므로 prefix 만 바꿔서 요청합니다.
+DEFAULT_PATHS = ["", "?team=Danbi", "{task_pk}/", "{task_pk}/subtasks/"]
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+class HTTPClient:
+    """
+    keep-alive 연결 하나를 사용하는 최소한의 HTTP/1.1 GET 클라이언트
+    (외부 패키지 없이 동시 접속 수백 개를 만들기 위해 asyncio stream 을 직접 사용)
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.writer = None
+
+    async def get(self, path):
+        if self.writer is None:
+            await self.connect()
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\nConnection: keep-alive\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("서버가 연결을 닫았습니다.")
+        status_code = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            await self.reader.read()
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status_code
+
+
+class Command(BaseCommand):
+    help = (
+        "동시 접속 클라이언트로 조회 API 에 부하를 주고 지연 시간(p50/p95/p99)과 처리량을 비교합니다. "
+        "예) --target wsgi=http://127.0.0.1:8000/api/v1/tasks/ "
+        "--target asgi=http://127.0.0.1:8001/api/v1/async/tasks/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            required=True,
+            help="이름=API prefix URL (여러 번 지정 가능)",
+        )
+        parser.add_argument("--clients", type=int, default=500)
+        parser.add_argument("--requests", type=int, default=20, help="클라이언트 당 요청 수")
+        parser.add_argument(
+            "--path",
+            action="append",
+            help="prefix 뒤에 붙일 경로, {task_pk} 사용 가능 (기본: 조회 API 4개)",
+        )
+        parser.add_argument(
+            "--seed-tasks",
+            type=int,
+            default=0,
+            help="서버가 조회할 데이터를 먼저 만들어 둡니다. (커밋되므로 개발 DB 에서만 사용)",
+        )
+
+    def handle(self, *args, **options):
+        if options["seed_tasks"]:
+            seed(users=50, tasks=options["seed_tasks"], subtasks_per_task=3, prefix="loadtest")
+
+        task_pks = list(Task.objects.order_by("-pk").values_list("pk", flat=True)[:100])
+        if not task_pks:
+            raise CommandError("task 가 없습니다. --seed-tasks 로 데이터를 먼저 만들어주세요.")
+
+        targets = []
+        for target in options["target"]:
+            name, _, url = target.partition("=")
+            if not url:
+                raise CommandError(f"--target 은 이름=URL 형식이어야 합니다: {target}")
+            targets.append((name, url))
+
+        paths = options["path"] or DEFAULT_PATHS
+        for name, url in targets:
+            result = asyncio.run(
+                self.run_target(url, paths, task_pks, options["clients"], options["requests"])
+            )
+            self.report(name, result)
+
+    async def run_target(self, url, paths, task_pks, clients, requests):
+        parts = urlsplit(url)
+        prefix = parts.path.rstrip("/") + "/"
+        latencies = []
+        statuses = Counter()
+
+        async def client(index):
+            http = HTTPClient(parts.hostname, parts.port or 80)
+            try:
+                for number in range(requests):
+                    path = paths[(index + number) % len(paths)].format(
+                        task_pk=task_pks[(index + number) % len(task_pks)]
+                    )
+                    start = time.perf_counter()
+                    try:
+                        status_code = await http.get(prefix + path)
+                    except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+                        statuses["error"] += 1
+                        await http.close()
+                        continue
+                    latencies.append(time.perf_counter() - start)
+                    statuses[status_code] += 1
+            finally:
+                await http.close()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client(index) for index in range(clients)))
+        elapsed = time.perf_counter() - start
+        return {"latencies": latencies, "statuses": statuses, "elapsed": elapsed}
+
+    def report(self, name, result):
+        latencies = result["latencies"]
+        self.stdout.write(f"[{name}]")
+        self.stdout.write(f"  requests     {len(latencies)} in {result['elapsed']:.2f}s")
+        self.stdout.write(f"  throughput   {len(latencies) / result['elapsed']:.1f} req/s")
+        self.stdout.write(f"  mean         {statistics.fmean(latencies) * 1000 if latencies else 0:.1f}ms")
+        for percent in (50, 95, 99):
+            self.stdout.write(f"  p{percent}          {percentile(latencies, percent) * 1000:.1f}ms")
+        self.stdout.write(f"  status       {dict(result['statuses'])}")
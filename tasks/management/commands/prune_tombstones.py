@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "보관 기간(TASK_SYNC_TOMBSTONE_DAYS)이 지난 삭제 기록(Tombstone)을 지웁니다."
+
+    def handle(self, *args, **options):
+        deleted = Tombstone.objects.prune()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{settings.TASK_SYNC_TOMBSTONE_DAYS}일이 지난 삭제 기록 {deleted}개를 지웠습니다."
+            )
+        )
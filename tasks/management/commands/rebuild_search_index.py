@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from tasks import search
+
+
+class Command(BaseCommand):
+    help = (
+        "검색 색인(tasks.search)을 task / subtask 테이블 기준으로 처음부터 다시 만듭니다. "
+        "InvertedIndexBackend 는 프로세스 메모리에 있으므로 이 명령이 아니라 서버가 처음 검색할 때 만듭니다."
+    )
+
+    def handle(self, *args, **options):
+        backend = type(search.search_index).__name__
+        counts = search.search_index.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{backend}: task {counts['tasks']}개, subtask {counts['subtasks']}개를 색인했습니다."
+            )
+        )
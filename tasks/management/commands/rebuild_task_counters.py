@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = "Task 의 subtask_total, subtask_done 카운터를 subtask 테이블 기준으로 다시 계산합니다."
+
+    def handle(self, *args, **options):
+        updated = Task.objects.rebuild_subtask_counters()
+        self.stdout.write(self.style.SUCCESS(f"{updated}개 task의 카운터를 다시 계산했습니다."))
@@ -0,0 +1,221 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils import timezone
+
+
+class TaskQuerySet(models.QuerySet):
+    def for_team(self, team_id):
+        """
+        작성자의 팀(정수 FK)으로 필터링합니다. 팀이 없으면 빈 queryset 을 반환합니다.
+        """
+        if team_id is None:
+            return self.none()
+        return self.filter(create_user__team_ref_id=team_id)
+
+    def for_team_page(self, team_id):
+        """
+        (created_at, pk) 순서로 페이지를 나눠 조회하는 팀 별 리스트용 for_team
+        join 하면 팀의 작성자마다 task 를 모은 뒤 정렬(USE TEMP B-TREE)하므로, 작성자의 팀을 EXISTS 로 확인해
+        task_created_id_idx 를 순서대로 읽다가 한 페이지가 차면 멈춥니다. (집계는 join 하는 for_team 이 빠릅니다.)
+        """
+        from users.models import User
+
+        if team_id is None:
+            return self.none()
+        return self.filter(
+            Exists(User.objects.filter(pk=OuterRef("create_user_id"), team_ref_id=team_id))
+        )
+
+    def with_subtask_counts(self):
+        """
+        total_subtasks, completed_subtasks 를 annotate 하고 create_user 를 join 합니다.
+        값은 Task 에 저장된 subtask_total, subtask_done 카운터를 그대로 읽습니다.
+        """
+        return self.select_related("create_user").annotate(
+            total_subtasks=F("subtask_total"),
+            completed_subtasks=F("subtask_done"),
+        )
+
+    def list_values(self):
+        """
+        tasks.rows.task_list_rows 용 dict 조회 (created_at 은 cursor 계산용)
+        """
+        return self.values(
+            "pk",
+            "created_at",
+            "create_user__team",
+            "title",
+            "is_complete",
+            "subtask_total",
+            "subtask_done",
+        )
+
+    def with_subtasks(self):
+        """
+        TinyTaskSerializer 용: create_user 를 join 하고 subtask 와 subtask 의 팀 이름을 prefetch 합니다.
+        """
+        from .models import SubTask
+
+        return self.select_related("create_user").prefetch_related(
+            Prefetch("subtasks", queryset=SubTask.objects.with_team_names())
+        )
+
+    def update_subtask_counters(self, total=0, done=0, sync_completion=False):
+        """
+        subtask_total, subtask_done 카운터를 F() 로 증감합니다.
+        sync_completion=True 이면 같은 UPDATE 안에서 모든 subtask 가 완료되었는지에 따라
+        Task 의 완료 여부와 완료일도 함께 갱신합니다.
+        """
+        now = timezone.now()
+        values = {
+            "subtask_total": F("subtask_total") + total,
+            "subtask_done": F("subtask_done") + done,
+            "modified_at": now,
+        }
+        if sync_completion:
+            # UPDATE 의 우변은 갱신 전 값을 참조하므로 증감분을 반영해서 비교합니다.
+            all_done = Q(subtask_done=F("subtask_total") + (total - done))
+            values["is_complete"] = Case(
+                When(all_done, then=Value(True)),
+                default=Value(False),
+            )
+            values["completed_date"] = Case(
+                When(all_done, then=Value(now)),
+                default=Value(None),
+            )
+        return self.update(**values)
+
+    def complete_subtasks(self, deltas):
+        """
+        {task pk: 완료된 subtask 증감} 만큼 subtask_done 을 바꾸고 완료 여부를 맞춥니다.
+        완료 여부가 바뀐 task 의 pk 목록을 반환합니다. (task.completed / task.reopened 이벤트용)
+        update() 는 post_save 를 보내지 않으므로, 바뀌기 전 카운터를 잠가서 읽고 비교합니다.
+        """
+        with transaction.atomic(savepoint=False):
+            rows = (
+                self.filter(pk__in=deltas)
+                .select_for_update()
+                .values_list("pk", "is_complete", "subtask_done", "subtask_total")
+            )
+            flipped = sorted(
+                pk
+                for pk, is_complete, done, total in rows
+                if (done + deltas[pk] == total) != is_complete
+            )
+            for pk, delta in deltas.items():
+                self.filter(pk=pk).update_subtask_counters(done=delta, sync_completion=True)
+        return flipped
+
+    def rebuild_subtask_counters(self):
+        """
+        subtask 테이블을 기준으로 카운터를 처음부터 다시 계산합니다. (복구용)
+        """
+        from .models import SubTask
+
+        subtasks = (
+            SubTask.objects.filter(task=OuterRef("pk"))
+            .order_by()
+            .values("task")
+        )
+        total = subtasks.annotate(count=Count("pk")).values("count")
+        done = subtasks.annotate(
+            count=Count("pk", filter=Q(is_complete=True))
+        ).values("count")
+
+        return self.update(
+            subtask_total=Coalesce(Subquery(total, output_field=IntegerField()), 0),
+            subtask_done=Coalesce(Subquery(done, output_field=IntegerField()), 0),
+        )
+
+
+class SubTaskQuerySet(models.QuerySet):
+    def for_team(self, team_id):
+        """
+        subtask 에 할당된 팀(정수 FK)으로 필터링합니다. Team 테이블은 join 하지 않습니다.
+        """
+        if team_id is None:
+            return self.none()
+        return self.filter(team=team_id)
+
+    def with_team_names(self):
+        """
+        team(SlugRelatedField, slug_field="name") 을 subtask 마다 조회하지 않도록 팀 이름만 prefetch 합니다.
+        """
+        from .models import Team
+
+        return self.prefetch_related(
+            Prefetch("team", queryset=Team.objects.only("name").order_by("pk"))
+        )
+
+    def with_related(self):
+        """
+        SubTaskSerializer, SubTaskListSerializer 용: task_team(task.create_user.team)을 join 하고
+        팀 이름을 prefetch 합니다. subtask 개수와 상관없이 쿼리 2번으로 조회합니다.
+        """
+        return self.select_related("task__create_user").with_team_names()
+
+    def list_values(self):
+        """
+        tasks.rows.subtask_list 용 dict 조회, 팀 이름은 subtask_list 에서 따로 모읍니다.
+        """
+        return self.values(
+            "pk",
+            "created_at",
+            "task_id",
+            "task__create_user__team",
+            "sub_title",
+            "is_complete",
+        )
+
+
+class TombstoneQuerySet(models.QuerySet):
+    def record_task(self, task):
+        """
+        task 와 함께 cascade 로 삭제될 subtask 들의 삭제 기록을 남깁니다.
+        """
+        subtask_pks = task.subtasks.values_list("pk", flat=True)
+        return self.bulk_create(
+            [
+                self.model(kind=self.model.KindChoices.Task, object_pk=task.pk, task_pk=task.pk),
+                *(
+                    self.model(kind=self.model.KindChoices.SubTask, object_pk=pk, task_pk=task.pk)
+                    for pk in subtask_pks
+                ),
+            ]
+        )
+
+    def record_subtask(self, subtask):
+        return self.create(
+            kind=self.model.KindChoices.SubTask,
+            object_pk=subtask.pk,
+            task_pk=subtask.task_id,
+        )
+
+    @staticmethod
+    def retention_cutoff():
+        # 이 시각 이전의 삭제 기록은 지우므로, 이보다 오래된 since 토큰은 받지 않습니다.
+        return timezone.now() - timedelta(days=settings.TASK_SYNC_TOMBSTONE_DAYS)
+
+    def prune(self):
+        """
+        보관 기간(TASK_SYNC_TOMBSTONE_DAYS)이 지난 삭제 기록을 지우고 지운 개수를 반환합니다.
+        """
+        deleted, _ = self.filter(deleted_at__lt=self.retention_cutoff()).delete()
+        return deleted
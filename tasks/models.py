@@ -1,6 +1,12 @@
 from django.db import models
 
 from users.models import User
+from .manager import SubTaskQuerySet, TaskQuerySet, TombstoneQuerySet
+
+
+def loaded_values(instance, fields):
+    # only() / defer() 로 읽지 않은 필드는 빠지므로, 비교할 때는 바뀐 것으로 봅니다.
+    return {field: instance.__dict__[field] for field in fields if field in instance.__dict__}
 
 
 class Team(models.Model):
@@ -27,6 +33,27 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
 
+    # SubTask 저장/삭제 시 signals 에서 F() 로 갱신되는 카운터
+    subtask_total = models.IntegerField(default=0)
+    subtask_done = models.IntegerField(default=0)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset 페이지네이션 (created_at, pk) 정렬용
+            models.Index(fields=["created_at", "id"], name="task_created_id_idx"),
+            # ETag 계산(max modified_at) / 변경분 조회
+            models.Index(fields=["modified_at"], name="task_modified_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 검색 대상 필드가 바뀌었는지 signals 에서 비교하기 위해 DB 값을 보관합니다.
+        instance._loaded_search_text = loaded_values(instance, ("title", "content"))
+        return instance
+
     def __str__(self):
         return self.title
 
@@ -55,6 +82,62 @@ class SubTask(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
 
+    objects = SubTaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset 페이지네이션 (created_at, pk) 정렬용
+            models.Index(fields=["created_at", "id"], name="subtask_created_id_idx"),
+            # task 별 subtask 목록 / 완료, 미완료 subtask 조회와 개수 집계
+            models.Index(fields=["task", "is_complete"], name="subtask_task_complete_idx"),
+            # ETag 계산(max modified_at) / 변경분 조회
+            models.Index(fields=["modified_at"], name="subtask_modified_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 완료 여부가 바뀌었는지 signals 에서 비교하기 위해 DB 값을 보관합니다.
+        instance._loaded_is_complete = instance.__dict__.get("is_complete")
+        instance._loaded_search_text = loaded_values(instance, ("sub_title", "sub_content"))
+        return instance
+
     def __str__(self):
+        # team.all() 은 prefetch 되어 있으면 (admin, with_team_names) 쿼리 없이 prefetch 결과를 사용합니다.
+        # task 도 select_related 되어 있어야 행마다 조회하지 않습니다.
         team_names = ", ".join([team.name for team in self.team.all()])
         return f"{self.task.title} - Teams: {team_names}"
+
+
+class Tombstone(models.Model):
+    """
+    변경분 동기화(/api/v1/tasks/changes/)에서 삭제된 행을 알려주기 위한 삭제 기록
+    """
+
+    class KindChoices(models.TextChoices):
+        Task = "task", "Task"
+        SubTask = "subtask", "SubTask"
+
+    kind = models.CharField(max_length=10, choices=KindChoices.choices)
+    object_pk = models.BigIntegerField()
+    task_pk = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    objects = TombstoneQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.kind} {self.object_pk}"
+
+
+class ImportCheckpoint(models.Model):
+    """
+    import_tasks 가 처리한 레코드 수 (tasks.importer)
+    batch 와 같은 트랜잭션에서 저장하므로 커밋된 batch 까지만 기록됩니다.
+    """
+
+    key = models.CharField(max_length=255, primary_key=True)
+    processed = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} ({self.processed})"
@@ -0,0 +1,160 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+
+
+class KeysetPagination:
+    """
+    (created_at, pk) 기준 keyset(cursor) 페이지네이션
+    OFFSET 대신 마지막으로 내려준 행의 (created_at, pk) 이후부터 조회하므로
+    몇 번째 페이지를 조회하더라도 비용이 일정합니다.
+    cursor는 클라이언트가 해석할 필요가 없는 불투명(opaque) 문자열입니다.
+    """
+
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
+
+    def __init__(self, request, cursor_query_param="cursor"):
+        # DRF Request 는 query_params, async view 의 HttpRequest 는 GET 을 사용합니다.
+        query_params = getattr(request, "query_params", request.GET)
+        self.cursor_query_param = cursor_query_param
+        self.cursor = self.decode_cursor(query_params.get(cursor_query_param))
+        self.page_size = self.get_page_size(query_params)
+        self.next_cursor = None
+
+    def get_page_size(self, query_params):
+        page_size = query_params.get(self.page_size_query_param)
+        if page_size is None:
+            return self.page_size
+        try:
+            page_size = int(page_size)
+        except ValueError:
+            raise ValidationError(
+                {self.page_size_query_param: "page_size는 숫자여야 합니다."}
+            )
+        return max(1, min(page_size, self.max_page_size))
+
+    @staticmethod
+    def encode_cursor(obj):
+        # 모델 인스턴스 또는 .values() 로 조회한 dict
+        if isinstance(obj, dict):
+            position = [obj["created_at"].isoformat(), obj["pk"]]
+        else:
+            position = [obj.created_at.isoformat(), obj.pk]
+        encoded = base64.urlsafe_b64encode(json.dumps(position).encode())
+        return encoded.decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError):
+            raise ValidationError({self.cursor_query_param: "잘못된 cursor 입니다."})
+
+    def get_page_queryset(self, queryset):
+        queryset = queryset.order_by("created_at", "pk")
+
+        if self.cursor is not None:
+            created_at, pk = self.cursor
+            # (created_at, pk) > (cursor) 를 인덱스 범위 검색이 가능한 형태로 풀어 씁니다.
+            queryset = queryset.filter(
+                Q(created_at__gte=created_at),
+                Q(created_at__gt=created_at) | Q(pk__gt=pk),
+            )
+
+        # 다음 페이지가 있는지 확인하기 위해 한 행 더 조회합니다.
+        return queryset[: self.page_size + 1]
+
+    def paginate_queryset(self, queryset):
+        return self.get_page(list(self.get_page_queryset(queryset)))
+
+    async def apaginate_queryset(self, queryset):
+        return self.get_page([obj async for obj in self.get_page_queryset(queryset)])
+
+    def get_page(self, rows):
+        if len(rows) > self.page_size:
+            rows = rows[: self.page_size]
+            self.next_cursor = self.encode_cursor(rows[-1])
+        return rows
+
+
+class RankedPagination(KeysetPagination):
+    """
+    검색 결과처럼 (created_at, pk) 순서가 아닌 목록용 페이지네이션
+    cursor 에 다음 페이지의 시작 위치(offset)를 담습니다.
+    """
+
+    @staticmethod
+    def encode_cursor(offset):
+        encoded = base64.urlsafe_b64encode(json.dumps([offset]).encode())
+        return encoded.decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return 0
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            (offset,) = json.loads(base64.urlsafe_b64decode(padded))
+            offset = int(offset)
+        except (TypeError, ValueError):
+            raise ValidationError({self.cursor_query_param: "잘못된 cursor 입니다."})
+        if offset < 0:
+            raise ValidationError({self.cursor_query_param: "잘못된 cursor 입니다."})
+        return offset
+
+    def paginate(self, fetch):
+        """
+        fetch(offset, limit) 로 한 행 더 조회해서 다음 페이지가 있는지 확인합니다.
+        """
+        rows = fetch(self.cursor, self.page_size + 1)
+        if len(rows) > self.page_size:
+            rows = rows[: self.page_size]
+            self.next_cursor = self.encode_cursor(self.cursor + self.page_size)
+        return rows
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    admin 변경 목록용 Paginator
+    검색 / 필터가 없는 전체 목록이면 테이블 전체를 세는 COUNT(*) 대신 행 수를 추정합니다.
+      PostgreSQL: 통계(pg_class.reltuples)
+      그 외(SQLite): max(pk), pk 인덱스 끝만 읽습니다. (삭제된 행만큼 실제보다 클 수 있습니다.)
+    추정값이 exact_count_threshold 보다 작으면 COUNT(*) 도 싸므로 정확하게 셉니다.
+    """
+
+    exact_count_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if getattr(queryset, "query", None) is None or queryset.query.where:
+            return super().count
+        estimated = self.estimate_count(queryset.model, queryset.db)
+        if estimated < self.exact_count_threshold:
+            return super().count
+        return estimated
+
+    @staticmethod
+    def estimate_count(model, using):
+        connection = connections[using]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                    [model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            # 한 번도 ANALYZE 하지 않은 테이블은 -1 (또는 0)
+            if row and row[0] > 0:
+                return int(row[0])
+        return model._default_manager.using(using).aggregate(max_pk=Max("pk"))["max_pk"] or 0
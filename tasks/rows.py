@@ -0,0 +1,77 @@
+from collections import defaultdict
+
+from .models import SubTask
+
+
+# 목록 API 의 읽기 전용 직렬화
+# ModelSerializer 는 행마다 필드 객체(SerializerMethodField, SlugRelatedField 등)를 거치므로
+# 페이지가 커지면 CPU 대부분을 직렬화에 씁니다.
+# TaskQuerySet.list_values(), SubTaskQuerySet.list_values() 로 조회한 dict 에서
+# TaskListSerializer, SubTaskListSerializer 와 같은 모양의 응답을 바로 만듭니다.
+
+
+def task_list_rows(rows):
+    """
+    TaskListSerializer(many=True).data 와 같은 모양
+    """
+    return [
+        {
+            "task_pk": row["pk"],
+            "team": row["create_user__team"],
+            "title": row["title"],
+            "is_complete": row["is_complete"],
+            "total_subtasks": row["subtask_total"],
+            "completed_subtasks": row["subtask_done"],
+        }
+        for row in rows
+    ]
+
+
+def subtask_list_rows(rows, team_names):
+    """
+    SubTaskListSerializer(many=True).data 와 같은 모양
+    team_names 는 {subtask_pk: [팀 이름, ...]} 입니다.
+    """
+    return [
+        {
+            "task_team": row["task__create_user__team"],
+            "task_pk": row["task_id"],
+            "subtask_pk": row["pk"],
+            "team": team_names.get(row["pk"], []),
+            "sub_title": row["sub_title"],
+            "is_complete": row["is_complete"],
+        }
+        for row in rows
+    ]
+
+
+def team_names_queryset(rows):
+    # SubTaskQuerySet.with_team_names() 와 같은 순서(팀 pk 순)로 읽습니다.
+    return (
+        SubTask.team.through.objects.filter(subtask_id__in=[row["pk"] for row in rows])
+        .order_by("subtask_id", "team_id")
+        .values_list("subtask_id", "team__name")
+    )
+
+
+def group_team_names(pairs):
+    team_names = defaultdict(list)
+    for subtask_pk, name in pairs:
+        team_names[subtask_pk].append(name)
+    return team_names
+
+
+def subtask_list(rows):
+    """
+    subtask 페이지의 팀 이름을 쿼리 한 번으로 모아서 응답 행을 만듭니다.
+    """
+    if not rows:
+        return []
+    return subtask_list_rows(rows, group_team_names(team_names_queryset(rows)))
+
+
+async def asubtask_list(rows):
+    if not rows:
+        return []
+    pairs = [pair async for pair in team_names_queryset(rows)]
+    return subtask_list_rows(rows, group_team_names(pairs))
@@ -0,0 +1,446 @@
+import heapq
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from users.models import User
+from .models import Task, SubTask
+
+# 일정 전문 검색 (task 의 title / content, subtask 의 sub_title / sub_content)
+# 검색어가 들어 있는 문서만 읽으므로 검색 시간은 테이블 크기가 아니라 일치하는 문서 수에 비례합니다.
+#   Fts5Backend: SQLite FTS5 가상 테이블 (DB 가 SQLite 이고 FTS5 를 지원하면 기본)
+#   InvertedIndexBackend: 프로세스 메모리의 역색인 (그 외 DB)
+# TASK_SEARCH_BACKEND 로 직접 지정할 수 있습니다.
+# 색인은 signals(save / delete / 팀 변경)와 bulk_create 경로(BulkSubTaskView, importer, seeds)에서 갱신하며,
+# python manage.py rebuild_search_index 로 처음부터 다시 만들 수 있습니다.
+
+# 제목에서 일치하면 내용에서 일치할 때보다 관련도를 높게 계산합니다.
+TITLE_WEIGHT = 2.0
+
+# FTS5 unicode61 tokenizer 와 같은 기준(문자, 숫자)으로 나눕니다.
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def row_id(kind, pk):
+    # task 와 subtask 를 한 색인에 넣기 위해 pk 와 종류를 rowid 하나로 합칩니다.
+    return pk * 2 + (kind == "subtask")
+
+
+def split_row_id(rowid):
+    return ("subtask" if rowid % 2 else "task"), rowid // 2
+
+
+class Fts5Backend:
+    """
+    SQLite FTS5 가상 테이블 (rowid, title, content)
+    task / subtask 와 같은 DB, 같은 트랜잭션에서 갱신하므로 롤백되면 색인도 함께 롤백됩니다.
+    검색할 때 task / subtask 테이블을 pk 로 join 해서 제목과 팀을 확인합니다.
+    """
+
+    table = "tasks_search"
+    # 팀은 색인하지 않고 검색할 때 join 하므로 팀이 바뀌어도 다시 색인할 필요가 없습니다.
+    stores_teams = False
+    remove_batch_size = 500
+
+    def __init__(self, using="default"):
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def create_table(self):
+        """
+        가상 테이블이 없으면 만들고 True 를 반환합니다.
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = %s", [self.table])
+            if cursor.fetchone():
+                return False
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {self.table} USING fts5("
+                "title, content, tokenize = 'unicode61 remove_diacritics 0')"
+            )
+        return True
+
+    def prepare(self):
+        # post_migrate: 테이블을 처음 만들었다면 이미 있는 task / subtask 를 색인합니다.
+        if self.create_table():
+            self.rebuild()
+
+    def index_tasks(self, tasks):
+        self.write([(row_id("task", task.pk), task.title, task.content) for task in tasks])
+
+    def index_subtasks(self, subtasks):
+        self.write(
+            [
+                (row_id("subtask", subtask.pk), subtask.sub_title or "", subtask.sub_content or "")
+                for subtask in subtasks
+            ]
+        )
+
+    def write(self, rows):
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (rowid, title, content) VALUES (%s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, kind, pks):
+        # 행마다 DELETE 하지 않고 rowid IN (...) 으로 묶어서 지웁니다. (SQLite 변수 개수 제한 때문에 나눠서)
+        rowids = [row_id(kind, pk) for pk in pks]
+        with self.connection.cursor() as cursor:
+            for start in range(0, len(rowids), self.remove_batch_size):
+                batch = rowids[start : start + self.remove_batch_size]
+                placeholders = ", ".join(["%s"] * len(batch))
+                cursor.execute(f"DELETE FROM {self.table} WHERE rowid IN ({placeholders})", batch)
+
+    def rebuild(self):
+        quote = self.connection.ops.quote_name
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            self.create_table()
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, content) "
+                f"SELECT id * 2, title, content FROM {quote(Task._meta.db_table)}"
+            )
+            tasks = cursor.rowcount
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, content) "
+                f"SELECT id * 2 + 1, COALESCE(sub_title, ''), COALESCE(sub_content, '') "
+                f"FROM {quote(SubTask._meta.db_table)}"
+            )
+            subtasks = cursor.rowcount
+        return {"tasks": tasks, "subtasks": subtasks}
+
+    @staticmethod
+    def match_expression(query):
+        # 검색어의 단어를 모두 포함하는 문서 (FTS5 문법 문자는 따옴표로 감싸서 단어로만 검색합니다.)
+        return " ".join(f'"{token}"' for token in dict.fromkeys(tokenize(query)))
+
+    def search(self, query, team_id=None, offset=0, limit=20):
+        """
+        관련도(bm25) 순으로 offset 부터 limit 개의 결과를 반환합니다.
+        team_id 가 있으면 작성자의 팀이 team_id 인 task, team_id 가 할당된 subtask 만 반환합니다.
+        """
+        quote = self.connection.ops.quote_name
+        task_table = quote(Task._meta.db_table)
+        subtask_table = quote(SubTask._meta.db_table)
+        sql = (
+            f"SELECT {self.table}.rowid, COALESCE(t.id, st.task_id), COALESCE(t.title, st.sub_title), "
+            f"bm25({self.table}, {TITLE_WEIGHT}, 1.0) AS rank "
+            f"FROM {self.table} "
+            f"LEFT JOIN {task_table} AS t ON {self.table}.rowid & 1 = 0 AND t.id = {self.table}.rowid / 2 "
+            f"LEFT JOIN {subtask_table} AS st ON {self.table}.rowid & 1 = 1 AND st.id = {self.table}.rowid / 2 "
+            f"WHERE {self.table} MATCH %s AND (t.id IS NOT NULL OR st.id IS NOT NULL) "
+        )
+        params = [self.match_expression(query)]
+        if team_id is not None:
+            sql += (
+                f"AND (EXISTS (SELECT 1 FROM {quote(User._meta.db_table)} AS u "
+                f"WHERE u.id = t.create_user_id AND u.team_ref_id = %s) "
+                f"OR EXISTS (SELECT 1 FROM {quote(SubTask.team.through._meta.db_table)} AS stt "
+                f"WHERE stt.subtask_id = st.id AND stt.team_id = %s)) "
+            )
+            params += [team_id, team_id]
+        sql += f"ORDER BY rank, {self.table}.rowid LIMIT %s OFFSET %s"
+        params += [limit, offset]
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return [
+            {
+                "kind": split_row_id(rowid)[0],
+                "pk": split_row_id(rowid)[1],
+                "task_pk": task_pk,
+                "title": title,
+                # bm25() 는 관련도가 높을수록 작은(음수) 값입니다.
+                "score": round(-rank, 4),
+            }
+            for rowid, task_pk, title, rank in rows
+        ]
+
+    def filter_queryset(self, queryset, kind, query):
+        """
+        admin 검색용: 검색어와 일치하는 task / subtask 만 남깁니다. (LIKE '%...%' 전체 검색 대신)
+        """
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid / 2 FROM {self.table} WHERE {self.table} MATCH %s AND rowid & 1 = %s",
+                [self.match_expression(query), int(kind == "subtask")],
+            )
+        )
+
+
+class InvertedIndexBackend:
+    """
+    프로세스 메모리의 역색인 (단어 → 문서 별 가중 빈도)
+    처음 검색할 때 DB 에서 한 번 만들고, 이후에는 이 프로세스의 signals 로 커밋된 변경만 반영합니다.
+    변경은 커밋된 뒤에 반영하며, 색인을 만드는 중이라면 lock 을 기다렸다가 만든 색인 위에 반영합니다.
+    (다른 서버 프로세스의 변경은 반영되지 않으므로 여러 프로세스로 실행한다면 FTS5 를 사용합니다.)
+    관련도는 BM25 로 계산합니다.
+    """
+
+    stores_teams = True
+    k1 = 1.2
+    b = 0.75
+    batch_size = 2000
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.built = False
+        self.building = False
+        self.postings = defaultdict(dict)
+        self.documents = {}
+        self.total_length = 0
+
+    def prepare(self):
+        pass
+
+    # 색인 갱신: 문서를 만든 뒤 트랜잭션이 커밋되면 반영합니다.
+
+    @staticmethod
+    def document(title, content, task_pk, team_ids, user_pk=None):
+        title_tokens = tokenize(title)
+        content_tokens = tokenize(content)
+        terms = Counter(content_tokens)
+        for token in title_tokens:
+            terms[token] += TITLE_WEIGHT
+        return {
+            "terms": terms,
+            "length": TITLE_WEIGHT * len(title_tokens) + len(content_tokens),
+            "task_pk": task_pk,
+            "title": title,
+            "teams": frozenset(team_ids),
+            "user_pk": user_pk,
+        }
+
+    def task_documents(self, tasks):
+        team_ids = dict(
+            User.objects.filter(pk__in={task.create_user_id for task in tasks}).values_list(
+                "pk", "team_ref_id"
+            )
+        )
+        return {
+            ("task", task.pk): self.document(
+                task.title,
+                task.content,
+                task.pk,
+                [team_ids.get(task.create_user_id)],
+                task.create_user_id,
+            )
+            for task in tasks
+        }
+
+    def subtask_documents(self, subtasks):
+        team_ids = defaultdict(list)
+        for subtask_id, team_id in SubTask.team.through.objects.filter(
+            subtask_id__in=[subtask.pk for subtask in subtasks]
+        ).values_list("subtask_id", "team_id"):
+            team_ids[subtask_id].append(team_id)
+        return {
+            ("subtask", subtask.pk): self.document(
+                subtask.sub_title, subtask.sub_content, subtask.task_id, team_ids[subtask.pk]
+            )
+            for subtask in subtasks
+        }
+
+    def index_tasks(self, tasks):
+        tasks = list(tasks)
+        if tasks:
+            self.on_commit(lambda: self.task_documents(tasks))
+
+    def index_subtasks(self, subtasks):
+        subtasks = list(subtasks)
+        if subtasks:
+            self.on_commit(lambda: self.subtask_documents(subtasks))
+
+    def remove(self, kind, pks):
+        documents = {(kind, pk): None for pk in pks}
+        if documents:
+            self.on_commit(lambda: documents)
+
+    def user_team_changed(self, user_pk, team_id):
+        # 작성자의 팀이 바뀌면 그 작성자의 task 문서의 팀을 바꿉니다. (드문 변경이므로 전체를 훑습니다.)
+        def apply():
+            if not (self.built or self.building):
+                return
+            with self.lock:
+                for key, document in self.documents.items():
+                    if document["user_pk"] == user_pk:
+                        document["teams"] = frozenset([team_id])
+
+        transaction.on_commit(apply)
+
+    def on_commit(self, documents):
+        """
+        트랜잭션이 커밋되면 documents() 로 만든 문서를 색인에 반영합니다.
+        색인을 아직 만들지 않았다면 나중에 만들 때 커밋된 행을 읽으므로 건너뜁니다.
+        만드는 중이라면 그 전에 읽은 행일 수 있으므로 lock 을 기다렸다가 반영합니다.
+        """
+
+        def apply():
+            if self.built or self.building:
+                self.apply(documents())
+
+        transaction.on_commit(apply)
+
+    def apply(self, documents):
+        with self.lock:
+            for key, document in documents.items():
+                self.discard(key)
+                if document is not None:
+                    self.add(key, document)
+
+    def add(self, key, document):
+        self.documents[key] = document
+        self.total_length += document["length"]
+        for token, frequency in document["terms"].items():
+            self.postings[token][key] = frequency
+
+    def discard(self, key):
+        document = self.documents.pop(key, None)
+        if document is None:
+            return
+        self.total_length -= document["length"]
+        for token in document["terms"]:
+            postings = self.postings[token]
+            postings.pop(key, None)
+            if not postings:
+                del self.postings[token]
+
+    def ensure_built(self):
+        # 여러 요청이 동시에 처음 검색해도 한 번만 만듭니다.
+        if not self.built:
+            with self.lock:
+                if not self.built:
+                    self.rebuild()
+
+    def rebuild(self):
+        with self.lock:
+            # 만드는 동안 커밋된 변경은 on_commit 에서 lock 을 기다렸다가 반영합니다.
+            self.building = True
+            try:
+                self.postings = defaultdict(dict)
+                self.documents = {}
+                self.total_length = 0
+                counts = {"tasks": 0, "subtasks": 0}
+                for kind, queryset, documents in [
+                    ("tasks", Task.objects.only("pk", "title", "content", "create_user"), self.task_documents),
+                    (
+                        "subtasks",
+                        SubTask.objects.only("pk", "task", "sub_title", "sub_content"),
+                        self.subtask_documents,
+                    ),
+                ]:
+                    batch = []
+                    for obj in queryset.order_by("pk").iterator(chunk_size=self.batch_size):
+                        batch.append(obj)
+                        if len(batch) == self.batch_size:
+                            self.apply(documents(batch))
+                            counts[kind] += len(batch)
+                            batch = []
+                    if batch:
+                        self.apply(documents(batch))
+                        counts[kind] += len(batch)
+                self.built = True
+            finally:
+                self.building = False
+        return counts
+
+    def search(self, query, team_id=None, offset=0, limit=20):
+        """
+        검색어의 단어를 모두 포함하는 문서를 BM25 점수 순으로 offset 부터 limit 개 반환합니다.
+        가장 짧은 posting 목록부터 교집합을 구하므로 일치하는 문서 수만큼만 계산합니다.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        self.ensure_built()
+        with self.lock:
+            postings = [self.postings.get(token) for token in tokens]
+            if not tokens or not all(postings):
+                return []
+            documents_count = len(self.documents)
+            average_length = self.total_length / documents_count or 1
+            weighted = [
+                (
+                    postings_for_token,
+                    math.log(
+                        1
+                        + (documents_count - len(postings_for_token) + 0.5)
+                        / (len(postings_for_token) + 0.5)
+                    ),
+                )
+                for postings_for_token in sorted(postings, key=len)
+            ]
+
+            scores = []
+            for key in weighted[0][0]:
+                if not all(key in postings_for_token for postings_for_token, _ in weighted[1:]):
+                    continue
+                document = self.documents[key]
+                if team_id is not None and team_id not in document["teams"]:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * document["length"] / average_length)
+                score = 0.0
+                for postings_for_token, idf in weighted:
+                    frequency = postings_for_token[key]
+                    score += idf * frequency * (self.k1 + 1) / (frequency + norm)
+                scores.append((score, key, document))
+
+            ranked = heapq.nsmallest(
+                offset + limit, scores, key=lambda item: (-item[0], row_id(*item[1]))
+            )
+        return [
+            {
+                "kind": kind,
+                "pk": pk,
+                "task_pk": document["task_pk"],
+                "title": document["title"],
+                "score": round(score, 4),
+            }
+            for score, (kind, pk), document in ranked[offset:]
+        ]
+
+    def filter_queryset(self, queryset, kind, query):
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return queryset.none()
+        self.ensure_built()
+        with self.lock:
+            postings = sorted((self.postings.get(token) or {} for token in tokens), key=len)
+            pks = [
+                pk
+                for key_kind, pk in postings[0]
+                if key_kind == kind and all((key_kind, pk) in other for other in postings[1:])
+            ]
+        return queryset.filter(pk__in=pks)
+
+
+def fts5_available():
+    options = sqlite3.connect(":memory:").execute("PRAGMA compile_options").fetchall()
+    return ("ENABLE_FTS5",) in options
+
+
+def default_backend():
+    if settings.TASK_SEARCH_BACKEND:
+        return import_string(settings.TASK_SEARCH_BACKEND)()
+    if connections["default"].vendor == "sqlite" and fts5_available():
+        return Fts5Backend()
+    return InvertedIndexBackend()
+
+
+search_index = default_backend()
@@ -0,0 +1,105 @@
+from itertools import cycle
+
+from django.contrib.auth.hashers import make_password
+
+from users.models import User
+from . import search
+from .models import Team, Task, SubTask
+
+
+def seed_teams():
+    """
+    User.TeamChoices 의 모든 팀을 생성하고 {팀이름: Team} 으로 반환합니다.
+    """
+    Team.objects.bulk_create(
+        [Team(name=name) for name in User.TeamChoices.values],
+        ignore_conflicts=True,
+    )
+    return {team.name: team for team in Team.objects.all()}
+
+
+def seed_users(count, teams, prefix="seed", password="seedpassword", batch_size=1000):
+    """
+    비밀번호 해시를 한 번만 계산해서 모든 유저에 재사용합니다.
+    (create_user 반복 시 유저마다 PBKDF2 해시가 돌아 seed 시간이 대부분 해시에 쓰입니다.)
+    bulk_create 는 User.save() 를 거치지 않으므로 team_ref 도 직접 채웁니다.
+    """
+    hashed_password = make_password(password)
+    team_cycle = cycle(teams.values())
+    users = []
+    for index in range(count):
+        team = next(team_cycle)
+        users.append(
+            User(
+                username=f"{prefix}{index}",
+                password=hashed_password,
+                team=team.name,
+                team_ref=team,
+            )
+        )
+    User.objects.bulk_create(users, batch_size=batch_size)
+    return list(User.objects.filter(username__startswith=prefix).order_by("pk"))
+
+
+def seed_tasks(users, count, subtasks_per_task=0, batch_size=1000):
+    """
+    seed_subtasks 로 만들 subtask 개수만큼 카운터를 미리 채워둡니다.
+    """
+    creators = cycle(users)
+    tasks = [
+        Task(
+            create_user=next(creators),
+            title=f"Task {index}",
+            content=f"Task {index} 내용",
+            subtask_total=subtasks_per_task,
+        )
+        for index in range(count)
+    ]
+    tasks = Task.objects.bulk_create(tasks, batch_size=batch_size)
+    # bulk_create 는 signals 를 거치지 않으므로 검색 색인을 직접 갱신합니다.
+    search.search_index.index_tasks(tasks)
+    return tasks
+
+
+def seed_subtasks(tasks, per_task, teams, batch_size=1000):
+    """
+    task 마다 per_task 개의 subtask 를 만들고 팀을 하나씩 돌아가며 배정합니다.
+    M2M 은 through 테이블에 직접 bulk_create 합니다.
+    """
+    team_cycle = cycle(teams.values())
+    subtasks = []
+    for task in tasks:
+        for index in range(per_task):
+            subtasks.append(
+                SubTask(
+                    task=task,
+                    subtask_create_user_id=task.create_user_id,
+                    sub_title=f"{task.title} - SubTask {index}",
+                    sub_content=f"SubTask {index} 내용",
+                )
+            )
+    subtasks = SubTask.objects.bulk_create(subtasks, batch_size=batch_size)
+
+    SubTaskTeam = SubTask.team.through
+    SubTaskTeam.objects.bulk_create(
+        [
+            SubTaskTeam(subtask_id=subtask.pk, team_id=next(team_cycle).pk)
+            for subtask in subtasks
+        ],
+        batch_size=batch_size,
+    )
+    search.search_index.index_subtasks(subtasks)
+    return subtasks
+
+
+def seed(users=50, tasks=1000, subtasks_per_task=0, prefix="seed", password="seedpassword"):
+    teams = seed_teams()
+    seeded_users = seed_users(users, teams, prefix=prefix, password=password)
+    seeded_tasks = seed_tasks(seeded_users, tasks, subtasks_per_task)
+    seeded_subtasks = seed_subtasks(seeded_tasks, subtasks_per_task, teams)
+    return {
+        "teams": teams,
+        "users": seeded_users,
+        "tasks": seeded_tasks,
+        "subtasks": seeded_subtasks,
+    }
@@ -59,12 +59,14 @@ class TaskSerializer(serializers.ModelSerializer):
     modified_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S", read_only=True)
     completed_date = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S", read_only=True)
     total_subtasks = serializers.SerializerMethodField()
+    completed_subtasks = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
         fields = (
             "task_pk",
             "total_subtasks",
+            "completed_subtasks",
             "team",
             "create_user",
             "title",
@@ -87,13 +89,22 @@ class TaskSerializer(serializers.ModelSerializer):
         return obj.pk
 
     def get_total_subtasks(self, obj):
+        # Task.objects.with_subtask_counts() 로 annotate 된 값을 우선 사용
+        if hasattr(obj, "total_subtasks"):
+            return obj.total_subtasks
         return obj.subtasks.count()
 
+    def get_completed_subtasks(self, obj):
+        if hasattr(obj, "completed_subtasks"):
+            return obj.completed_subtasks
+        return obj.subtasks.filter(is_complete=True).count()
+
 
 class TaskListSerializer(serializers.ModelSerializer):
     task_pk = serializers.SerializerMethodField()
     team = serializers.CharField(source="create_user.team", read_only=True)
     total_subtasks = serializers.SerializerMethodField()
+    completed_subtasks = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
@@ -103,14 +114,23 @@ class TaskListSerializer(serializers.ModelSerializer):
             "title",
             "is_complete",
             "total_subtasks",
+            "completed_subtasks",
         )
 
     def get_task_pk(self, obj):
         return obj.pk
 
     def get_total_subtasks(self, obj):
+        # Task.objects.with_subtask_counts() 로 annotate 된 값을 우선 사용
+        if hasattr(obj, "total_subtasks"):
+            return obj.total_subtasks
         return obj.subtasks.count()
 
+    def get_completed_subtasks(self, obj):
+        if hasattr(obj, "completed_subtasks"):
+            return obj.completed_subtasks
+        return obj.subtasks.filter(is_complete=True).count()
+
 
 class SubTaskSerializer(serializers.ModelSerializer):
     # task_pk = serializers.SerializerMethodField()
@@ -146,8 +166,21 @@ class SubTaskSerializer(serializers.ModelSerializer):
         return obj.pk
 
 
+class SubTaskSyncSerializer(SubTaskSerializer):
+    """
+    변경분 동기화용: 어느 task 의 subtask 인지와 수정 시각을 함께 내려줍니다.
+    """
+
+    task_pk = serializers.IntegerField(source="task_id", read_only=True)
+    modified_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S", read_only=True)
+
+    class Meta(SubTaskSerializer.Meta):
+        fields = ("task_pk",) + SubTaskSerializer.Meta.fields + ("modified_at",)
+
+
 class SubTaskListSerializer(serializers.ModelSerializer):
-    task_pk = serializers.SerializerMethodField()
+    # task 를 조회하지 않고 FK 값을 그대로 읽습니다.
+    task_pk = serializers.IntegerField(source="task_id", read_only=True)
     subtask_pk = serializers.SerializerMethodField()
     task_team = serializers.CharField(source="task.create_user.team", read_only=True)
     team = serializers.SlugRelatedField(
@@ -168,9 +201,6 @@ class SubTaskListSerializer(serializers.ModelSerializer):
             "is_complete",
         )
 
-    def get_task_pk(self, obj):
-        return obj.task.pk
-
     def get_subtask_pk(self, obj):
         return obj.pk
 
@@ -204,6 +234,27 @@ class NewSubTaskSerializer(serializers.ModelSerializer):
         return obj.pk
 
 
+class BulkSubTaskSerializer(serializers.ModelSerializer):
+    """
+    subtask 일괄 생성용 serializer
+    team 은 이름 목록으로만 검증하고, Team 조회는 view 에서 한 번에 처리합니다.
+    """
+
+    team = serializers.ListField(
+        child=serializers.CharField(max_length=50),
+        required=False,
+        default=list,
+    )
+
+    class Meta:
+        model = SubTask
+        fields = (
+            "team",
+            "sub_title",
+            "sub_content",
+        )
+
+
 class TinySubTaskSerializer(serializers.ModelSerializer):
     subtask_pk = serializers.SerializerMethodField()
     team = serializers.SlugRelatedField(
@@ -0,0 +1,261 @@
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from users.models import User
+from .cache import (
+    bump_all_team_versions,
+    bump_team_versions,
+    subtask_team_ids,
+    task_team_ids,
+)
+from . import search
+from .events import publish_event
+from .models import Task, SubTask
+
+
+def deleted_with_task(origin):
+    """
+    Task 삭제로 cascade 된 subtask 인지 확인합니다.
+    이 경우 Task 의 pre/post_delete 에서 한 번에 처리하므로 subtask 마다 실행하지 않습니다.
+    """
+    if isinstance(origin, QuerySet):
+        return origin.model is Task
+    return isinstance(origin, Task)
+
+
+@receiver(post_save, sender=SubTask)
+def update_counters_on_subtask_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    loaded_is_complete = getattr(instance, "_loaded_is_complete", None)
+    tasks = Task.objects.filter(pk=instance.task_id)
+    instance._completion_changed = (
+        not created
+        and loaded_is_complete is not None
+        and instance.is_complete != loaded_is_complete
+    )
+
+    instance._task_completion_changed = False
+    if created:
+        tasks.update_subtask_counters(total=1, done=int(instance.is_complete))
+    elif instance._completion_changed:
+        # 완료 여부가 바뀐 경우에만 Task 완료 처리를 조건부 UPDATE 로 갱신
+        instance._task_completion_changed = bool(
+            Task.objects.complete_subtasks({instance.task_id: 1 if instance.is_complete else -1})
+        )
+
+    instance._loaded_is_complete = instance.is_complete
+
+
+@receiver(post_delete, sender=SubTask)
+def update_counters_on_subtask_delete(sender, instance, origin=None, **kwargs):
+    if deleted_with_task(origin):
+        # task 행도 함께 지워지므로 카운터를 갱신할 필요가 없습니다.
+        return
+    is_complete = getattr(instance, "_loaded_is_complete", None)
+    if is_complete is None:
+        is_complete = instance.is_complete
+    Task.objects.filter(pk=instance.task_id).update_subtask_counters(
+        total=-1,
+        done=-int(is_complete),
+    )
+
+
+# 팀 별 캐시 무효화 / 이벤트 발행
+
+
+def change_type(prefix, instance, signal, created=False):
+    if signal is post_delete:
+        return f"{prefix}.deleted"
+    if created:
+        return f"{prefix}.created"
+    if getattr(instance, "_completion_changed", False):
+        # subtask 완료 여부가 바뀌면 상위 task 의 완료 여부도 함께 바뀔 수 있습니다.
+        return f"{prefix}.completed" if instance.is_complete else f"{prefix}.reopened"
+    return f"{prefix}.updated"
+
+
+@receiver(pre_delete, sender=Task)
+def remember_task_subtasks(sender, instance, **kwargs):
+    # cascade 로 함께 지워질 subtask 와 그 팀을 task 마다 한 번만 조회해 보관합니다.
+    instance._deleted_subtask_pks = list(instance.subtasks.values_list("pk", flat=True))
+    instance._deleted_team_ids = list(subtask_team_ids(instance._deleted_subtask_pks))
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def bump_versions_on_task_change(sender, instance, signal, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    team_ids = list(
+        User.objects.filter(pk=instance.create_user_id).values_list("team_ref_id", flat=True)
+    )
+    event = {
+        "type": change_type("task", instance, signal, created),
+        "task_pk": instance.pk,
+        "is_complete": instance.is_complete,
+    }
+    if signal is post_delete:
+        team_ids += getattr(instance, "_deleted_team_ids", [])
+        event["subtask_pks"] = getattr(instance, "_deleted_subtask_pks", [])
+    bump_team_versions(team_ids)
+    publish_event(team_ids, event)
+
+
+@receiver(pre_delete, sender=SubTask)
+def remember_subtask_teams(sender, instance, origin=None, **kwargs):
+    if deleted_with_task(origin):
+        return
+    # post_delete 시점에는 M2M 행이 이미 지워져 있으므로 미리 보관합니다.
+    instance._deleted_team_ids = list(subtask_team_ids([instance.pk]))
+
+
+@receiver(post_save, sender=SubTask)
+@receiver(post_delete, sender=SubTask)
+def bump_versions_on_subtask_change(
+    sender, instance, signal, created=False, raw=False, origin=None, **kwargs
+):
+    if raw or deleted_with_task(origin):
+        return
+    task_teams = list(task_team_ids([instance.task_id]))
+    team_ids = list(task_teams)
+    if hasattr(instance, "_deleted_team_ids"):
+        team_ids += instance._deleted_team_ids
+    else:
+        team_ids += subtask_team_ids([instance.pk])
+    bump_team_versions(team_ids)
+    publish_event(
+        team_ids,
+        {
+            "type": change_type("subtask", instance, signal, created),
+            "task_pk": instance.task_id,
+            "subtask_pk": instance.pk,
+            "is_complete": instance.is_complete,
+        },
+    )
+    if getattr(instance, "_task_completion_changed", False):
+        # 카운터 UPDATE 로 바뀐 task 는 post_save 가 없으므로 task 이벤트도 여기서 발행합니다.
+        publish_event(
+            task_teams,
+            {
+                "type": "task.completed" if instance.is_complete else "task.reopened",
+                "task_pk": instance.task_id,
+                "is_complete": instance.is_complete,
+            },
+        )
+
+
+@receiver(m2m_changed, sender=SubTask.team.through)
+def bump_versions_on_subtask_team_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # clear 이후에는 어떤 팀이 빠졌는지 알 수 없으므로 미리 보관합니다.
+        if reverse:
+            instance._cleared_pks = list(
+                sender.objects.filter(team_id=instance.pk).values_list("subtask_id", flat=True)
+            )
+        else:
+            instance._cleared_pks = list(subtask_team_ids([instance.pk]))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    changed_pks = getattr(instance, "_cleared_pks", []) if action == "post_clear" else pk_set
+
+    if reverse:
+        # team.subtasks_teams.add(...) 처럼 Team 쪽에서 변경한 경우 pk_set 은 subtask pk
+        task_ids = SubTask.objects.filter(pk__in=changed_pks).values_list("task_id", flat=True)
+        team_ids = [instance.pk, *task_team_ids(task_ids)]
+        event = {"type": "subtask.updated", "subtask_pks": sorted(changed_pks)}
+    else:
+        team_ids = [*changed_pks, *task_team_ids([instance.task_id])]
+        event = {"type": "subtask.updated", "task_pk": instance.task_id, "subtask_pk": instance.pk}
+    bump_team_versions(team_ids)
+    publish_event(team_ids, event)
+
+
+@receiver(post_save, sender=User)
+def bump_versions_on_user_team_change(sender, instance, raw=False, **kwargs):
+    # 작성자의 팀이 바뀌면 여러 팀의 리스트(task_team 포함)가 달라지므로 전체를 무효화합니다.
+    if not raw and getattr(instance, "_team_ref_changed", False):
+        bump_all_team_versions()
+
+
+# 검색 색인 동기화 (tasks.search)
+# bulk_create 경로는 signals 를 거치지 않으므로 각 경로에서 index_tasks / index_subtasks 를 직접 호출합니다.
+
+
+@receiver(post_migrate)
+def prepare_search_index(sender, **kwargs):
+    if sender.name == "tasks":
+        search.search_index.prepare()
+
+
+def text_changed(instance, fields, created, update_fields):
+    """
+    검색 대상 필드가 바뀐 경우에만 다시 색인합니다.
+    카운터, 완료 여부, 시각만 바뀐 저장은 건너뜁니다.
+    """
+    if update_fields is not None and update_fields.isdisjoint(fields):
+        # save(update_fields=[...]) 로 검색 대상이 아닌 필드만 저장한 경우
+        return False
+    current = {field: getattr(instance, field) for field in fields}
+    loaded = getattr(instance, "_loaded_search_text", None)
+    # 같은 인스턴스를 다시 저장할 때는 이번에 저장한 값과 비교합니다.
+    instance._loaded_search_text = current
+    return created or loaded != current
+
+
+@receiver(post_save, sender=Task)
+def index_task(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if not raw and text_changed(instance, ("title", "content"), created, update_fields):
+        search.search_index.index_tasks([instance])
+
+
+@receiver(post_save, sender=SubTask)
+def index_subtask(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if not raw and text_changed(instance, ("sub_title", "sub_content"), created, update_fields):
+        search.search_index.index_subtasks([instance])
+
+
+@receiver(post_delete, sender=Task)
+def unindex_task(sender, instance, **kwargs):
+    search.search_index.remove("task", [instance.pk])
+    search.search_index.remove("subtask", getattr(instance, "_deleted_subtask_pks", []))
+
+
+@receiver(post_delete, sender=SubTask)
+def unindex_subtask(sender, instance, origin=None, **kwargs):
+    if not deleted_with_task(origin):
+        search.search_index.remove("subtask", [instance.pk])
+
+
+@receiver(m2m_changed, sender=SubTask.team.through)
+def reindex_subtask_teams(sender, instance, action, reverse, pk_set, **kwargs):
+    # 팀을 함께 색인하는 backend 만 다시 색인합니다. (FTS5 는 검색할 때 팀을 join 합니다.)
+    if not search.search_index.stores_teams or action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        subtask_pks = [instance.pk]
+    elif action == "post_clear":
+        subtask_pks = getattr(instance, "_cleared_pks", [])
+    else:
+        subtask_pks = pk_set
+    search.search_index.index_subtasks(SubTask.objects.filter(pk__in=subtask_pks))
+
+
+@receiver(post_save, sender=User)
+def reindex_user_task_teams(sender, instance, raw=False, **kwargs):
+    if (
+        not raw
+        and search.search_index.stores_teams
+        and getattr(instance, "_team_ref_changed", False)
+    ):
+        search.search_index.user_team_changed(instance.pk, instance.team_ref_id)
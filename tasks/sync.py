@@ -0,0 +1,123 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import Task, SubTask, Tombstone
+from .serializers import SubTaskSyncSerializer, TaskSerializer
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+# 토큰에는 종류마다 마지막으로 내려준 행의 (modified_at 또는 deleted_at, pk) 위치를 담습니다.
+STREAMS = ("tasks", "subtasks", "deleted")
+
+
+def encode_token(positions):
+    data = {name: [timestamp.isoformat(), pk] for name, (timestamp, pk) in positions.items()}
+    encoded = base64.urlsafe_b64encode(json.dumps(data).encode())
+    return encoded.decode().rstrip("=")
+
+
+def decode_token(token):
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        positions = {
+            name: (datetime.fromisoformat(data[name][0]), int(data[name][1]))
+            for name in STREAMS
+        }
+        expired = positions["deleted"][0] < Tombstone.objects.retention_cutoff()
+    except (TypeError, ValueError, KeyError, IndexError):
+        raise ValidationError({"since": "잘못된 since 토큰입니다."})
+    if expired:
+        # 그 사이의 삭제 기록이 지워졌을 수 있으므로 이어서 조회할 수 없습니다.
+        raise ValidationError({"since": "만료된 since 토큰입니다. since 없이 다시 동기화하세요."})
+    return positions
+
+
+def get_limit(query_params):
+    limit = query_params.get("limit")
+    if limit is None:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValidationError({"limit": "limit는 숫자여야 합니다."})
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def after(queryset, field, position):
+    """
+    (field, pk) > position 인 행만 남깁니다. (인덱스 범위 검색이 가능한 형태로 풀어 씁니다.)
+    """
+    timestamp, pk = position
+    return queryset.filter(
+        Q(**{f"{field}__gte": timestamp}),
+        Q(**{f"{field}__gt": timestamp}) | Q(pk__gt=pk),
+    )
+
+
+def collect_changes(positions, limit=DEFAULT_LIMIT):
+    """
+    토큰의 위치 이후에 변경된 task / subtask 와 삭제 기록을 종류마다 limit 개까지 모읍니다.
+    positions 가 없으면 전체 데이터를 내려주는 최초 동기화입니다.
+    한 번에 다 내려주지 못하면 has_more 가 true 이며, next_since 로 이어서 조회합니다.
+
+    modified_at 은 저장하는 시점의 시각이므로 먼저 저장하고 늦게 커밋된 행은 이미 지나간 위치에 놓입니다.
+    그래서 더 내려줄 행이 없으면 토큰 위치를 TASK_SYNC_OVERLAP_SECONDS 초 전까지 되돌려
+    최근 변경분을 다음 요청에서 한 번 더 확인합니다. (클라이언트는 pk 로 덮어쓰므로 중복되어도 됩니다.)
+    """
+    cutoff = (timezone.now() - timedelta(seconds=settings.TASK_SYNC_OVERLAP_SECONDS), 0)
+    querysets = {
+        "tasks": (Task.objects.with_subtask_counts(), "modified_at"),
+        "subtasks": (SubTask.objects.with_related(), "modified_at"),
+        "deleted": (Tombstone.objects.only("kind", "object_pk", "deleted_at"), "deleted_at"),
+    }
+
+    rows = {}
+    next_positions = {}
+    has_more = False
+    for name, (queryset, field) in querysets.items():
+        position = positions[name] if positions is not None else None
+        if position is None and name == "deleted":
+            # 최초 동기화에는 삭제 기록이 필요 없습니다.
+            rows[name] = []
+            next_positions[name] = cutoff
+            continue
+
+        queryset = queryset.order_by(field, "pk")
+        if position is not None:
+            queryset = after(queryset, field, position)
+        # 더 남은 행이 있는지 확인하기 위해 한 행 더 조회합니다.
+        page = list(queryset[: limit + 1])
+        more = len(page) > limit
+        rows[name] = page[:limit]
+
+        if rows[name]:
+            last = (getattr(rows[name][-1], field), rows[name][-1].pk)
+        else:
+            last = position or cutoff
+        next_positions[name] = last if more else min(last, cutoff)
+        has_more = has_more or more
+
+    deleted = {"tasks": [], "subtasks": []}
+    for tombstone in rows["deleted"]:
+        if tombstone.kind == Tombstone.KindChoices.Task:
+            deleted["tasks"].append(tombstone.object_pk)
+        else:
+            deleted["subtasks"].append(tombstone.object_pk)
+
+    return {
+        "tasks": TaskSerializer(rows["tasks"], many=True).data,
+        "subtasks": SubTaskSyncSerializer(rows["subtasks"], many=True).data,
+        "deleted": deleted,
+        "has_more": has_more,
+        "next_since": encode_token(next_positions),
+    }
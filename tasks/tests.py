@@ -1,22 +1,26 @@
 import pytest
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from conftest import QueryBudgetExceeded
 from users.models import User
-from tasks.models import Task, SubTask, Team
+from tasks.factories import make_subtasks, make_task, make_tasks, make_teams, make_user
+from tasks.models import ImportCheckpoint, Task, SubTask, Team
 
 client = APIClient()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # 테스트마다 DB가 롤백되므로 팀 별 캐시도 비워둡니다.
+    cache.clear()
+
+
 @pytest.fixture()
-def create_user(django_user_model):
-    user = django_user_model.objects.create_user(
-        username="testuser",
-        password="test123",
-        team=User.TeamChoices.Danbi,
-    )
-    return user
+def create_user(db):
+    return make_user("testuser", "test123")
 
 
 @pytest.fixture()
@@ -56,31 +60,10 @@ def create_task_with_user(django_user_model):
 
 
 @pytest.fixture()
-def subtask_with_user(django_user_model):
-    user = django_user_model.objects.create_user(
-        username="subtaskuser",
-        password="subtask123",
-        team=User.TeamChoices.Danbi,
-    )
-    task = Task.objects.create(
-        title="Task 제목",
-        content="Task 내용",
-        create_user=user,
-    )
-
-    team_danbi, _ = Team.objects.get_or_create(name=User.TeamChoices.Danbi)
-    team_supie, _ = Team.objects.get_or_create(name=User.TeamChoices.Supie)
-    team_values = [team_danbi.id, team_supie.id]
-
-    subtask = SubTask.objects.create(
-        sub_title="SubTask 제목",
-        sub_content="SubTask 내용",
-        task=task,
-        subtask_create_user=user,
-    )
-    subtask.team.set(team_values)
-
-    return user, task, subtask
+def subtask_with_user(db):
+    user = make_user("subtaskuser", "subtask123")
+    task = make_task(user, subtasks=1)
+    return user, task, task.subtasks.get()
 
 
 # Task testcode
@@ -394,3 +377,1618 @@ def test_subtask_detail_view_delete_success(subtask_with_user):
     response = client.delete(url, format="json")
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert not SubTask.objects.filter(pk=subtask.pk).exists()
+
+
+# Pagination testcode
+
+
+@pytest.mark.django_db
+def test_task_list_cursor_pagination(create_user):
+    """
+    cursor로 다음 페이지를 이어서 조회하는 테스트
+    """
+    for index in range(5):
+        Task.objects.create(
+            title=f"Task {index}", content="Task 내용", create_user=create_user
+        )
+    url = reverse("task-list")
+
+    first_page = client.get(url, {"page_size": 2})
+    assert first_page.status_code == status.HTTP_200_OK
+    assert len(first_page.data["results"]) == 2
+    assert first_page.data["next_cursor"] is not None
+
+    task_pks = [task["task_pk"] for task in first_page.data["results"]]
+    cursor = first_page.data["next_cursor"]
+    while cursor:
+        page = client.get(url, {"page_size": 2, "cursor": cursor})
+        task_pks += [task["task_pk"] for task in page.data["results"]]
+        cursor = page.data["next_cursor"]
+
+    assert task_pks == list(Task.objects.order_by("created_at", "pk").values_list("pk", flat=True))
+
+
+@pytest.mark.django_db
+def test_task_list_invalid_cursor():
+    """
+    잘못된 cursor로 조회하는 경우
+    """
+    url = reverse("task-list")
+    response = client.get(url, {"cursor": "invalid-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_my_task_list_separate_cursors(subtask_with_user):
+    """
+    내 팀 리스트는 task와 subtask의 cursor가 따로 내려오는 테스트
+    """
+    user, task, subtask = subtask_with_user
+    Task.objects.create(title="두번째 Task", content="Task 내용", create_user=user)
+    client.login(username="subtaskuser", password="subtask123")
+    url = reverse("task-team-list")
+
+    response = client.get(url, {"page_size": 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["tasks"]) == 1
+    assert response.data["next_task_cursor"] is not None
+    assert len(response.data["subtasks"]) == 1
+    assert response.data["next_subtask_cursor"] is None
+
+    response = client.get(
+        url, {"page_size": 1, "task_cursor": response.data["next_task_cursor"]}
+    )
+    assert response.data["tasks"][0]["title"] == "두번째 Task"
+    assert response.data["next_task_cursor"] is None
+
+
+# List rows testcode
+
+
+@pytest.mark.django_db
+def test_list_rows_match_list_serializers():
+    """
+    목록 API 의 .values() 직렬화가 TaskListSerializer, SubTaskListSerializer 와 같은 결과를 내는지 테스트
+    """
+    from tasks.rows import subtask_list, task_list_rows
+    from tasks.serializers import SubTaskListSerializer, TaskListSerializer
+
+    user = make_user("rowsuser")
+    other = make_user("rowsother", team=User.TeamChoices.Supie)
+    make_tasks(user, 3, subtasks=2)
+    make_tasks(other, 2, subtasks=1, teams=("Supie",))
+    SubTask.objects.filter(pk=SubTask.objects.first().pk).update(is_complete=True)
+    make_task(user, subtasks=1, teams=())
+
+    tasks = Task.objects.order_by("created_at", "pk")
+    subtasks = SubTask.objects.order_by("created_at", "pk")
+
+    assert task_list_rows(tasks.list_values()) == TaskListSerializer(
+        tasks.with_subtask_counts(), many=True
+    ).data
+    assert subtask_list(list(subtasks.list_values())) == SubTaskListSerializer(
+        subtasks.with_related(), many=True
+    ).data
+    assert subtask_list([]) == []
+
+
+# Query count testcode
+
+
+@pytest.mark.django_db
+def test_task_list_subtask_counts_fixed_queries(create_user, django_assert_num_queries):
+    """
+    task 개수와 상관없이 task 리스트의 쿼리 수가 일정한지 테스트
+    """
+    for index in range(5):
+        task = Task.objects.create(
+            title=f"Task {index}", content="Task 내용", create_user=create_user
+        )
+        SubTask.objects.create(task=task, subtask_create_user=create_user, is_complete=True)
+        SubTask.objects.create(task=task, subtask_create_user=create_user)
+
+    url = reverse("task-list")
+    # ETag 집계 1번, task 페이지 1번
+    with django_assert_num_queries(2):
+        response = APIClient().get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    for task in response.data["results"]:
+        assert task["total_subtasks"] == 2
+        assert task["completed_subtasks"] == 1
+
+
+@pytest.mark.django_db
+def test_task_detail_subtask_counts(subtask_with_user, django_assert_num_queries):
+    """
+    task 상세 조회 시 subtask 개수를 annotate 값으로 조회하는지 테스트
+    """
+    _, task, _ = subtask_with_user
+    url = reverse("task-detail", args=[task.pk])
+    # ETag 집계 1번, task(+ create_user, subtask 개수) 1번, subtask 목록 1번, subtask 팀 1번
+    with django_assert_num_queries(4):
+        response = APIClient().get(url)
+
+    assert response.data["task"]["total_subtasks"] == 1
+    assert response.data["task"]["completed_subtasks"] == 0
+
+
+# Subtask counter testcode
+
+
+@pytest.mark.django_db
+def test_subtask_complete_updates_task_counters(subtask_with_user):
+    """
+    subtask 완료 시 task 카운터와 완료 상태가 함께 갱신되는지 테스트
+    """
+    user, task, subtask = subtask_with_user
+    task.refresh_from_db()
+    assert (task.subtask_total, task.subtask_done) == (1, 0)
+
+    client.login(username="subtaskuser", password="subtask123")
+    url = reverse("subtask-detail", args=[task.pk, subtask.pk])
+    response = client.put(url, {"is_complete": True}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+    task.refresh_from_db()
+    assert (task.subtask_total, task.subtask_done) == (1, 1)
+    assert task.is_complete
+    assert task.completed_date is not None
+
+    response = client.put(url, {"is_complete": False}, format="json")
+    task.refresh_from_db()
+    assert (task.subtask_total, task.subtask_done) == (1, 0)
+    assert not task.is_complete
+    assert task.completed_date is None
+
+
+@pytest.mark.django_db
+def test_subtask_delete_updates_task_counters(subtask_with_user):
+    """
+    subtask 생성/삭제 시 task 카운터가 갱신되는지 테스트
+    """
+    user, task, subtask = subtask_with_user
+    SubTask.objects.create(task=task, subtask_create_user=user, is_complete=True)
+    task.refresh_from_db()
+    assert (task.subtask_total, task.subtask_done) == (2, 1)
+
+    SubTask.objects.get(pk=subtask.pk).delete()
+    task.refresh_from_db()
+    assert (task.subtask_total, task.subtask_done) == (1, 1)
+
+
+@pytest.mark.django_db
+def test_rebuild_task_counters_command(subtask_with_user):
+    """
+    카운터가 틀어졌을 때 management command로 복구하는 테스트
+    """
+    from django.core.management import call_command
+
+    _, task, _ = subtask_with_user
+    Task.objects.filter(pk=task.pk).update(subtask_total=10, subtask_done=7)
+
+    call_command("rebuild_task_counters")
+
+    task.refresh_from_db()
+    assert (task.subtask_total, task.subtask_done) == (1, 0)
+
+
+@pytest.mark.django_db
+def test_factories_match_signal_counters():
+    """
+    bulk_create 로 만든 테스트 데이터의 카운터가 실제 subtask 와 같고, 이후 save() 도 카운터를 갱신하는지 테스트
+    """
+    from django.core.management import call_command
+
+    user = make_user("factoryuser")
+    tasks = make_tasks(user, 3, subtasks=2)
+    call_command("rebuild_task_counters")
+
+    for task in Task.objects.filter(pk__in=[task.pk for task in tasks]):
+        assert (task.subtask_total, task.subtask_done) == (2, 0)
+    assert SubTask.team.through.objects.filter(subtask__task__in=tasks).count() == 12
+
+    (subtask,) = make_subtasks([tasks[0]], 1)
+    subtask.is_complete = True
+    subtask.save()
+    tasks[0].refresh_from_db()
+    assert tasks[0].subtask_done == 1
+
+    assert client.login(username="factoryuser", password="test123")
+    client.logout()
+
+
+# Bulk subtask testcode
+
+
+@pytest.mark.django_db
+def test_bulk_subtask_create_success(subtask_with_user):
+    """
+    subtask 일괄 생성 성공 테스트
+    """
+    user, task, _ = subtask_with_user
+    client.login(username="subtaskuser", password="subtask123")
+    url = reverse("bulk-subtask", args=[task.pk])
+    data = [
+        {"sub_title": f"일괄 서브태스크 {index}", "sub_content": "내용", "team": ["Danbi", "Supie"]}
+        for index in range(3)
+    ]
+    response = client.post(url, data, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [result["index"] for result in response.data["results"]] == [0, 1, 2]
+
+    created = SubTask.objects.filter(sub_title__startswith="일괄 서브태스크")
+    assert created.count() == 3
+    for subtask in created:
+        assert sorted(subtask.team.values_list("name", flat=True)) == ["Danbi", "Supie"]
+
+    task.refresh_from_db()
+    assert task.subtask_total == 4
+
+
+@pytest.mark.django_db
+def test_bulk_subtask_create_unknown_team(subtask_with_user):
+    """
+    존재하지 않는 팀이 포함되면 아무것도 생성하지 않는 테스트
+    """
+    user, task, _ = subtask_with_user
+    client.login(username="subtaskuser", password="subtask123")
+    url = reverse("bulk-subtask", args=[task.pk])
+    data = [
+        {"sub_title": "일괄 서브태스크 0", "team": ["Danbi"]},
+        {"sub_title": "일괄 서브태스크 1", "team": ["OtherTeam"]},
+    ]
+    response = client.post(url, data, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["results"][0]["index"] == 1
+    assert "team" in response.data["results"][0]["errors"]
+    assert not SubTask.objects.filter(sub_title__startswith="일괄 서브태스크").exists()
+
+
+# Bulk complete testcode
+
+
+@pytest.mark.django_db
+def test_bulk_complete_subtasks(subtask_with_user, django_assert_max_num_queries):
+    """
+    subtask 일괄 완료 시 상위 task 도 완료 처리되는지 테스트
+    """
+    user, task, subtask = subtask_with_user
+    other = SubTask.objects.create(task=task, subtask_create_user=user)
+    client.login(username="subtaskuser", password="subtask123")
+    url = reverse("subtask-bulk-complete")
+    data = {"subtask_pks": [subtask.pk, other.pk], "is_complete": True}
+
+    # 세션/유저 조회 + 권한(행 잠금) 1번 + UPDATE 1번 + task 잠금 조회/갱신 2번 + 캐시 무효화 팀 조회 2번
+    with django_assert_max_num_queries(10):
+        response = client.post(url, data, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["updated"] == sorted([subtask.pk, other.pk])
+
+    task.refresh_from_db()
+    assert (task.subtask_total, task.subtask_done) == (2, 2)
+    assert task.is_complete
+    assert SubTask.objects.filter(task=task, is_complete=True).count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_complete_subtasks_forbidden(subtask_with_user, django_user_model):
+    """
+    권한 없는 subtask 가 포함되면 아무것도 변경하지 않는 테스트
+    """
+    user, task, subtask = subtask_with_user
+    django_user_model.objects.create_user(
+        username="otheruser", password="otherpass", team="OtherTeam"
+    )
+    client.login(username="otheruser", password="otherpass")
+    url = reverse("subtask-bulk-complete")
+    data = {"subtask_pks": [subtask.pk], "is_complete": True}
+    response = client.post(url, data, format="json")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.data["subtask_pks"] == [subtask.pk]
+    subtask.refresh_from_db()
+    assert not subtask.is_complete
+
+
+@pytest.mark.django_db
+def test_bulk_complete_subtasks_rejects_bool_pks(subtask_with_user):
+    """
+    subtask_pks 에 true/false 가 있으면 pk 1/0 으로 처리하지 않고 400 을 반환하는 테스트
+    """
+    client.login(username="subtaskuser", password="subtask123")
+    response = client.post(
+        reverse("subtask-bulk-complete"),
+        {"subtask_pks": [True], "is_complete": True},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not SubTask.objects.filter(is_complete=True).exists()
+
+
+@pytest.mark.django_db
+def test_my_task_list_filters_by_team_id(subtask_with_user, django_user_model):
+    """
+    팀 FK 기준으로 내 팀 task만 조회되는지 테스트
+    """
+    user, task, _ = subtask_with_user
+    other_user = django_user_model.objects.create_user(
+        username="otheruser", password="otherpass", team=User.TeamChoices.Haetae
+    )
+    Task.objects.create(title="다른 팀 Task", content="내용", create_user=other_user)
+
+    client.login(username="subtaskuser", password="subtask123")
+    response = client.get(reverse("task-team-list"))
+    assert [item["task_pk"] for item in response.data["tasks"]] == [task.pk]
+    assert len(response.data["subtasks"]) == 1
+
+    response = client.get(reverse("task-list"), {"team": User.TeamChoices.Haetae})
+    assert [item["title"] for item in response.data["tasks"]] == ["다른 팀 Task"]
+    assert response.data["subtasks"] == []
+
+
+# Team cache testcode
+
+
+@pytest.mark.django_db
+def test_my_task_list_cache_hit_and_invalidation(
+    subtask_with_user, django_capture_on_commit_callbacks
+):
+    """
+    내 팀 리스트가 캐시되고, 쓰기 이후에는 새 데이터로 조회되는지 테스트
+    """
+    from config.metrics import registry
+    from tasks.cache import stats
+
+    user, task, subtask = subtask_with_user
+    client.login(username="subtaskuser", password="subtask123")
+    url = reverse("task-team-list")
+    hits = stats.hits
+
+    response = client.get(url)
+    assert response["X-Cache"] == "MISS"
+    response = client.get(url)
+    assert response["X-Cache"] == "HIT"
+    assert stats.hits == hits + 1
+    # hit / miss 수는 /metrics/ 로 내보냅니다.
+    body = registry.render()
+    assert f"team_list_cache_hits_total {stats.hits}" in body
+    assert "# TYPE team_list_cache_hit_ratio gauge" in body
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Task.objects.create(title="새 Task", content="내용", create_user=user)
+
+    response = client.get(url)
+    assert response["X-Cache"] == "MISS"
+    assert len(response.data["tasks"]) == 2
+
+    # subtask 팀 변경(M2M)도 해당 팀의 캐시를 무효화
+    with django_capture_on_commit_callbacks(execute=True):
+        subtask.team.remove(Team.objects.get(name=User.TeamChoices.Danbi))
+
+    response = client.get(url)
+    assert response["X-Cache"] == "MISS"
+    assert response.data["subtasks"] == []
+
+
+# ETag testcode
+
+
+@pytest.mark.django_db
+def test_task_detail_etag_not_modified(subtask_with_user, django_assert_num_queries):
+    """
+    If-None-Match 가 같으면 직렬화 없이 304를 반환하는 테스트
+    """
+    user, task, subtask = subtask_with_user
+    url = reverse("task-detail", args=[task.pk])
+    anonymous = APIClient()
+
+    response = anonymous.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response["ETag"]
+
+    # ETag 집계 쿼리 1번만 실행
+    with django_assert_num_queries(1):
+        response = anonymous.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    SubTask.objects.create(task=task, subtask_create_user=user, sub_title="새 SubTask")
+    response = anonymous.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_task_list_and_subtask_list_etag(subtask_with_user, django_capture_on_commit_callbacks):
+    """
+    task 리스트와 subtask 리스트의 ETag 테스트
+    """
+    user, task, subtask = subtask_with_user
+    anonymous = APIClient()
+
+    for url in (reverse("task-list"), reverse("subtask-list", args=[task.pk])):
+        etag = anonymous.get(url)["ETag"]
+        response = anonymous.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    etag = anonymous.get(reverse("task-list"))["ETag"]
+    Task.objects.create(title="새 Task", content="내용", create_user=user)
+    response = anonymous.get(reverse("task-list"), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+    # 작성자의 팀이 바뀌면 task 행은 그대로여도 응답의 team 이 바뀝니다.
+    etag = response["ETag"]
+    with django_capture_on_commit_callbacks(execute=True):
+        user.team = User.TeamChoices.Supie
+        user.save()
+    response = anonymous.get(reverse("task-list"), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert {row["team"] for row in response.data["results"]} == {"Supie"}
+
+
+# Delta sync testcode
+
+
+@pytest.mark.django_db
+def test_task_changes_since_token(subtask_with_user, settings):
+    """
+    since 토큰 이후 변경/삭제된 task, subtask만 내려주는 테스트
+    """
+    settings.TASK_SYNC_OVERLAP_SECONDS = 0
+    user, task, subtask = subtask_with_user
+    url = reverse("task-changes")
+
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["task_pk"] for item in response.data["tasks"]] == [task.pk]
+    assert [item["subtask_pk"] for item in response.data["subtasks"]] == [subtask.pk]
+    since = response.data["next_since"]
+
+    response = client.get(url, {"since": since})
+    assert response.data["tasks"] == []
+    assert response.data["subtasks"] == []
+
+    new_task = Task.objects.create(title="새 Task", content="내용", create_user=user)
+    client.login(username="subtaskuser", password="subtask123")
+    client.delete(reverse("subtask-detail", args=[task.pk, subtask.pk]))
+
+    response = client.get(url, {"since": since})
+    # subtask 삭제로 카운터가 바뀐 task 도 변경분에 포함
+    assert sorted(item["task_pk"] for item in response.data["tasks"]) == sorted(
+        [task.pk, new_task.pk]
+    )
+    assert response.data["deleted"] == {"tasks": [], "subtasks": [subtask.pk]}
+
+
+@pytest.mark.django_db
+def test_task_changes_pages_by_modified_at_and_pk(create_user, settings):
+    """
+    같은 modified_at 인 행도 빠짐없이 limit 개씩 나눠 내려주고,
+    먼저 저장되고 늦게 커밋된 행(이미 지나간 modified_at)도 다음 요청에서 확인하는지 테스트
+    """
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    settings.TASK_SYNC_OVERLAP_SECONDS = 60
+    tasks = make_tasks(create_user, 5)
+    now = timezone.now()
+    Task.objects.update(modified_at=now - timedelta(minutes=10))
+    url = reverse("task-changes")
+
+    pages = []
+    since = None
+    while True:
+        data = client.get(url, {"since": since, "limit": 2} if since else {"limit": 2}).data
+        pages.append([item["task_pk"] for item in data["tasks"]])
+        since = data["next_since"]
+        if not data["has_more"]:
+            break
+    assert pages == [[tasks[0].pk, tasks[1].pk], [tasks[2].pk, tasks[3].pk], [tasks[4].pk]]
+
+    # 동기화 이후에 커밋되었지만 modified_at 은 그보다 이른 행
+    late = make_task(create_user)
+    Task.objects.filter(pk=late.pk).update(modified_at=now - timedelta(seconds=30))
+    data = client.get(url, {"since": since}).data
+    assert [item["task_pk"] for item in data["tasks"]] == [late.pk]
+    assert client.get(url, {"since": "x", "limit": 2}).status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get(url, {"limit": "x"}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_task_delete_records_tombstones(subtask_with_user):
+    """
+    task 삭제 시 task 와 subtask 삭제 기록이 남는지 테스트
+    """
+    from tasks.models import Tombstone
+
+    user, task, subtask = subtask_with_user
+    client.login(username="subtaskuser", password="subtask123")
+    response = client.delete(reverse("task-detail", args=[task.pk]))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert set(Tombstone.objects.values_list("kind", "object_pk")) == {
+        ("task", task.pk),
+        ("subtask", subtask.pk),
+    }
+
+
+@pytest.mark.django_db
+def test_prune_tombstones_and_expired_token(subtask_with_user, settings):
+    """
+    보관 기간이 지난 삭제 기록을 지우고, 그보다 오래된 since 토큰은 거부하는지 테스트
+    """
+    from datetime import timedelta
+
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from tasks.models import Tombstone
+    from tasks.sync import encode_token
+
+    settings.TASK_SYNC_TOMBSTONE_DAYS = 30
+    user, task, subtask = subtask_with_user
+    now = timezone.now()
+    old = Tombstone.objects.record_subtask(subtask)
+    Tombstone.objects.filter(pk=old.pk).update(deleted_at=now - timedelta(days=31))
+    recent = Tombstone.objects.record_task(task)
+
+    call_command("prune_tombstones")
+    assert set(Tombstone.objects.values_list("pk", flat=True)) == {row.pk for row in recent}
+
+    url = reverse("task-changes")
+    positions = {name: (now - timedelta(days=10), 0) for name in ("tasks", "subtasks", "deleted")}
+    assert client.get(url, {"since": encode_token(positions)}).status_code == status.HTTP_200_OK
+    positions["deleted"] = (now - timedelta(days=31), 0)
+    response = client.get(url, {"since": encode_token(positions)})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "만료" in str(response.data["since"])
+
+
+@pytest.mark.django_db
+def test_task_changes_invalid_token():
+    """
+    잘못된 since 토큰으로 조회하는 경우
+    """
+    response = client.get(reverse("task-changes"), {"since": "invalid"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# Export testcode
+
+
+@pytest.mark.django_db
+def test_task_export_streams_ndjson(subtask_with_user):
+    """
+    task export 가 한 줄에 task 하나씩 NDJSON 으로 스트리밍되는지 테스트
+    """
+    import json
+
+    user, task, subtask = subtask_with_user
+    Task.objects.create(title="두번째 Task", content="내용", create_user=user)
+    client.login(username="subtaskuser", password="subtask123")
+
+    response = client.get(reverse("task-export"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    assert [row["task_pk"] for row in rows] == sorted(Task.objects.values_list("pk", flat=True))
+    assert rows[0]["subtasks"][0]["subtask_pk"] == subtask.pk
+    assert sorted(rows[0]["subtasks"][0]["team"]) == ["Danbi", "Supie"]
+    assert rows[1]["subtasks"] == []
+
+
+@pytest.mark.django_db
+def test_task_export_streams_async_iterator_under_asgi(subtask_with_user, monkeypatch):
+    """
+    ASGI 요청에서는 task export 가 async iterator 로 chunk 마다 스트리밍되는지 테스트
+    """
+    import json
+
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient
+
+    from tasks.views import TaskExportView
+
+    user, task, subtask = subtask_with_user
+    make_tasks(user, 2)
+    async_client = AsyncClient()
+    async_client.force_login(user)
+
+    async def export():
+        response = await async_client.get(reverse("task-export"))
+        return response, [chunk async for chunk in response.streaming_content]
+
+    monkeypatch.setattr(TaskExportView, "chunk_size", 2)
+    response, chunks = async_to_sync(export)()
+    assert response.status_code == status.HTTP_200_OK
+    assert response.is_async
+    assert len(chunks) == 2
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [row["task_pk"] for row in rows] == sorted(Task.objects.values_list("pk", flat=True))
+    assert rows[0]["subtasks"][0]["subtask_pk"] == subtask.pk
+
+
+@pytest.mark.django_db
+def test_export_tasks_command(subtask_with_user, tmp_path):
+    """
+    export_tasks management command 테스트
+    """
+    from django.core.management import call_command
+
+    output = tmp_path / "tasks.ndjson"
+    call_command("export_tasks", output=str(output), chunk_size=1)
+    assert len(output.read_text(encoding="utf-8").splitlines()) == 1
+
+
+# Import testcode
+
+
+@pytest.mark.django_db
+def test_import_tasks_ndjson_round_trip(subtask_with_user, tmp_path):
+    """
+    export_tasks 로 내보낸 파일을 import_tasks 로 다시 가져오는지 테스트
+    """
+    from django.core.management import call_command
+
+    user, task, subtask = subtask_with_user
+    path = tmp_path / "tasks.ndjson"
+    call_command("export_tasks", output=str(path))
+
+    call_command("import_tasks", str(path), batch_size=1)
+
+    imported = Task.objects.exclude(pk=task.pk).get()
+    assert imported.title == task.title
+    assert imported.create_user == user
+    assert (imported.subtask_total, imported.subtask_done) == (1, 0)
+    imported_subtask = imported.subtasks.get()
+    assert sorted(imported_subtask.team.values_list("name", flat=True)) == ["Danbi", "Supie"]
+    assert not ImportCheckpoint.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_tasks_csv_and_resume(subtask_with_user, tmp_path):
+    """
+    CSV 가져오기와 checkpoint 이후부터 이어서 가져오는지 테스트
+    """
+    from django.core.management import call_command
+
+    path = tmp_path / "tasks.csv"
+    path.write_text(
+        "task_ref,create_user,title,content,is_complete,sub_title,sub_content,sub_is_complete,team\n"
+        "1,subtaskuser,첫번째,내용,false,하위1,내용,true,Danbi|Supie\n"
+        "1,subtaskuser,첫번째,내용,false,하위2,내용,false,Danbi\n"
+        "2,subtaskuser,두번째,내용,false,,,,\n"
+        "3,nouser,세번째,내용,false,,,,\n"
+        "4,subtaskuser,네번째,내용,false,하위,내용,false,Blue\n",
+        encoding="utf-8",
+    )
+    # 첫 레코드는 이미 가져온 상태로 가정
+    ImportCheckpoint.objects.create(key=str(path), processed=1)
+
+    call_command("import_tasks", str(path), batch_size=2)
+    assert list(Task.objects.filter(title__in=["첫번째", "두번째"]).values_list("title", flat=True)) == ["두번째"]
+
+    call_command("import_tasks", str(path), no_resume=True)
+    first = Task.objects.get(title="첫번째")
+    assert (first.subtask_total, first.subtask_done) == (2, 1)
+    assert not Task.objects.filter(title__in=["세번째", "네번째"]).exists()
+
+
+@pytest.mark.django_db
+def test_import_skips_bad_json_and_dates(subtask_with_user, tmp_path):
+    """
+    JSON 이 잘못된 줄과 잘못된 날짜는 오류로 기록하고 나머지 레코드는 가져오는지 테스트
+    """
+    from tasks.importer import TaskImporter, read_ndjson
+
+    path = tmp_path / "tasks.ndjson"
+    path.write_text(
+        '{"create_user": "subtaskuser", "title": "첫번째"}\n'
+        '{"create_user": "subtaskuser", "title": \n'
+        '{"create_user": "subtaskuser", "title": "날짜", "completed_date": "2023-13-45T00:00:00"}\n'
+        '{"create_user": "subtaskuser", "title": "형식", "completed_date": "어제"}\n'
+        '{"create_user": "subtaskuser", "title": "마지막"}\n',
+        encoding="utf-8",
+    )
+
+    importer = TaskImporter(batch_size=2, checkpoint_key=str(path))
+    with open(path, encoding="utf-8") as file:
+        importer.run(read_ndjson(file))
+
+    assert [error.split(":")[0] for error in importer.errors] == ["2", "3", "4"]
+    assert "잘못된 JSON" in importer.errors[0]
+    titles = Task.objects.filter(title__in=["첫번째", "날짜", "형식", "마지막"]).values_list(
+        "title", flat=True
+    )
+    assert sorted(titles) == ["마지막", "첫번째"]
+    assert not ImportCheckpoint.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_resume_after_crash_does_not_duplicate(subtask_with_user):
+    """
+    batch 가 커밋된 뒤 중단되어도 checkpoint 가 함께 커밋되어 이어서 가져올 때 행이 중복되지 않는지 테스트
+    """
+    from tasks.importer import TaskImporter
+
+    records = [{"create_user": "subtaskuser", "title": f"가져오기 {i}"} for i in range(3)]
+
+    def crash(importer):
+        raise RuntimeError("중단")
+
+    with pytest.raises(RuntimeError):
+        TaskImporter(batch_size=2, checkpoint_key="crash").run(iter(records), on_batch=crash)
+    assert ImportCheckpoint.objects.get(key="crash").processed == 2
+
+    TaskImporter(batch_size=2, checkpoint_key="crash").run(iter(records))
+    titles = Task.objects.filter(title__startswith="가져오기").values_list("title", flat=True)
+    assert sorted(titles) == ["가져오기 0", "가져오기 1", "가져오기 2"]
+    assert not ImportCheckpoint.objects.exists()
+
+
+# Search testcode
+
+
+def search_results(params):
+    response = client.get(reverse("task-search"), params)
+    assert response.status_code == status.HTTP_200_OK
+    return [(row["kind"], row["pk"]) for row in response.data["results"]]
+
+
+@pytest.fixture()
+def search_data(create_user):
+    """
+    Danbi 유저의 task 2개와 subtask(Supie 할당), Supie 유저의 task 1개
+    """
+    supie_user = make_user("supieuser", team=User.TeamChoices.Supie)
+    in_title = Task.objects.create(
+        title="주간 회의 준비", content="자료 정리", create_user=create_user
+    )
+    in_content = Task.objects.create(
+        title="자료 정리", content="다음 주 회의 안건", create_user=create_user
+    )
+    subtask = SubTask.objects.create(
+        task=in_content,
+        subtask_create_user=create_user,
+        sub_title="회의록 작성",
+        sub_content="회의 내용 공유",
+    )
+    subtask.team.set(make_teams(["Supie"]))
+    supie_task = Task.objects.create(
+        title="회의실 예약", content="회의 장소", create_user=supie_user
+    )
+    return in_title, in_content, subtask, supie_task
+
+
+@pytest.mark.django_db
+def test_search_ranked_filtered_and_paginated(search_data):
+    """
+    제목에서 일치한 task 가 먼저 나오고, 팀 필터 / 페이지네이션 / 잘못된 검색어를 처리하는지 테스트
+    """
+    in_title, in_content, subtask, supie_task = search_data
+
+    results = search_results({"q": "회의"})
+    assert results[0] == ("task", in_title.pk)
+    assert set(results) == {
+        ("task", in_title.pk),
+        ("task", in_content.pk),
+        ("subtask", subtask.pk),
+        ("task", supie_task.pk),
+    }
+    # 검색어의 단어를 모두 포함해야 합니다.
+    assert search_results({"q": "회의 안건"}) == [("task", in_content.pk)]
+    assert search_results({"q": "없는단어"}) == []
+
+    response = client.get(reverse("task-search"), {"q": "회의"})
+    row = next(row for row in response.data["results"] if row["kind"] == "subtask")
+    assert (row["task_pk"], row["title"]) == (in_content.pk, "회의록 작성")
+
+    # Supie: 작성자가 Supie 인 task 와 Supie 가 할당된 subtask
+    assert set(search_results({"q": "회의", "team": "Supie"})) == {
+        ("subtask", subtask.pk),
+        ("task", supie_task.pk),
+    }
+    assert search_results({"q": "정리", "team": "Supie"}) == []
+    assert search_results({"q": "회의", "team": "Blue"}) == []
+
+    first_page = client.get(reverse("task-search"), {"q": "회의", "page_size": 2}).data
+    second_page = client.get(
+        reverse("task-search"), {"q": "회의", "page_size": 2, "cursor": first_page["next_cursor"]}
+    ).data
+    assert second_page["next_cursor"] is None
+    assert [
+        (row["kind"], row["pk"]) for row in first_page["results"] + second_page["results"]
+    ] == results
+
+    assert client.get(reverse("task-search"), {"q": " ! "}).status_code == 400
+    assert client.get(reverse("task-search"), {"q": "회의", "cursor": "x"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_search_index_follows_changes(search_data):
+    """
+    수정 / 삭제 / bulk 등록이 검색 색인에 반영되는지 테스트
+    """
+    in_title, in_content, subtask, supie_task = search_data
+
+    in_title.title = "주간 보고"
+    in_title.save()
+    assert ("task", in_title.pk) not in search_results({"q": "회의"})
+    assert search_results({"q": "보고"}) == [("task", in_title.pk)]
+
+    in_content.delete()
+    assert set(search_results({"q": "회의"})) == {("task", supie_task.pk)}
+
+    client.force_authenticate(user=in_title.create_user)
+    response = client.post(
+        reverse("bulk-subtask", args=[in_title.pk]),
+        [{"sub_title": "발표 자료", "team": ["Danbi"]}],
+        format="json",
+    )
+    client.force_authenticate(user=None)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert search_results({"q": "발표"}) == [("subtask", response.data["results"][0]["subtask_pk"])]
+
+
+@pytest.mark.django_db
+def test_search_rebuild_command_and_admin(search_data, django_user_model):
+    """
+    rebuild_search_index 로 색인을 다시 만들고, admin 검색이 색인을 사용하는지 테스트
+    """
+    from django.core.management import call_command
+    from django.db import connection
+
+    from tasks import search
+
+    in_title, in_content, subtask, supie_task = search_data
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {search.Fts5Backend.table}")
+    assert search_results({"q": "회의"}) == []
+
+    call_command("rebuild_search_index")
+    assert len(search_results({"q": "회의"})) == 4
+
+    admin = django_user_model.objects.create_superuser(username="searchadmin", password="admin123")
+    admin_client = APIClient()
+    admin_client.force_login(admin)
+    response = admin_client.get(reverse("admin:tasks_task_changelist"), {"q": "예약"})
+    assert [task.pk for task in response.context["cl"].result_list] == [supie_task.pk]
+    response = admin_client.get(reverse("admin:tasks_subtask_changelist"), {"q": "회의록"})
+    assert [obj.pk for obj in response.context["cl"].result_list] == [subtask.pk]
+
+
+@pytest.mark.django_db
+def test_search_inverted_index_backend(search_data, monkeypatch, django_capture_on_commit_callbacks):
+    """
+    FTS5 가 없을 때 사용하는 메모리 역색인이 같은 문서를 찾고, 커밋된 변경과 팀 변경을 반영하는지 테스트
+    """
+    from tasks import search
+
+    in_title, in_content, subtask, supie_task = search_data
+    queries = [{"q": "회의"}, {"q": "회의 안건"}, {"q": "회의", "team": "Supie"}, {"q": "정리"}]
+    expected = [search_results(params) for params in queries]
+
+    monkeypatch.setattr(search, "search_index", search.InvertedIndexBackend())
+    for params, fts_results in zip(queries, expected):
+        assert set(search_results(params)) == set(fts_results)
+    # 제목에서 일치한 문서가 먼저 나옵니다.
+    assert search_results({"q": "회의"})[0] == ("task", in_title.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        in_title.title = "주간 보고"
+        in_title.save()
+        subtask.team.set(make_teams(["Danbi"]))
+        supie_task.create_user.team = User.TeamChoices.Danbi
+        supie_task.create_user.save()
+    assert search_results({"q": "보고"}) == [("task", in_title.pk)]
+    assert search_results({"q": "회의", "team": "Supie"}) == []
+    assert set(search_results({"q": "회의", "team": "Danbi"})) == {
+        ("task", in_content.pk),
+        ("subtask", subtask.pk),
+        ("task", supie_task.pk),
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        in_content.delete()
+    assert set(search_results({"q": "회의"})) == {("task", supie_task.pk)}
+
+
+@pytest.mark.django_db
+def test_search_index_skips_non_text_saves(search_data, monkeypatch):
+    """
+    제목 / 내용이 바뀐 저장만 다시 색인하고, cascade 삭제는 색인에서 한 번에 지우는지 테스트
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from tasks import search
+
+    in_title, in_content, subtask, supie_task = search_data
+    indexed = []
+    monkeypatch.setattr(search.search_index, "index_tasks", lambda tasks: indexed.extend(tasks))
+    monkeypatch.setattr(search.search_index, "index_subtasks", lambda subtasks: indexed.extend(subtasks))
+
+    task = Task.objects.get(pk=in_title.pk)
+    task.is_complete = True
+    task.save()
+    task.save(update_fields=["modified_at"])
+    loaded_subtask = SubTask.objects.get(pk=subtask.pk)
+    loaded_subtask.is_complete = True
+    loaded_subtask.save()
+    assert indexed == []
+
+    task.title = "주간 보고"
+    task.save()
+    task.save()
+    loaded_subtask.sub_content = "공유 완료"
+    loaded_subtask.save()
+    assert indexed == [task, loaded_subtask]
+
+    SubTask.objects.bulk_create(
+        [
+            SubTask(task=in_content, subtask_create_user=in_content.create_user, sub_title=f"회의 {i}")
+            for i in range(5)
+        ]
+    )
+    with CaptureQueriesContext(connection) as context:
+        in_content.delete()
+    deletes = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith(f"DELETE FROM {search.Fts5Backend.table}")
+    ]
+    # task 한 번, subtask 6개를 한 번
+    assert len(deletes) == 2
+    assert search_results({"q": "안건"}) == []
+    assert [kind for kind, pk in search_results({"q": "회의"})] == ["task", "task"]
+
+
+@pytest.mark.django_db
+def test_search_inverted_index_keeps_writes_during_rebuild(
+    search_data, monkeypatch, django_capture_on_commit_callbacks
+):
+    """
+    메모리 역색인을 처음 만드는 중에 커밋된 변경이 빠지지 않는지 테스트
+    """
+    from tasks import search
+
+    in_title, in_content, subtask, supie_task = search_data
+    backend = search.InvertedIndexBackend()
+    monkeypatch.setattr(search, "search_index", backend)
+    subtask_documents = backend.subtask_documents
+
+    def commit_during_rebuild(subtasks):
+        # task 를 모두 읽은 뒤, subtask 를 읽는 동안 task 제목이 바뀌어 커밋됩니다.
+        if backend.building and in_title.title != "주간 보고":
+            with django_capture_on_commit_callbacks(execute=True):
+                in_title.title = "주간 보고"
+                in_title.save()
+        return subtask_documents(subtasks)
+
+    monkeypatch.setattr(backend, "subtask_documents", commit_during_rebuild)
+    # 첫 검색에서 색인을 만듭니다.
+    assert search_results({"q": "보고"}) == [("task", in_title.pk)]
+    assert backend.built
+    assert ("task", in_title.pk) not in search_results({"q": "회의"})
+
+
+# Async view testcode
+
+
+@pytest.mark.django_db
+def test_async_task_views_match_sync(subtask_with_user):
+    """
+    async 조회 API 가 동기 API 와 같은 응답을 내려주는지 테스트
+    """
+    from django.test import Client
+
+    user, task, subtask = subtask_with_user
+    django_client = Client()
+    django_client.login(username="subtaskuser", password="subtask123")
+
+    pairs = [
+        ("task-list", "async-task-list", {}, {}),
+        ("task-list", "async-task-list", {}, {"team": "Danbi"}),
+        ("task-detail", "async-task-detail", {"task_pk": task.pk}, {}),
+        ("subtask-list", "async-subtask-list", {"task_pk": task.pk}, {}),
+    ]
+    for sync_name, async_name, kwargs, params in pairs:
+        sync_response = django_client.get(reverse(sync_name, kwargs=kwargs), params)
+        async_response = django_client.get(reverse(async_name, kwargs=kwargs), params)
+        assert async_response.status_code == status.HTTP_200_OK
+        assert async_response.json() == sync_response.json()
+
+
+@pytest.mark.django_db
+def test_async_my_task_list(subtask_with_user):
+    """
+    async 내 팀 일정 리스트 API 의 인증과 캐시 공유 테스트
+    """
+    from django.test import Client
+
+    django_client = Client()
+    assert django_client.get(reverse("async-task-team-list")).status_code == 401
+
+    django_client.login(username="subtaskuser", password="subtask123")
+    async_response = django_client.get(reverse("async-task-team-list"))
+    assert async_response.status_code == status.HTTP_200_OK
+    assert async_response["X-Cache"] == "MISS"
+
+    # 동기 view 는 async view 가 만든 payload 를 그대로 사용
+    sync_response = django_client.get(reverse("task-team-list"))
+    assert sync_response["X-Cache"] == "HIT"
+    assert sync_response.json() == async_response.json()
+
+
+@pytest.mark.django_db
+def test_async_task_views_errors():
+    """
+    async 조회 API 의 404, 잘못된 cursor 400 테스트
+    """
+    from django.test import Client
+
+    django_client = Client()
+    response = django_client.get(reverse("async-task-detail", kwargs={"task_pk": 999}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "게시글을 찾을 수 없습니다."}
+    response = django_client.get(reverse("async-subtask-list", kwargs={"task_pk": 999}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = django_client.get(reverse("async-task-list"), {"cursor": "invalid"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"cursor": "잘못된 cursor 입니다."}
+
+
+# Event stream testcode
+
+
+@pytest.fixture()
+def event_subscriber():
+    """
+    테스트용 event loop 에서 broker 를 구독하고, 받은 이벤트 목록을 돌려주는 함수를 제공합니다.
+    """
+    import asyncio
+
+    from tasks.events import broker
+
+    loop = asyncio.new_event_loop()
+    subscribers = []
+
+    def subscribe(team_id):
+        subscriber = broker.subscribe(team_id, loop=loop)
+        subscribers.append(subscriber)
+
+        def received():
+            # call_soon_threadsafe 로 넘어온 콜백을 실행시킨 뒤 큐를 비웁니다.
+            loop.run_until_complete(asyncio.sleep(0))
+            events = []
+            while not subscriber.queue.empty():
+                events.append(subscriber.queue.get_nowait())
+            return events
+
+        return received
+
+    yield subscribe
+    for subscriber in subscribers:
+        broker.unsubscribe(subscriber)
+    loop.close()
+
+
+@pytest.mark.django_db
+def test_subtask_complete_publishes_team_events(
+    subtask_with_user, event_subscriber, django_capture_on_commit_callbacks
+):
+    """
+    subtask 완료 처리 시 task 팀과 subtask 팀 구독자에게 이벤트가 전달되고,
+    마지막 subtask 로 task 완료 여부가 바뀌면 task 이벤트도 전달되는지 테스트
+    """
+    user, task, subtask = subtask_with_user
+    danbi = event_subscriber(Team.objects.get(name="Danbi").pk)
+    supie = event_subscriber(Team.objects.get(name="Supie").pk)
+    other = event_subscriber(Team.objects.get_or_create(name="Darae")[0].pk)
+    client.login(username="subtaskuser", password="subtask123")
+
+    def put(is_complete):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.put(
+                reverse("subtask-detail", args=[task.pk, subtask.pk]),
+                {"is_complete": is_complete},
+                format="json",
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+    put(True)
+    events = danbi()
+    assert [event["type"] for event in events] == ["subtask.completed", "task.completed"]
+    assert events[0]["task_pk"] == task.pk
+    assert events[0]["subtask_pk"] == subtask.pk
+    assert events[1]["task_pk"] == task.pk
+    assert events[1]["is_complete"] is True
+    # subtask 에만 할당된 팀은 task 이벤트를 받지 않습니다.
+    assert [event["type"] for event in supie()] == ["subtask.completed"]
+    assert other() == []
+
+    put(False)
+    assert [event["type"] for event in danbi()] == ["subtask.reopened", "task.reopened"]
+
+
+@pytest.mark.django_db
+def test_task_delete_publishes_one_event_for_cascade(
+    event_subscriber, django_capture_on_commit_callbacks
+):
+    """
+    task 삭제 시 cascade 된 subtask 마다가 아니라 task.deleted 이벤트 하나로 subtask 팀에 전달되는지 테스트
+    """
+    user = make_user("cascadeuser", "cascade123", team=User.TeamChoices.Darae)
+    task = make_task(user, subtasks=3)
+    subtask_pks = sorted(task.subtasks.values_list("pk", flat=True))
+    supie = event_subscriber(Team.objects.get(name="Supie").pk)
+    client.login(username="cascadeuser", password="cascade123")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.delete(reverse("task-detail", args=[task.pk]))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    events = supie()
+    assert [event["type"] for event in events] == ["task.deleted"]
+    assert sorted(events[0]["subtask_pks"]) == subtask_pks
+
+
+@pytest.mark.django_db
+def test_bulk_paths_publish_events(
+    subtask_with_user, event_subscriber, django_capture_on_commit_callbacks
+):
+    """
+    signals 를 거치지 않는 일괄 등록/완료 처리도 이벤트를 발행하는지 테스트
+    """
+    user, task, subtask = subtask_with_user
+    danbi = event_subscriber(Team.objects.get(name="Danbi").pk)
+    supie = event_subscriber(Team.objects.get(name="Supie").pk)
+    client.login(username="subtaskuser", password="subtask123")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            reverse("bulk-subtask", args=[task.pk]),
+            [{"sub_title": "일괄", "team": ["Supie"]}],
+            format="json",
+        )
+        subtask_pks = sorted([subtask.pk, response.data["results"][0]["subtask_pk"]])
+        client.post(
+            reverse("subtask-bulk-complete"),
+            {"subtask_pks": subtask_pks, "is_complete": True},
+            format="json",
+        )
+
+    events = supie()
+    assert [event["type"] for event in events] == ["subtask.created", "subtask.completed"]
+    assert events[1]["subtask_pks"] == subtask_pks
+    # 모든 subtask 가 완료되어 task 도 완료되면 task 팀에 task 이벤트가 전달됩니다.
+    events = danbi()
+    assert [event["type"] for event in events] == [
+        "subtask.created",
+        "subtask.completed",
+        "task.completed",
+    ]
+    assert events[2]["task_pks"] == [task.pk]
+
+
+def test_slow_subscriber_gets_resync():
+    """
+    구독자 큐가 가득 차면 쌓인 이벤트 대신 resync 이벤트만 남는지 테스트
+    """
+    import asyncio
+
+    from tasks.events import Subscriber
+
+    loop = asyncio.new_event_loop()
+    subscriber = Subscriber(team_id=1, loop=loop, maxsize=2)
+    for number in range(3):
+        subscriber.put({"type": "task.updated", "task_pk": number})
+
+    assert subscriber.queue.get_nowait() == {"type": "resync"}
+    assert subscriber.queue.empty()
+    assert subscriber.dropped == 2
+    loop.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_task_event_stream(subtask_with_user):
+    """
+    SSE 엔드포인트가 인증 후 내 팀의 이벤트를 text/event-stream 으로 보내는지 테스트
+    """
+    import asyncio
+    import json
+
+    from asgiref.sync import async_to_sync, sync_to_async
+    from django.test import AsyncClient
+
+    user, task, subtask = subtask_with_user
+    async_client = AsyncClient()
+    async_client.force_login(user)
+
+    def touch_task():
+        Task.objects.get(pk=task.pk).save()
+
+    async def read_stream():
+        response = await async_client.get(reverse("task-events"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/event-stream"
+        stream = response.streaming_content
+        assert (await anext(stream)).startswith(b"retry:")
+
+        next_chunk = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        await sync_to_async(touch_task)()
+        chunk = await asyncio.wait_for(next_chunk, timeout=5)
+        await stream.aclose()
+        return chunk.decode()
+
+    chunk = async_to_sync(read_stream)()
+    lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    assert lines["event"] == "task.updated"
+    assert json.loads(lines["data"])["task_pk"] == task.pk
+
+    anonymous = AsyncClient()
+    assert async_to_sync(anonymous.get)(reverse("task-events")).status_code == 401
+
+
+# Metrics testcode
+
+
+@pytest.mark.django_db
+def test_metrics_middleware_records_queries_per_url_name(subtask_with_user, django_user_model):
+    """
+    URL 이름 별로 쿼리 수가 기록되고, 관리자만 /metrics/ 를 조회할 수 있는지 테스트
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from config.metrics import registry
+
+    user, task, subtask = subtask_with_user
+    registry.clear()
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get(reverse("task-detail", args=[task.pk]))
+    # 다음 요청이 시작되면 connection.queries 가 초기화되므로 미리 세어둡니다.
+    query_count = len(queries)
+    client.get(reverse("subtask-detail", args=[task.pk, subtask.pk]))
+
+    client.login(username="subtaskuser", password="subtask123")
+    assert client.get(reverse("metrics")).status_code == status.HTTP_403_FORBIDDEN
+
+    django_user_model.objects.create_user(
+        username="admin", password="admin123", is_staff=True
+    )
+    client.login(username="admin", password="admin123")
+    response = client.get(reverse("metrics"))
+    assert response.status_code == status.HTTP_200_OK
+    body = response.content.decode()
+
+    assert (
+        f'http_request_db_queries_sum{{endpoint="task-detail",method="GET"}} {query_count}'
+        in body
+    )
+    assert 'http_request_duration_seconds_count{endpoint="subtask-detail",method="GET"} 1' in body
+    assert 'http_request_serialization_duration_seconds_bucket{endpoint="task-detail",method="GET",le="+Inf"} 1' in body
+
+
+# Query budget testcode
+# 엔드포인트 별 쿼리 수 예산: 데이터 크기(2, 8)를 바꿔도 쿼리 수가 같고 예산 이하인지 확인합니다.
+
+
+@pytest.fixture()
+def budget_user(db):
+    user = make_user("budgetuser", "budget123")
+    budget_client = APIClient()
+    budget_client.force_login(user)
+    return user, budget_client
+
+
+def test_query_budget_detects_n_plus_one(db, query_budget):
+    """
+    쿼리 수가 데이터 크기에 따라 늘어나면 실패하는지 테스트 (harness 자체 테스트)
+    """
+
+    def request(count):
+        for _ in range(count):
+            Team.objects.first()
+        return APIClient().get(reverse("task-create"))
+
+    with pytest.raises(QueryBudgetExceeded):
+        query_budget(setup=lambda n: n, request=request, max_queries=100)
+
+
+@pytest.mark.django_db
+def test_budget_task_list(budget_user, query_budget):
+    user, budget_client = budget_user
+    # ETag 집계 1번, task 페이지 1번 (+ 세션, 유저)
+    query_budget(
+        setup=lambda n: make_tasks(user, n, subtasks=2),
+        request=lambda _: budget_client.get(reverse("task-list")),
+        max_queries=4,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_task_list_team(budget_user, query_budget):
+    user, budget_client = budget_user
+    query_budget(
+        setup=lambda n: make_tasks(user, n, subtasks=2),
+        request=lambda _: budget_client.get(reverse("task-list"), {"team": "Supie"}),
+        # 세션, 유저, 팀 조회, ETag 집계 2번, task 페이지, subtask 페이지, subtask 팀 이름 prefetch
+        max_queries=8,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_task_team_list(budget_user, query_budget):
+    user, budget_client = budget_user
+    query_budget(
+        setup=lambda n: make_tasks(user, n, subtasks=2),
+        request=lambda _: budget_client.get(reverse("task-team-list")),
+        max_queries=6,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_task_create(budget_user, query_budget):
+    user, budget_client = budget_user
+    query_budget(
+        setup=lambda n: make_tasks(user, n, subtasks=2),
+        request=lambda _: budget_client.get(reverse("task-create")),
+        max_queries=2,
+    )
+    query_budget(
+        setup=lambda n: make_tasks(user, n, subtasks=2),
+        request=lambda _: budget_client.post(
+            reverse("task-create"), {"title": "새 Task", "content": "내용"}, format="json"
+        ),
+        # 세션, 유저, INSERT, 작성자 팀, 검색 색인
+        max_queries=5,
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_task_changes(budget_user, query_budget):
+    user, budget_client = budget_user
+    query_budget(
+        setup=lambda n: make_tasks(user, n, subtasks=2),
+        request=lambda _: budget_client.get(reverse("task-changes")),
+        max_queries=5,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_task_export(budget_user, query_budget):
+    user, budget_client = budget_user
+    query_budget(
+        setup=lambda n: make_tasks(user, n, subtasks=2),
+        request=lambda _: budget_client.get(reverse("task-export")),
+        max_queries=5,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_subtask_bulk_complete(budget_user, query_budget):
+    user, budget_client = budget_user
+
+    def request(task):
+        return budget_client.post(
+            reverse("subtask-bulk-complete"),
+            {
+                "subtask_pks": list(task.subtasks.values_list("pk", flat=True)),
+                "is_complete": True,
+            },
+            format="json",
+        )
+
+    query_budget(
+        setup=lambda n: make_task(user, n),
+        request=request,
+        max_queries=11,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_task_detail(budget_user, query_budget):
+    user, budget_client = budget_user
+    query_budget(
+        setup=lambda n: make_task(user, n),
+        request=lambda task: budget_client.get(reverse("task-detail", args=[task.pk])),
+        max_queries=6,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_task_detail_write(budget_user, query_budget):
+    user, budget_client = budget_user
+    query_budget(
+        setup=lambda n: make_task(user, n),
+        request=lambda task: budget_client.put(
+            reverse("task-detail", args=[task.pk]), {"title": "수정"}, format="json"
+        ),
+        max_queries=6,
+    )
+
+    # cascade 로 함께 지워지는 subtask 수를 늘려도 쿼리 수가 일정해야 합니다.
+    query_budget(
+        setup=lambda n: make_task(user, n),
+        request=lambda task: budget_client.delete(reverse("task-detail", args=[task.pk])),
+        max_queries=16,
+        status_code=status.HTTP_204_NO_CONTENT,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_subtask_list(budget_user, query_budget):
+    user, budget_client = budget_user
+    query_budget(
+        setup=lambda n: make_task(user, n),
+        request=lambda task: budget_client.get(reverse("subtask-list", args=[task.pk])),
+        max_queries=6,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_new_subtask_get(budget_user, query_budget):
+    user, budget_client = budget_user
+    query_budget(
+        setup=lambda n: make_task(user, n),
+        request=lambda task: budget_client.get(reverse("new-subtask", args=[task.pk])),
+        max_queries=6,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_new_subtask_post(budget_user, query_budget):
+    user, budget_client = budget_user
+    query_budget(
+        setup=lambda n: make_task(user, n),
+        request=lambda task: budget_client.post(
+            reverse("new-subtask", args=[task.pk]),
+            {"sub_title": "새 SubTask", "sub_content": "내용", "team": ["Danbi", "Supie"]},
+            format="json",
+        ),
+        max_queries=16,
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_bulk_subtask(budget_user, query_budget):
+    user, budget_client = budget_user
+
+    def setup(n):
+        return make_task(user), [
+            {"sub_title": f"일괄 {index}", "team": ["Danbi", "Supie"]} for index in range(n)
+        ]
+
+    query_budget(
+        setup=setup,
+        request=lambda data: budget_client.post(
+            reverse("bulk-subtask", args=[data[0].pk]), data[1], format="json"
+        ),
+        max_queries=10,
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_subtask_detail(budget_user, query_budget):
+    user, budget_client = budget_user
+
+    def setup(n):
+        task = make_task(user, n)
+        return task, task.subtasks.first()
+
+    def url(data):
+        return reverse("subtask-detail", args=[data[0].pk, data[1].pk])
+
+    query_budget(
+        setup=setup,
+        request=lambda data: budget_client.get(url(data)),
+        max_queries=6,
+    )
+    query_budget(
+        setup=setup,
+        request=lambda data: budget_client.put(url(data), {"is_complete": True}, format="json"),
+        max_queries=10,
+    )
+    query_budget(
+        setup=setup,
+        request=lambda data: budget_client.delete(url(data)),
+        max_queries=13,
+        status_code=status.HTTP_204_NO_CONTENT,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_admin_subtask_delete_confirmation(django_user_model, query_budget):
+    """
+    admin 에서 subtask 여러 개를 삭제할 때 확인 화면이 SubTask.__str__ 로 목록을 보여주는 경우
+    """
+    admin = django_user_model.objects.create_superuser(username="budgetadmin", password="admin123")
+    admin_client = APIClient()
+    admin_client.force_login(admin)
+
+    def setup(n):
+        return list(make_task(admin, n).subtasks.values_list("pk", flat=True))
+
+    query_budget(
+        setup=setup,
+        request=lambda pks: admin_client.post(
+            reverse("admin:tasks_subtask_changelist"),
+            {"action": "delete_selected", "_selected_action": pks},
+        ),
+        max_queries=12,
+    )
+
+
+@pytest.mark.django_db
+def test_budget_admin_changelists(django_user_model, query_budget):
+    """
+    admin 변경 목록이 행 수와 상관없이 일정한 쿼리로 조회되는지 테스트
+    (show_full_result_count = False 이므로 전체 개수는 다시 세지 않습니다.)
+    """
+    admin = django_user_model.objects.create_superuser(username="budgetadmin", password="admin123")
+    admin_client = APIClient()
+    admin_client.force_login(admin)
+
+    # 세션, 유저, 개수 추정(max pk), 작은 테이블이므로 COUNT(*), 목록 (+ subtask 는 팀 prefetch)
+    for name, max_queries in [("subtask", 6), ("task", 5)]:
+        url = reverse(f"admin:tasks_{name}_changelist")
+        query_budget(
+            setup=lambda n: make_task(admin, n),
+            request=lambda task: admin_client.get(url),
+            max_queries=max_queries,
+        )
+        query_budget(
+            setup=lambda n: make_task(admin, n),
+            request=lambda task: admin_client.get(url, {"is_complete__exact": "0"}),
+            max_queries=max_queries,
+        )
+
+
+@pytest.mark.django_db
+def test_estimated_count_paginator(create_user, monkeypatch):
+    """
+    필터가 없는 큰 목록은 max(pk) 로 추정하고, 필터가 있거나 작은 목록은 정확하게 세는지 테스트
+    """
+    from tasks.pagination import EstimatedCountPaginator
+
+    tasks = make_tasks(create_user, 5)
+    Task.objects.filter(pk=tasks[0].pk).delete()
+
+    paginator = EstimatedCountPaginator(Task.objects.order_by("pk"), 2)
+    assert paginator.count == 4
+
+    monkeypatch.setattr(EstimatedCountPaginator, "exact_count_threshold", 1)
+    paginator = EstimatedCountPaginator(Task.objects.order_by("pk"), 2)
+    assert paginator.count == tasks[-1].pk
+    assert paginator.num_pages == (tasks[-1].pk + 1) // 2
+
+    paginator = EstimatedCountPaginator(Task.objects.filter(is_complete=False).order_by("pk"), 2)
+    assert paginator.count == 4
+
+
+@pytest.mark.django_db
+def test_budget_task_search(budget_user, query_budget):
+    """
+    검색은 테이블 크기와 상관없이 쿼리 한 번 (일치하지 않는 task 를 늘려도 같은 쿼리)
+    """
+    user, budget_client = budget_user
+
+    def setup(n):
+        make_tasks(user, n, subtasks=1)
+        make_task(user, title="분기 결산", content="결산 자료")
+
+    query_budget(
+        setup=setup,
+        request=lambda _: budget_client.get(reverse("task-search"), {"q": "결산", "team": "Danbi"}),
+        # 세션, 유저, 팀 조회, 검색
+        max_queries=4,
+    )
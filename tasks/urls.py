@@ -5,10 +5,23 @@ urlpatterns = [
     path("", views.TaskListView.as_view(), name="task-list"),
     path("myteam/", views.MyTaskListView.as_view(), name="task-team-list"),
     path("create/", views.CreateTaskView.as_view(), name="task-create"),
+    path("changes/", views.TaskChangesView.as_view(), name="task-changes"),
+    path("export/", views.TaskExportView.as_view(), name="task-export"),
+    path("search/", views.TaskSearchView.as_view(), name="task-search"),
+    path(
+        "subtasks/complete/",
+        views.BulkCompleteSubTaskView.as_view(),
+        name="subtask-bulk-complete",
+    ),
     path("<int:task_pk>/", views.TaskDetailView.as_view(), name="task-detail"),
     path("<int:task_pk>/subtasks/", views.SubTaskListView.as_view(), name="subtask-list"),
     path(
         "<int:task_pk>/subtasks/new/", views.NewSubTaskView.as_view(), name="new-subtask"
     ),
+    path(
+        "<int:task_pk>/subtasks/bulk/",
+        views.BulkSubTaskView.as_view(),
+        name="bulk-subtask",
+    ),
     path("<int:task_pk>/subtasks/<int:subtask_pk>/", views.SubTaskDetailView.as_view(), name="subtask-detail"),
 ]
\ No newline at end of file
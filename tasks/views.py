@@ -1,3 +1,9 @@
+from collections import Counter
+
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
 from django.utils import timezone
 
 from rest_framework.views import APIView
@@ -6,15 +12,22 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound
 
-from .models import Task, SubTask
+from . import search
+from .cache import bump_team_versions, get_team_payload, subtask_team_ids, task_team_ids
+from .conditional import etag_condition, requested_team_id, task_etag, task_list_etag
+from .events import publish_event
+from .export import aiter_ndjson, iter_ndjson
+from .models import Task, SubTask, Team, Tombstone
+from .pagination import KeysetPagination, RankedPagination
+from .rows import subtask_list, task_list_rows
+from .sync import collect_changes, decode_token, get_limit
 from .serializers import (
     CreateTaskSerializer,
     TaskSerializer,
     TinyTaskSerializer,
-    TaskListSerializer,
     SubTaskSerializer,
     NewSubTaskSerializer,
-    SubTaskListSerializer,
+    BulkSubTaskSerializer,
 )
 
 
@@ -62,24 +75,41 @@ class MyTaskListView(APIView):
     """
     내가 포함 된 팀의 일정 리스트 API
     GET /api/v1/tasks/list/team/
+    ?task_cursor=, ?subtask_cursor=, ?page_size= 로 다음 페이지 조회
     """
 
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user_team = request.user.team
+        team_id = request.user.team_ref_id
+
+        def build_payload():
+            # 내 팀이 포함된 Task 조회 (읽기 전용이므로 serializer 대신 tasks.rows 로 만듭니다.)
+            task_pagination = KeysetPagination(request, "task_cursor")
+            tasks_my_team = task_pagination.paginate_queryset(
+                Task.objects.for_team_page(team_id).list_values()
+            )
+
+            # 내 팀이 포함된 SubTask 조회
+            subtask_pagination = KeysetPagination(request, "subtask_cursor")
+            subtasks_with_my_team = subtask_pagination.paginate_queryset(
+                SubTask.objects.for_team(team_id).list_values()
+            )
 
-        # 내 팀이 포함된 Task 조회
-        tasks_my_team = Task.objects.filter(create_user__team=user_team).distinct()
-        tasks_serializer = TaskListSerializer(tasks_my_team, many=True)
+            return {
+                "tasks": task_list_rows(tasks_my_team),
+                "subtasks": subtask_list(subtasks_with_my_team),
+                "next_task_cursor": task_pagination.next_cursor,
+                "next_subtask_cursor": subtask_pagination.next_cursor,
+            }
 
-        # 내 팀이 포함된 SubTask 조회
-        subtasks_with_my_team = SubTask.objects.filter(team__name=user_team)
-        subtasks_serializer = SubTaskListSerializer(subtasks_with_my_team, many=True)
+        # 팀 버전이 바뀌지 않았다면 직렬화된 결과를 그대로 사용
+        hit, payload = get_team_payload(team_id, request.query_params, build_payload)
 
         return Response(
-            {"tasks": tasks_serializer.data, "subtasks": subtasks_serializer.data},
+            payload,
             status=status.HTTP_200_OK,
+            headers={"X-Cache": "HIT" if hit else "MISS"},
         )
 
 
@@ -88,37 +118,124 @@ class TaskListView(APIView):
     일정 리스트 API (팀 이름으로 팀 별 일정 리스트 검색 가능)
     GET /api/v1/tasks/list/ : 모든 팀의 일정 리스트
     GET api/v1/tasks/list/?team=팀이름 : 검색한 팀 이름의 일정 리스트
+    ?cursor=, ?task_cursor=, ?subtask_cursor=, ?page_size= 로 다음 페이지 조회
     """
 
     # permission_classes = [IsAuthenticated]
 
+    @etag_condition(task_list_etag)
     def get(self, request):
         team_name = request.query_params.get("team")
 
         if team_name:
+            team_id = requested_team_id(request)
+
             # 특정 팀이 포함된 Task 조회
-            tasks_with_team = Task.objects.filter(create_user__team=team_name)
+            task_pagination = KeysetPagination(request, "task_cursor")
+            tasks_with_team = task_pagination.paginate_queryset(
+                Task.objects.for_team_page(team_id).list_values()
+            )
             # 특정 팀이 포함된 SubTask 조회
-            subtasks_with_team = SubTask.objects.filter(team__name=team_name)
-
-            tasks_serializer = TaskListSerializer(tasks_with_team, many=True)
-            subtasks_serializer = SubTaskListSerializer(subtasks_with_team, many=True)
+            subtask_pagination = KeysetPagination(request, "subtask_cursor")
+            subtasks_with_team = subtask_pagination.paginate_queryset(
+                SubTask.objects.for_team(team_id).list_values()
+            )
 
             return Response(
-                {"tasks": tasks_serializer.data, "subtasks": subtasks_serializer.data},
+                {
+                    "tasks": task_list_rows(tasks_with_team),
+                    "subtasks": subtask_list(subtasks_with_team),
+                    "next_task_cursor": task_pagination.next_cursor,
+                    "next_subtask_cursor": subtask_pagination.next_cursor,
+                },
                 status=status.HTTP_200_OK,
             )
         else:
             # 모든 Task 조회
-            all_tasks = Task.objects.all()
-            tasks_serializer = TaskListSerializer(all_tasks, many=True)
+            pagination = KeysetPagination(request)
+            all_tasks = pagination.paginate_queryset(Task.objects.list_values())
 
             return Response(
-                tasks_serializer.data,
+                {
+                    "results": task_list_rows(all_tasks),
+                    "next_cursor": pagination.next_cursor,
+                },
                 status=status.HTTP_200_OK,
             )
 
 
+class TaskChangesView(APIView):
+    """
+    변경분 동기화 API
+    GET /api/v1/tasks/changes/ : 전체 task, subtask (최초 동기화)
+    GET /api/v1/tasks/changes/?since=토큰 : 토큰 이후 변경/삭제된 task, subtask
+    ?limit= 로 종류마다 한 번에 내려줄 개수를 정합니다. (기본 500, 최대 1000)
+    응답의 next_since 를 다음 요청의 since 로 사용하고, has_more 가 true 이면 바로 이어서 요청합니다.
+    """
+
+    def get(self, request):
+        since = decode_token(request.query_params.get("since"))
+        limit = get_limit(request.query_params)
+        return Response(collect_changes(since, limit), status=status.HTTP_200_OK)
+
+
+class TaskSearchView(APIView):
+    """
+    일정 검색 API (task 제목/내용, subtask 제목/내용)
+    GET /api/v1/tasks/search/?q=검색어 : 검색어의 단어를 모두 포함하는 task, subtask 를 관련도 순으로 조회
+    GET /api/v1/tasks/search/?q=검색어&team=팀이름 : 검색한 팀의 task(작성자의 팀), subtask(할당된 팀)만 조회
+    ?cursor=, ?page_size= 로 다음 페이지 조회
+    """
+
+    def get(self, request):
+        query = request.query_params.get("q", "")
+        if not search.tokenize(query):
+            return Response(
+                {"message": "검색어(q)를 입력해주세요."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        pagination = RankedPagination(request)
+        team_id = None
+        if request.query_params.get("team"):
+            team_id = requested_team_id(request)
+            if team_id is None:
+                # 없는 팀이면 검색하지 않습니다.
+                return Response({"results": [], "next_cursor": None}, status=status.HTTP_200_OK)
+
+        results = pagination.paginate(
+            lambda offset, limit: search.search_index.search(query, team_id, offset, limit)
+        )
+        return Response(
+            {
+                "results": results,
+                "next_cursor": pagination.next_cursor,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class TaskExportView(APIView):
+    """
+    전체 task, subtask 를 NDJSON 으로 내려받는 API
+    GET /api/v1/tasks/export/
+    한 줄에 task 하나(subtask 포함)씩, chunk 단위로 읽으면서 스트리밍합니다.
+    ASGI 서버에서는 동기 iterator 를 메모리에 모두 모은 뒤 보내므로 async iterator 를 사용합니다.
+    """
+
+    permission_classes = [IsAuthenticated]
+    chunk_size = 1000
+
+    def get(self, request):
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_ndjson(chunk_size=self.chunk_size)
+        else:
+            content = iter_ndjson(chunk_size=self.chunk_size)
+        response = StreamingHttpResponse(content, content_type="application/x-ndjson")
+        response["Content-Disposition"] = 'attachment; filename="tasks.ndjson"'
+        return response
+
+
 class TaskDetailView(APIView):
     """
     일정 상세 정보 API
@@ -129,15 +246,17 @@ class TaskDetailView(APIView):
 
     def get_object(self, task_pk):
         try:
-            return Task.objects.get(pk=task_pk)
+            return Task.objects.with_subtask_counts().get(pk=task_pk)
         except Task.DoesNotExist:
             raise NotFound("게시글을 찾을 수 없습니다.")
 
+    @etag_condition(task_etag)
     def get(self, request, task_pk):
         task = self.get_object(task_pk)
         serializer = TaskSerializer(task)
 
-        subtasks = task.subtasks.all()
+        # related manager 로 조회한 subtask 의 task 는 위에서 조회한 task 를 그대로 사용합니다.
+        subtasks = task.subtasks.with_team_names()
         subtask_serializer = SubTaskSerializer(subtasks, many=True)
 
         return Response(
@@ -193,7 +312,9 @@ class TaskDetailView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        task.delete()
+        with transaction.atomic():
+            Tombstone.objects.record_task(task)
+            task.delete()
         return Response(
             {"message": "삭제되었습니다."},
             status=status.HTTP_204_NO_CONTENT,
@@ -206,14 +327,14 @@ class NewSubTaskView(APIView):
     POST /api/v1/tasks/<int:task_pk>/subtasks/new/
     """
 
-    def get_object(self, task_pk):
+    def get_object(self, task_pk, queryset=Task.objects):
         try:
-            return Task.objects.get(pk=task_pk)
+            return queryset.get(pk=task_pk)
         except:
             raise NotFound("게시글을 찾을 수 없습니다.")
 
     def get(self, request, task_pk):
-        task = self.get_object(task_pk)
+        task = self.get_object(task_pk, Task.objects.with_subtasks())
         serializer = TinyTaskSerializer(task)
         message = "sub_title, sub_content, team을 입력해주세요."
         return Response(
@@ -227,7 +348,7 @@ class NewSubTaskView(APIView):
     def post(self, request, task_pk):
         task = self.get_object(task_pk)
 
-        if request.user.team != task.create_user.team:
+        if not request.user.in_team(task.create_user.team_ref_id):
             return Response(
                 {"message": "팀원만 등록할 수 있습니다."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -254,6 +375,129 @@ class NewSubTaskView(APIView):
         )
 
 
+class BulkSubTaskView(APIView):
+    """
+    subtask 일괄 생성 API
+    POST /api/v1/tasks/<int:task_pk>/subtasks/bulk/
+    [{"sub_title": ..., "sub_content": ..., "team": [...]}, ...] 형태로 요청합니다.
+    하나라도 유효하지 않으면 아무것도 생성하지 않고 항목별 에러를 반환합니다.
+    """
+
+    permission_classes = [IsAuthenticated]
+    max_subtasks = 500
+
+    def get_object(self, task_pk):
+        try:
+            return Task.objects.select_related("create_user").get(pk=task_pk)
+        except Task.DoesNotExist:
+            raise NotFound("게시글을 찾을 수 없습니다.")
+
+    def post(self, request, task_pk):
+        task = self.get_object(task_pk)
+
+        if not request.user.in_team(task.create_user.team_ref_id):
+            return Response(
+                {"message": "팀원만 등록할 수 있습니다."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get("subtasks")
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"message": "등록할 subtask 목록을 입력해주세요."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.max_subtasks:
+            return Response(
+                {"message": f"한 번에 최대 {self.max_subtasks}개까지 등록할 수 있습니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = BulkSubTaskSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            return self.error_response(serializer.errors)
+        validated_items = serializer.validated_data
+
+        # 모든 항목의 팀 이름을 한 번의 쿼리로 조회
+        team_names = {name for item in validated_items for name in item["team"]}
+        teams = {team.name: team for team in Team.objects.filter(name__in=team_names)}
+
+        errors = []
+        for item in validated_items:
+            unknown_teams = [name for name in item["team"] if name not in teams]
+            if unknown_teams:
+                errors.append(
+                    {"team": [f"존재하지 않는 팀입니다: {', '.join(unknown_teams)}"]}
+                )
+            else:
+                errors.append({})
+        if any(errors):
+            return self.error_response(errors)
+
+        SubTaskTeam = SubTask.team.through
+        with transaction.atomic():
+            subtasks = SubTask.objects.bulk_create(
+                [
+                    SubTask(
+                        task=task,
+                        subtask_create_user=request.user,
+                        sub_title=item.get("sub_title"),
+                        sub_content=item.get("sub_content"),
+                    )
+                    for item in validated_items
+                ]
+            )
+            SubTaskTeam.objects.bulk_create(
+                [
+                    SubTaskTeam(subtask_id=subtask.pk, team_id=teams[name].pk)
+                    for subtask, item in zip(subtasks, validated_items)
+                    for name in dict.fromkeys(item["team"])
+                ]
+            )
+            # bulk_create 는 signals 를 거치지 않으므로 카운터와 팀 캐시, 검색 색인을 직접 갱신
+            Task.objects.filter(pk=task.pk).update_subtask_counters(total=len(subtasks))
+            search.search_index.index_subtasks(subtasks)
+            team_ids = [task.create_user.team_ref_id, *(team.pk for team in teams.values())]
+            bump_team_versions(team_ids)
+            publish_event(
+                team_ids,
+                {
+                    "type": "subtask.created",
+                    "task_pk": task.pk,
+                    "subtask_pks": [subtask.pk for subtask in subtasks],
+                },
+            )
+
+        return Response(
+            {
+                "results": [
+                    {
+                        "index": index,
+                        "subtask_pk": subtask.pk,
+                        "team": list(dict.fromkeys(item["team"])),
+                        "sub_title": subtask.sub_title,
+                    }
+                    for index, (subtask, item) in enumerate(zip(subtasks, validated_items))
+                ]
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    def error_response(self, errors):
+        return Response(
+            {
+                "results": [
+                    {"index": index, "errors": item_errors}
+                    for index, item_errors in enumerate(errors)
+                    if item_errors
+                ]
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
 class SubTaskListView(APIView):
     """
     task_pk에 해당하는 subtask 리스트 API
@@ -262,13 +506,14 @@ class SubTaskListView(APIView):
 
     def get_object(self, task_pk):
         try:
-            return Task.objects.get(pk=task_pk)
+            return Task.objects.select_related("create_user").get(pk=task_pk)
         except:
             raise NotFound("게시글을 찾을 수 없습니다.")
 
+    @etag_condition(task_etag)
     def get(self, request, task_pk):
         task = self.get_object(task_pk)
-        subtasks = task.subtasks.all()
+        subtasks = task.subtasks.with_team_names()
         serializer = SubTaskSerializer(subtasks, many=True)
         return Response(
             serializer.data,
@@ -284,7 +529,7 @@ class SubTaskDetailView(APIView):
 
     def get_object(self, task_pk, subtask_pk):
         try:
-            return SubTask.objects.get(pk=subtask_pk)
+            return SubTask.objects.with_related().get(pk=subtask_pk)
         except:
             raise NotFound("게시글을 찾을 수 없습니다.")
 
@@ -300,8 +545,8 @@ class SubTaskDetailView(APIView):
         subtask = self.get_object(task_pk, subtask_pk)
 
         if (
-            request.user.team != subtask.task.create_user.team
-            and not subtask.team.filter(name=request.user.team).exists()
+            not request.user.in_team(subtask.task.create_user.team_ref_id)
+            and not subtask.team.filter(pk=request.user.team_ref_id).exists()
         ):
             return Response(
                 {"message": "수정 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN
@@ -336,18 +581,9 @@ class SubTaskDetailView(APIView):
                 else:
                     serializer.validated_data["completed_date"] = None
 
+                # Task 상태는 signals 에서 카운터와 함께 조건부 UPDATE 로 갱신됩니다.
                 serializer.save()
 
-                # Task 상태 업데이트
-                task = subtask.task
-                if all(sub.is_complete for sub in task.subtasks.all()):
-                    task.is_complete = True
-                    task.completed_date = timezone.now()
-                else:
-                    task.is_complete = False
-                    task.completed_date = None
-                task.save()
-
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -355,8 +591,8 @@ class SubTaskDetailView(APIView):
         subtask = self.get_object(task_pk, subtask_pk)
 
         if (
-            request.user.team != subtask.task.create_user.team
-            and not subtask.team.filter(name=request.user.team).exists()
+            not request.user.in_team(subtask.task.create_user.team_ref_id)
+            and not subtask.team.filter(pk=request.user.team_ref_id).exists()
         ):
             return Response(
                 {"message": "삭제 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN
@@ -368,5 +604,130 @@ class SubTaskDetailView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        subtask.delete()
+        with transaction.atomic():
+            Tombstone.objects.record_subtask(subtask)
+            subtask.delete()
         return Response({"message": "삭제되었습니다."}, status=status.HTTP_204_NO_CONTENT)
+
+
+class BulkCompleteSubTaskView(APIView):
+    """
+    subtask 일괄 완료/완료 해제 API
+    POST /api/v1/tasks/subtasks/complete/
+    {"subtask_pks": [1, 2, 3], "is_complete": true}
+    권한 확인은 쿼리 한 번, 변경은 UPDATE 한 번, 상위 task 는 task 별로 한 번씩 갱신합니다.
+    """
+
+    permission_classes = [IsAuthenticated]
+    max_subtasks = 500
+
+    def post(self, request):
+        subtask_pks = request.data.get("subtask_pks")
+        is_complete = request.data.get("is_complete")
+
+        if (
+            not isinstance(subtask_pks, list)
+            or not subtask_pks
+            # bool 은 int 의 하위 클래스이므로 따로 거릅니다.
+            or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in subtask_pks)
+            or not isinstance(is_complete, bool)
+        ):
+            return Response(
+                {"message": "subtask_pks(숫자 목록)와 is_complete(true/false)를 입력해주세요."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(subtask_pks) > self.max_subtasks:
+            return Response(
+                {"message": f"한 번에 최대 {self.max_subtasks}개까지 처리할 수 있습니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        team_id = request.user.team_ref_id
+        if team_id is None:
+            return Response(
+                {"message": "수정 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN
+            )
+        subtask_pks = set(subtask_pks)
+
+        with transaction.atomic():
+            # 읽은 완료 여부로 카운터 증감을 계산하므로, 동시에 같은 subtask 를 바꾸지 못하도록 행을 잠그고 읽습니다.
+            # 권한(task 작성자 팀이거나 subtask 에 할당된 팀)을 한 번의 쿼리로 확인
+            team_assigned = SubTask.team.through.objects.filter(
+                subtask_id=OuterRef("pk"),
+                team_id=team_id,
+            )
+            subtasks = (
+                SubTask.objects.filter(pk__in=subtask_pks)
+                .select_for_update(of=("self",))
+                .annotate(
+                    allowed=ExpressionWrapper(
+                        Q(task__create_user__team_ref_id=team_id) | Exists(team_assigned),
+                        output_field=BooleanField(),
+                    )
+                )
+                .values_list("pk", "task_id", "is_complete", "allowed")
+            )
+
+            found = {pk: (task_id, current, allowed) for pk, task_id, current, allowed in subtasks}
+            missing = sorted(subtask_pks - found.keys())
+            if missing:
+                return Response(
+                    {"message": "SubTask를 찾을 수 없습니다.", "subtask_pks": missing},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            forbidden = sorted(pk for pk, (_, _, allowed) in found.items() if not allowed)
+            if forbidden:
+                return Response(
+                    {"message": "수정 권한이 없습니다.", "subtask_pks": forbidden},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            changed = sorted(
+                pk for pk, (_, current, _) in found.items() if current != is_complete
+            )
+            task_deltas = Counter(found[pk][0] for pk in changed)
+
+            if changed:
+                now = timezone.now()
+                # 완료 여부가 실제로 바뀌는 행만 UPDATE 합니다.
+                SubTask.objects.filter(pk__in=changed, is_complete=not is_complete).update(
+                    is_complete=is_complete,
+                    completed_date=now if is_complete else None,
+                    modified_at=now,
+                )
+                # update() 는 signals 를 거치지 않으므로 task 별로 한 번씩 직접 갱신
+                flipped = Task.objects.complete_subtasks(
+                    {
+                        task_id: count if is_complete else -count
+                        for task_id, count in task_deltas.items()
+                    }
+                )
+                task_teams = list(task_team_ids(task_deltas))
+                team_ids = [*task_teams, *subtask_team_ids(changed)]
+                bump_team_versions(team_ids)
+                publish_event(
+                    team_ids,
+                    {
+                        "type": "subtask.completed" if is_complete else "subtask.reopened",
+                        "task_pks": sorted(task_deltas),
+                        "subtask_pks": changed,
+                    },
+                )
+                if flipped:
+                    publish_event(
+                        task_teams,
+                        {
+                            "type": "task.completed" if is_complete else "task.reopened",
+                            "task_pks": flipped,
+                            "is_complete": is_complete,
+                        },
+                    )
+
+            return Response(
+                {
+                    "updated": changed,
+                    "unchanged": sorted(subtask_pks - set(changed)),
+                    "tasks": sorted(task_deltas),
+                },
+                status=status.HTTP_200_OK,
+            )
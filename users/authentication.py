@@ -0,0 +1,188 @@
+import copy
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from .models import RevokedToken, User
+
+TOKEN_SALT = "users.authentication.token"
+
+
+# 서명된 bearer 토큰
+# 토큰에 유저 pk, 토큰 id(jti), 만료 시각을 담고 SECRET_KEY 로 서명합니다.
+# 서버에 토큰을 저장하지 않으므로 로그아웃한 토큰만 만료될 때까지 DB(RevokedToken)에 남겨 둡니다. (revocation list)
+
+
+def issue_token(user):
+    payload = {
+        "u": user.pk,
+        "j": secrets.token_urlsafe(8),
+        "e": int(time.time()) + settings.TOKEN_MAX_AGE,
+    }
+    return signing.Signer(salt=TOKEN_SALT).sign_object(payload, compress=True)
+
+
+def decode_token(token):
+    """
+    서명과 만료 시각을 확인하고 payload 를 반환합니다. 유효하지 않으면 None
+    """
+    try:
+        payload = signing.Signer(salt=TOKEN_SALT).unsign_object(token)
+    except signing.BadSignature:
+        return None
+    if not isinstance(payload, dict) or payload.get("e", 0) <= time.time():
+        return None
+    return payload
+
+
+def is_revoked(payload):
+    return RevokedToken.objects.filter(jti=payload["j"]).exists()
+
+
+def revoke_token(token):
+    """
+    토큰이 만료될 때까지만 revocation list 에 남겨 둡니다.
+    """
+    payload = decode_token(token)
+    if payload is None:
+        return
+    RevokedToken.objects.filter(expires_at__lte=datetime.now(timezone.utc)).delete()
+    RevokedToken.objects.get_or_create(
+        jti=payload["j"],
+        defaults={"expires_at": datetime.fromtimestamp(payload["e"], timezone.utc)},
+    )
+    token_users.discard(token)
+
+
+class TokenUserCache:
+    """
+    검증한 토큰 → User 를 프로세스 메모리에 보관하는 LRU
+    같은 토큰으로 다시 요청하면 서명 확인과 유저 조회 쿼리를 하지 않습니다.
+    다른 프로세스에서 유저가 바뀔 수 있으므로 ttl 초가 지나면 다시 조회합니다.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, token):
+        with self.lock:
+            entry = self.entries.get(token)
+            if entry is None:
+                return None
+            payload, user, cached_at = entry
+            if time.monotonic() - cached_at > self.ttl or payload["e"] <= time.time():
+                del self.entries[token]
+                return None
+            self.entries.move_to_end(token)
+            return payload, user
+
+    def set(self, token, payload, user):
+        with self.lock:
+            self.entries[token] = (payload, user, time.monotonic())
+            self.entries.move_to_end(token)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def discard(self, token):
+        with self.lock:
+            self.entries.pop(token, None)
+
+    def discard_user(self, user_pk):
+        with self.lock:
+            for token in [
+                token for token, (payload, _, _) in self.entries.items() if payload["u"] == user_pk
+            ]:
+                del self.entries[token]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+token_users = TokenUserCache(
+    maxsize=settings.TOKEN_USER_CACHE_SIZE,
+    ttl=settings.TOKEN_USER_CACHE_TTL,
+)
+
+
+def authenticate_token(token):
+    """
+    토큰의 유저를 반환합니다. 유효하지 않거나 로그아웃한 토큰이면 None
+    요청마다 다른 User 객체를 쓰도록 캐시된 유저의 복사본을 반환합니다.
+    """
+    cached = token_users.get(token)
+    if cached is not None:
+        # 캐시에 있으면 쿼리 없이 인증합니다. 로그아웃하면 이 프로세스의 항목은 바로 지우고,
+        # 다른 프로세스에서 로그아웃한 토큰은 TOKEN_USER_CACHE_TTL 이 지나 다시 확인할 때 거부됩니다.
+        payload, user = cached
+        return copy.copy(user)
+
+    payload = decode_token(token)
+    if payload is None or is_revoked(payload):
+        return None
+    user = User.objects.filter(pk=payload["u"], is_active=True).first()
+    if user is None:
+        return None
+    token_users.set(token, payload, user)
+    return copy.copy(user)
+
+
+def get_bearer_token(request):
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != b"bearer":
+        return None
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed("잘못된 Authorization 헤더입니다.")
+    try:
+        return auth[1].decode()
+    except UnicodeError:
+        raise exceptions.AuthenticationFailed("잘못된 Authorization 헤더입니다.")
+
+
+class BearerTokenAuthentication(BaseAuthentication):
+    """
+    Authorization: Bearer <token>
+    헤더가 없으면 다음 인증(세션)으로 넘어갑니다.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        token = get_bearer_token(request)
+        if token is None:
+            return None
+        user = authenticate_token(token)
+        if user is None:
+            raise exceptions.AuthenticationFailed("유효하지 않은 토큰입니다.")
+        return user, token
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+async def aget_user(request):
+    """
+    async view 용: bearer 토큰이 있으면 토큰으로, 없으면 세션으로 유저를 찾습니다.
+    유효하지 않은 토큰이면 AnonymousUser 를 반환합니다.
+    """
+    from django.contrib.auth.models import AnonymousUser
+
+    try:
+        token = get_bearer_token(request)
+    except exceptions.AuthenticationFailed:
+        return AnonymousUser()
+    if token is None:
+        return await request.auser()
+    user = await sync_to_async(authenticate_token)(token)
+    return user or AnonymousUser()
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from config.metrics import registry
+
+
+class HashingPoolSaturated(Exception):
+    pass
+
+
+class HashingPool:
+    """
+    비밀번호 해시(PBKDF2) 전용 스레드 풀
+    해시는 요청 스레드(이벤트 루프)를 수십 ms 동안 막으므로 workers 개 스레드에서만 실행합니다.
+    실행 중 + 대기 중인 작업이 workers + max_pending 개면 더 받지 않고 HashingPoolSaturated 를 일으킵니다.
+    (대기열이 길어져 모든 요청이 느려지기 전에 429 로 돌려보냅니다.)
+    """
+
+    def __init__(self, workers, max_pending):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.rejected = 0
+
+    def queue_depth(self):
+        with self.lock:
+            return max(0, self.pending - self.running)
+
+    async def run(self, func, *args):
+        with self.lock:
+            if self.pending >= self.workers + self.max_pending:
+                self.rejected += 1
+                raise HashingPoolSaturated()
+            self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._call, func, args
+            )
+        finally:
+            with self.lock:
+                self.pending -= 1
+
+    def _call(self, func, args):
+        with self.lock:
+            self.running += 1
+        # 로그인(authenticate)은 풀의 스레드에서 DB 를 조회하므로, 요청 스레드처럼 오래된 연결을 정리합니다.
+        close_old_connections()
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+            with self.lock:
+                self.running -= 1
+
+
+hashing_pool = HashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+registry.register_gauge(
+    "password_hash_running",
+    "실행 중인 비밀번호 해시 작업 수",
+    lambda: hashing_pool.running,
+)
+registry.register_gauge(
+    "password_hash_queue_depth",
+    "비밀번호 해시 풀에서 대기 중인 작업 수",
+    hashing_pool.queue_depth,
+)
+registry.register_gauge(
+    "password_hash_rejected_total",
+    "풀이 가득 차서 429 로 거절한 요청 수",
+    lambda: hashing_pool.rejected,
+    kind="counter",
+)
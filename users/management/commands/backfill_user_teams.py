@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from tasks.models import Team
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "User.team 문자열 값으로 User.team_ref(Team FK)를 채웁니다. 없는 Team 은 생성합니다."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            team_names = (
+                User.objects.exclude(team="")
+                .order_by()
+                .values_list("team", flat=True)
+                .distinct()
+            )
+            Team.objects.bulk_create(
+                [Team(name=name) for name in team_names],
+                ignore_conflicts=True,
+            )
+            updated = User.objects.update(
+                team_ref=Subquery(
+                    Team.objects.filter(name=OuterRef("team")).values("pk")[:1]
+                )
+            )
+        self.stdout.write(self.style.SUCCESS(f"{updated}명의 유저 팀 정보를 채웠습니다."))
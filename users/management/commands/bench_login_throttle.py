@@ -0,0 +1,46 @@
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+
+from users.throttling import CacheBackend, LoginThrottle, MemoryBackend
+
+
+class Command(BaseCommand):
+    help = (
+        "로그인 시도 제한 벤치마크: backend 별 check 한 번의 비용(µs)을 "
+        "비밀번호 해시(make_password) 한 번과 비교합니다. "
+        "CacheBackend 는 설정된 캐시(CACHE_URL)를 사용합니다. "
+        "기본 locmem 캐시는 300 개가 넘으면 key 를 지우므로 username + IP 수를 그보다 작게 둡니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ops", type=int, default=50_000)
+        parser.add_argument("--keys", type=int, default=200)
+        parser.add_argument("--ips", type=int, default=50)
+
+    def handle(self, *args, **options):
+        ops = options["ops"]
+        keys = options["keys"]
+        ips = options["ips"]
+
+        start = time.perf_counter()
+        make_password("benchpassword")
+        hash_us = (time.perf_counter() - start) * 1_000_000
+        self.stdout.write(f"make_password: {hash_us:,.0f} µs")
+
+        self.stdout.write(f"{'backend':>14} {'check(µs/op)':>14} {'limited':>9} {'vs hash':>9}")
+        for name, backend in [("memory", MemoryBackend()), ("cache", CacheBackend())]:
+            # 제한에 걸리는 시도와 허용되는 시도가 섞이도록 key 마다 limit 보다 많이 시도합니다.
+            throttle = LoginThrottle(backend, username_limit=5, ip_limit=20, window=60)
+            limited = 0
+            start = time.perf_counter()
+            for i in range(ops):
+                if throttle.check(f"benchuser{i % keys}", f"10.0.{i % ips}.1") is not None:
+                    limited += 1
+            check_us = (time.perf_counter() - start) * 1_000_000 / ops
+            self.stdout.write(
+                f"{name:>14} {check_us:>14.2f} {limited:>9} {hash_us / check_us:>8.0f}x"
+            )
+            if isinstance(backend, MemoryBackend):
+                backend.clear()
@@ -23,6 +23,15 @@ class User(AbstractBaseUser, PermissionsMixin):
         choices=TeamChoices.choices,
         default=TeamChoices.Danbi,
     )
+    # 팀 단위 조회는 문자열 대신 정수 FK(team_ref_id)로 필터링합니다.
+    # team 값이 바뀌면 save() 에서 함께 맞춰집니다.
+    team_ref = models.ForeignKey(
+        "tasks.Team",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="members",
+    )
 
     objects = CustomUserManager()
 
@@ -32,5 +41,49 @@ class User(AbstractBaseUser, PermissionsMixin):
     date_joined = models.DateTimeField(auto_now_add=True)
     last_login = models.DateTimeField(auto_now=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_team = instance.__dict__.get("team")
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        team_changed = self.team_ref_id is None or self.team != getattr(
+            self, "_loaded_team", None
+        )
+        previous_team_ref_id = self.team_ref_id
+        if self.team and team_changed and (update_fields is None or "team" in update_fields):
+            Team = self._meta.get_field("team_ref").related_model
+            self.team_ref, _ = Team.objects.get_or_create(name=self.team)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "team_ref"}
+        # 기존 유저의 팀이 바뀌었는지 signals 에서 확인할 수 있도록 남겨둡니다.
+        self._team_ref_changed = (
+            not self._state.adding and previous_team_ref_id != self.team_ref_id
+        )
+        super().save(*args, **kwargs)
+        self._loaded_team = self.team
+
+    def in_team(self, team_id):
+        """
+        같은 팀인지 정수 FK 로 비교합니다. (팀이 연결되지 않은 유저는 항상 False)
+        """
+        return self.team_ref_id is not None and self.team_ref_id == team_id
+
     def __str__(self):
         return self.username
+
+
+class RevokedToken(models.Model):
+    """
+    로그아웃한 bearer 토큰의 id(jti) (users.authentication)
+    캐시는 가득 차면 항목을 지우고 프로세스끼리 공유되지 않을 수 있으므로 DB 에 저장합니다.
+    만료된 토큰은 어차피 거부되므로 revoke_token 에서 함께 지웁니다.
+    """
+
+    jti = models.CharField(max_length=32, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -23,4 +23,10 @@ class SignupSerializer(serializers.ModelSerializer):
             raise ValidationError(
                 "Password must be between 8 and 16 characters long and can only contain letters, numbers and underscores."
             )
-        return make_password(password)
+        return password
+
+    def create(self, validated_data):
+        # SignUpView 는 해시를 hashing pool 에서 계산해서 save(hashed_password=...) 로 넘깁니다.
+        hashed_password = validated_data.pop("hashed_password", None)
+        validated_data["password"] = hashed_password or make_password(validated_data["password"])
+        return super().create(validated_data)
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import token_users
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def discard_cached_token_users(sender, instance, **kwargs):
+    # 팀 변경, 비활성화 등이 토큰 인증에 바로 반영되도록 캐시된 유저를 버립니다.
+    token_users.discard_user(instance.pk)
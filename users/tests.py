@@ -2,18 +2,15 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from tasks.factories import make_user
 from users.models import User
 
 client = APIClient()
 
 
 @pytest.fixture()
-def create_user(django_user_model):
-    return django_user_model.objects.create_user(
-        username="testuser",
-        password="test123",
-        team=User.TeamChoices.Danbi,
-    )
+def create_user(db):
+    return make_user("testuser", "test123")
 
 
 @pytest.mark.django_db
@@ -33,7 +30,7 @@ def test_signup_success(create_user):
     assert User.objects.get(username="newuser").team == User.TeamChoices.Darae
     assert User.objects.filter(username="newuser").exists()
     assert (
-        response.data["message"]
+        response.json()["message"]
         == f"{data['team']} 팀의 {data['username']}님, 회원가입이 완료되었습니다."
     )
 
@@ -52,10 +49,11 @@ def test_signup_failure_invalid_team(create_user):
     response = client.post(url, data, format="json")
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert User.objects.count() == 1
-    assert "team" in response.data
+    assert "team" in response.json()
 
 
-@pytest.mark.django_db
+# 로그인은 hashing pool 의 스레드(별도 DB 연결)에서 유저를 조회하므로 테스트 데이터가 커밋되도록 transaction=True 를 사용합니다.
+@pytest.mark.django_db(transaction=True)
 def test_login_success(create_user):
     """
     성공적인 로그인 테스트
@@ -67,11 +65,11 @@ def test_login_success(create_user):
     }
     response = client.post(url, data, format="json")
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["username"] == "testuser"
-    assert response.data["team"] == User.TeamChoices.Danbi
+    assert response.json()["username"] == "testuser"
+    assert response.json()["team"] == User.TeamChoices.Danbi
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_login_failure(create_user):
     """
     로그인 실패 테스트
@@ -85,6 +83,29 @@ def test_login_failure(create_user):
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+@pytest.mark.django_db(transaction=True)
+def test_login_failure_sends_user_login_failed(create_user):
+    """
+    로그인 실패 시 AUTHENTICATION_BACKENDS 로 인증하고 user_login_failed signal 을 보내는지 테스트
+    """
+    from django.contrib.auth.signals import user_login_failed
+
+    failed = []
+
+    def receiver(sender, credentials, **kwargs):
+        failed.append(credentials["username"])
+
+    user_login_failed.connect(receiver)
+    try:
+        response = client.post(
+            reverse("login"), {"username": "testuser", "password": "wrong"}, format="json"
+        )
+    finally:
+        user_login_failed.disconnect(receiver)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert failed == ["testuser"]
+
+
 @pytest.mark.django_db
 def test_logout(create_user):
     """
@@ -97,3 +118,322 @@ def test_logout(create_user):
     url = reverse("logout")
     response = client.post(url)
     assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_user_team_ref_follows_team(create_user):
+    """
+    team 문자열이 바뀌면 team_ref(Team FK)도 함께 바뀌는지 테스트
+    """
+    assert create_user.team_ref.name == User.TeamChoices.Danbi
+
+    create_user.team = User.TeamChoices.Supie
+    create_user.save()
+    create_user.refresh_from_db()
+    assert create_user.team_ref.name == User.TeamChoices.Supie
+
+
+@pytest.mark.django_db
+def test_backfill_user_teams_command(create_user):
+    """
+    team_ref가 비어있는 유저를 team 문자열로 채우는 테스트
+    """
+    from django.core.management import call_command
+
+    User.objects.update(team_ref=None)
+
+    call_command("backfill_user_teams")
+
+    create_user.refresh_from_db()
+    assert create_user.team_ref.name == User.TeamChoices.Danbi
+
+
+# Token testcode
+
+
+def login_token(username="testuser", password="test123"):
+    response = APIClient().post(
+        reverse("login"), {"username": username, "password": password}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()["token"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_token_authenticated_reads_skip_auth_queries(create_user):
+    """
+    로그인 응답의 토큰으로 인증하고, 두 번째 요청부터는 세션/유저 조회 쿼리가 없는지 테스트
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    token = login_token()
+    token_client = APIClient()
+    token_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    response = token_client.post(
+        reverse("task-create"), {"title": "토큰 Task", "content": "내용"}, format="json"
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["create_user"] == "testuser"
+
+    with CaptureQueriesContext(connection) as queries:
+        response = token_client.get(reverse("task-team-list"))
+    assert response.status_code == status.HTTP_200_OK
+    # 인증 관련 쿼리(세션, 로그아웃한 토큰, 유저 조회)가 하나도 없어야 합니다.
+    # (팀 필터의 하위 쿼리(EXISTS)는 유저 조회가 아니므로 제외합니다.)
+    auth_queries = [
+        query["sql"]
+        for query in queries.captured_queries
+        if 'FROM "django_session"' in query["sql"]
+        or '"users_revokedtoken"' in query["sql"]
+        or query["sql"].startswith('SELECT "users_user"')
+    ]
+    assert auth_queries == []
+
+    # async 조회 API 도 같은 토큰으로 인증합니다.
+    assert token_client.get(reverse("async-task-team-list")).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db(transaction=True)
+def test_token_logout_revokes_token(create_user):
+    """
+    토큰으로 로그아웃하면 같은 토큰을 다시 사용할 수 없는지 테스트
+    """
+    token = login_token()
+    token_client = APIClient()
+    token_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    assert token_client.get(reverse("task-team-list")).status_code == status.HTTP_200_OK
+    assert token_client.post(reverse("logout")).status_code == status.HTTP_200_OK
+
+    response = token_client.get(reverse("task-team-list"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response["WWW-Authenticate"] == "Bearer"
+
+    # 다시 로그인해서 받은 토큰은 사용할 수 있습니다.
+    token_client.credentials(HTTP_AUTHORIZATION=f"Bearer {login_token()}")
+    assert token_client.get(reverse("task-team-list")).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db(transaction=True)
+def test_revoked_token_survives_cache_eviction(create_user):
+    """
+    캐시가 가득 차서 항목이 지워져도 로그아웃한 토큰이 계속 거부되는지 테스트
+    """
+    from django.core.cache import cache
+    from users.authentication import authenticate_token, revoke_token, token_users
+
+    token = login_token()
+    assert authenticate_token(token) is not None
+    revoke_token(token)
+
+    for i in range(400):
+        cache.set(f"tasks:myteam:{i}", i)
+    token_users.clear()
+    assert authenticate_token(token) is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_token_invalid_and_user_changes(create_user):
+    """
+    변조된 토큰은 401, 유저 정보가 바뀌면 캐시된 유저 대신 바뀐 정보로 인증하는지 테스트
+    """
+    token = login_token()
+    token_client = APIClient()
+
+    token_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token[:-2]}xx")
+    assert token_client.get(reverse("task-team-list")).status_code == status.HTTP_401_UNAUTHORIZED
+
+    token_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    assert token_client.get(reverse("task-team-list")).status_code == status.HTTP_200_OK
+
+    create_user.is_active = False
+    create_user.save()
+    assert token_client.get(reverse("task-team-list")).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+# Password hashing pool testcode
+
+
+@pytest.mark.django_db(transaction=True)
+def test_signup_then_login_hashes_in_pool():
+    """
+    hashing pool 에서 계산한 해시로 가입하고 로그인할 수 있는지 테스트
+    """
+    from users.hashing import hashing_pool
+
+    data = {"username": "pooluser", "password": "poolpassword", "team": "Supie"}
+    assert client.post(reverse("signup"), data, format="json").status_code == 201
+    assert User.objects.get(username="pooluser").check_password("poolpassword")
+
+    response = client.post(
+        reverse("login"), {"username": "pooluser", "password": "poolpassword"}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["team"] == "Supie"
+    assert (hashing_pool.pending, hashing_pool.running) == (0, 0)
+
+
+@pytest.mark.django_db
+def test_hashing_pool_saturated_returns_429(create_user, monkeypatch, django_user_model):
+    """
+    해시 풀이 가득 차면 회원가입 / 로그인은 해시 없이 바로 429, 다른 API 는 그대로 동작하는지 테스트
+    """
+    from config.metrics import registry
+    from users.hashing import hashing_pool
+
+    monkeypatch.setattr(hashing_pool, "pending", hashing_pool.workers + hashing_pool.max_pending)
+    rejected = hashing_pool.rejected
+
+    response = client.post(
+        reverse("login"), {"username": "testuser", "password": "test123"}, format="json"
+    )
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response["Retry-After"] == "1"
+    assert "message" in response.json()
+
+    data = {"username": "busyuser", "password": "busypassword"}
+    assert client.post(reverse("signup"), data, format="json").status_code == 429
+    assert not django_user_model.objects.filter(username="busyuser").exists()
+
+    assert client.get(reverse("login")).status_code == status.HTTP_200_OK
+    assert client.get(reverse("task-list")).status_code == status.HTTP_200_OK
+
+    assert hashing_pool.rejected == rejected + 2
+    body = registry.render()
+    assert "# TYPE password_hash_queue_depth gauge" in body
+    assert f"password_hash_rejected_total {rejected + 2}" in body
+
+
+# Login throttle testcode
+
+
+@pytest.mark.django_db(transaction=True)
+def test_login_throttle_per_username(create_user, monkeypatch):
+    """
+    같은 username 으로 LIMIT 회 실패하면 DB 조회와 해시 없이 429, 성공한 시도는 세지 않는지 테스트
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from users.throttling import login_throttle
+
+    monkeypatch.setattr(login_throttle, "username_limit", 3)
+    url = reverse("login")
+
+    # 성공한 로그인은 제한에 쌓이지 않습니다.
+    for _ in range(5):
+        response = client.post(url, {"username": "testuser", "password": "test123"}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+
+    for _ in range(3):
+        response = client.post(url, {"username": "testuser", "password": "wrong"}, format="json")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(url, {"username": "testuser", "password": "test123"}, format="json")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert 1 <= int(response["Retry-After"]) <= login_throttle.window
+    assert "message" in response.json()
+    assert len(queries) == 0
+
+    # 다른 username 은 그대로 로그인할 수 있습니다.
+    make_user("otheruser", "test123")
+    response = client.post(url, {"username": "otheruser", "password": "test123"}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db(transaction=True)
+def test_login_throttle_per_ip(create_user, monkeypatch):
+    """
+    한 IP 에서 여러 username 으로 실패하면 IP 제한으로 429 가 되는지 테스트
+    """
+    from users.throttling import login_throttle
+
+    monkeypatch.setattr(login_throttle, "ip_limit", 4)
+    url = reverse("login")
+
+    for i in range(4):
+        response = client.post(url, {"username": f"nouser{i}", "password": "wrong"}, format="json")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.post(url, {"username": "testuser", "password": "test123"}, format="json")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    response = APIClient(REMOTE_ADDR="10.0.0.2").post(
+        url, {"username": "testuser", "password": "test123"}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.parametrize("backend_path", ["users.throttling.MemoryBackend", "users.throttling.CacheBackend"])
+def test_login_throttle_sliding_window(backend_path):
+    """
+    backend 별로 window 가 지나면 다시 허용하고, refund 한 시도는 세지 않는지 테스트
+    """
+    from django.utils.module_loading import import_string
+
+    backend = import_string(backend_path)()
+    backend.clear()
+    now = 1_000_000.0
+
+    assert backend.hit("username:a", 2, 60, now) == 0
+    assert backend.hit("username:a", 2, 60, now + 1) == 0
+    assert backend.hit("username:a", 2, 60, now + 2) > 0
+    backend.refund("username:a", 60, now + 1)
+    assert backend.hit("username:a", 2, 60, now + 3) == 0
+    assert backend.hit("username:b", 2, 60, now + 3) == 0
+
+    # 두 window 가 지나면 이전 시도는 모두 사라집니다.
+    assert backend.hit("username:a", 2, 60, now + 121) == 0
+    backend.clear()
+
+
+def test_login_throttle_refunds_own_attempt():
+    """
+    성공한 요청은 자신이 기록한 시도를 되돌리고, 그 사이 다른 요청이 기록한 시도는 남기는지 테스트
+    """
+    from users.throttling import MemoryBackend
+
+    backend = MemoryBackend()
+    now = 1_000_000.0
+    backend.hit("username:a", 2, 60, now)
+    backend.hit("username:a", 2, 60, now + 1)
+    # now 에 시작한 요청이 성공: now + 1 의 시도가 남아 있으므로 now + 61 까지 제한됩니다.
+    backend.refund("username:a", 60, now)
+    assert backend.hit("username:a", 2, 60, now + 2) == 0
+    assert backend.hit("username:a", 2, 60, now + 3) == 58
+
+
+def test_throttle_cache_is_separate_from_default_cache():
+    """
+    default 캐시가 가득 차서 항목을 지워도 CacheBackend 의 시도 기록은 남는지 테스트
+    """
+    from django.core.cache import cache
+    from users.throttling import CacheBackend
+
+    backend = CacheBackend()
+    backend.clear()
+    now = 1_000_000.0
+    assert backend.hit("ip:10.0.0.1", 1, 60, now) == 0
+    for i in range(400):
+        cache.set(f"tasks:myteam:{i}", i)
+    assert backend.hit("ip:10.0.0.1", 1, 60, now + 1) > 0
+    backend.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_login_invalid_input_not_throttled(create_user, monkeypatch):
+    """
+    username / password 가 없거나 문자열이 아닌 요청은 400 이고 로그인 시도로 세지 않는지 테스트
+    """
+    from users.throttling import login_throttle
+
+    monkeypatch.setattr(login_throttle, "ip_limit", 2)
+    url = reverse("login")
+    for data in ({"password": "x"}, {"username": "", "password": "x"}, {"username": ["a"], "password": "x"}):
+        response = client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.post(url, {"username": "testuser", "password": "test123"}, format="json")
+    assert response.status_code == status.HTTP_200_OK
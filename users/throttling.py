@@ -0,0 +1,170 @@
+import hashlib
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from django.utils.module_loading import import_string
+
+
+# 로그인 시도 제한 (sliding window)
+# LoginView 는 DB 조회와 비밀번호 해시 전에 확인하므로, 제한된 시도는 해시 비용 없이 바로 429 를 받습니다.
+# backend 는 LOGIN_THROTTLE_BACKEND 로 바꿀 수 있습니다.
+#   MemoryBackend: 프로세스 메모리 (기본, 서버 프로세스마다 따로 셉니다.)
+#   CacheBackend: Django 의 "throttle" 캐시 (THROTTLE_CACHE_URL 로 redis 등을 쓰면 여러 프로세스가 함께 셉니다.)
+# 성공한 시도를 되돌릴 때는 check 에 넘긴 시각(now)으로 그 요청이 기록한 시도를 찾습니다.
+
+
+class MemoryBackend:
+    """
+    key 마다 허용한 시도 시각을 deque 로 보관하는 sliding window log
+    deque 길이는 limit 을 넘지 않으므로 한 번 확인하는 비용은 일정합니다.
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def hit(self, key, limit, window, now):
+        """
+        허용하면 시도를 기록하고 0, 제한되면 다시 시도할 수 있을 때까지의 초를 반환합니다.
+        """
+        with self.lock:
+            hits = self.entries.get(key)
+            if hits is None:
+                if len(self.entries) >= self.max_keys:
+                    self.sweep(window, now)
+                hits = self.entries[key] = deque()
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) >= limit:
+                return hits[0] + window - now
+            hits.append(now)
+            return 0
+
+    def refund(self, key, window, now):
+        """
+        now 에 기록한 시도를 지웁니다. (그 사이 다른 요청이 기록한 시도는 남깁니다.)
+        """
+        with self.lock:
+            hits = self.entries.get(key)
+            try:
+                hits.remove(now)
+            except (AttributeError, ValueError):
+                # 기록이 없거나 window 가 지나 이미 지워진 경우
+                pass
+
+    def sweep(self, window, now):
+        # 기간이 지난 key 를 지우고, 그래도 가득 차 있으면 오래된 key 부터 지웁니다.
+        for key in [key for key, hits in self.entries.items() if not hits or hits[-1] <= now - window]:
+            del self.entries[key]
+        while len(self.entries) >= self.max_keys:
+            del self.entries[next(iter(self.entries))]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class CacheBackend:
+    """
+    Django 캐시를 사용하는 sliding window counter
+    고정 window 두 개(직전, 현재)의 카운트를 직전 window 가 겹치는 비율만큼 더해서 추정합니다.
+    key 하나에 시각 목록 대신 정수 두 개만 저장합니다.
+    default 캐시는 가득 차면 항목을 지우므로(cull) 시도 기록이 사라지지 않도록 전용 "throttle" 캐시를 사용합니다.
+    """
+
+    prefix = "users:throttle"
+
+    def __init__(self, cache=None):
+        self.cache = cache or ConnectionProxy(caches, "throttle")
+
+    def keys(self, key, window, now):
+        digest = hashlib.md5(key.encode()).hexdigest()
+        index = int(now // window)
+        return f"{self.prefix}:{digest}:{index - 1}", f"{self.prefix}:{digest}:{index}"
+
+    def hit(self, key, limit, window, now):
+        previous_key, current_key = self.keys(key, window, now)
+        counts = self.cache.get_many([previous_key, current_key])
+        elapsed = now % window
+        estimated = counts.get(previous_key, 0) * (1 - elapsed / window) + counts.get(current_key, 0)
+        if estimated >= limit:
+            return window - elapsed
+        if not self.cache.add(current_key, 1, timeout=window * 2):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # add 와 incr 사이에 만료된 경우
+                self.cache.set(current_key, 1, timeout=window * 2)
+        return 0
+
+    def refund(self, key, window, now):
+        # now 에 기록한 시도가 있는 window 의 카운트를 줄입니다.
+        _, current_key = self.keys(key, window, now)
+        try:
+            if self.cache.decr(current_key) < 0:
+                self.cache.set(current_key, 0, timeout=window * 2)
+        except ValueError:
+            pass
+
+    def clear(self):
+        # 테스트용: 전용 캐시이므로 전체를 비웁니다.
+        self.cache.clear()
+
+
+class LoginThrottle:
+    """
+    username 별, 클라이언트 IP 별 로그인 시도 제한
+    시도를 먼저 기록하고(check), 로그인에 성공하면 같은 now 로 그 시도를 되돌리므로(succeeded)
+    실패한 시도만 제한에 쌓입니다. 동시에 몰려오는 시도도 해시 전에 제한됩니다.
+    """
+
+    def __init__(self, backend, username_limit, ip_limit, window):
+        self.backend = backend
+        self.username_limit = username_limit
+        self.ip_limit = ip_limit
+        self.window = window
+
+    def check(self, username, ip, now=None):
+        """
+        제한되지 않으면 None, 제한되면 Retry-After 초(정수)를 반환합니다.
+        """
+        if now is None:
+            now = time.time()
+        ip_key = f"ip:{ip}"
+        retry_after = self.backend.hit(ip_key, self.ip_limit, self.window, now)
+        if not retry_after:
+            retry_after = self.backend.hit(
+                f"username:{username}", self.username_limit, self.window, now
+            )
+            if retry_after:
+                # username 에서 제한된 시도는 IP 시도로도 세지 않습니다.
+                self.backend.refund(ip_key, self.window, now)
+        return max(1, math.ceil(retry_after)) if retry_after else None
+
+    def succeeded(self, username, ip, now):
+        """
+        check(username, ip, now) 로 기록한 시도를 되돌립니다.
+        """
+        self.backend.refund(f"ip:{ip}", self.window, now)
+        self.backend.refund(f"username:{username}", self.window, now)
+
+
+def client_ip(request):
+    """
+    프록시 뒤에서 실행한다면 프록시가 REMOTE_ADDR 을 실제 클라이언트 IP 로 넘겨주도록 설정해야 합니다.
+    """
+    return request.META.get("REMOTE_ADDR", "")
+
+
+login_throttle = LoginThrottle(
+    backend=import_string(settings.LOGIN_THROTTLE_BACKEND)(),
+    username_limit=settings.LOGIN_THROTTLE_USERNAME_LIMIT,
+    ip_limit=settings.LOGIN_THROTTLE_IP_LIMIT,
+    window=settings.LOGIN_THROTTLE_WINDOW,
+)
@@ -1,73 +1,150 @@
-from django.contrib.auth import authenticate, login, logout
+import json
+import time
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import alogin, authenticate, logout
+from django.contrib.auth.hashers import make_password
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
+from .authentication import BearerTokenAuthentication, issue_token, revoke_token
+from .hashing import HashingPoolSaturated, hashing_pool
 from .serializers import SignupSerializer
+from .throttling import client_ip, login_throttle
+
+
+def json_response(data, status=status.HTTP_200_OK, **kwargs):
+    return JsonResponse(data, status=status, json_dumps_params={"ensure_ascii": False}, **kwargs)
+
+
+class AsyncPasswordView(View):
+    """
+    비밀번호 해시가 필요한 회원가입 / 로그인 API 의 공통 처리 (async)
+    해시는 hashing_pool 의 전용 스레드에서 실행하므로 요청을 처리하는 스레드(이벤트 루프)를 막지 않고,
+    풀이 가득 차면 해시를 기다리지 않고 바로 429 를 반환합니다.
+    응답 형식은 DRF APIView 일 때와 같고, APIView 처럼 CSRF 검사를 하지 않습니다.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
 
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except HashingPoolSaturated:
+            return json_response(
+                {"message": "요청이 많습니다. 잠시 후 다시 시도해주세요."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": "1"},
+            )
+
+    def get_data(self, request):
+        if request.content_type != "application/json":
+            return request.POST
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
 
-class SignUpView(APIView):
+
+class SignUpView(AsyncPasswordView):
     """
     POST /api/v1/users/signup/
     """
 
-    def get(self, request):
-        return Response(
-            {"message": "username, password, team을 입력해주세요"},
-            status=status.HTTP_200_OK,
-        )
+    async def get(self, request):
+        return json_response({"message": "username, password, team을 입력해주세요"})
 
-    def post(self, request):
-        serializer = SignupSerializer(data=request.data)
-        if serializer.is_valid():
-            user = serializer.save()
-            return Response(
-                {
-                    "user_pk": user.pk,
-                    "username": user.username,
-                    "team": user.team,
-                    "message": f"{user.team} 팀의 {user.username}님, 회원가입이 완료되었습니다.",
-                },
-                status=status.HTTP_201_CREATED,
+    async def post(self, request):
+        data = self.get_data(request)
+        if data is None:
+            return json_response(
+                {"message": "잘못된 요청입니다."}, status=status.HTTP_400_BAD_REQUEST
             )
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+        serializer = SignupSerializer(data=data)
+        if not await sync_to_async(serializer.is_valid)():
+            return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class LoginView(APIView):
+        hashed_password = await hashing_pool.run(
+            make_password, serializer.validated_data["password"]
+        )
+        user = await sync_to_async(serializer.save)(hashed_password=hashed_password)
+        return json_response(
+            {
+                "user_pk": user.pk,
+                "username": user.username,
+                "team": user.team,
+                "message": f"{user.team} 팀의 {user.username}님, 회원가입이 완료되었습니다.",
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class LoginView(AsyncPasswordView):
     """
     POST /api/v1/users/login/
     """
 
-    def get(self, request):
-        return Response(
-            {"message": "username, password를 입력해주세요"},
-            status=status.HTTP_200_OK,
-        )
+    async def get(self, request):
+        return json_response({"message": "username, password를 입력해주세요"})
 
-    def post(self, request):
-        username = request.data.get("username")
-        password = request.data.get("password")
-        if username is None or password is None:
-            return Response(
+    async def post(self, request):
+        data = self.get_data(request) or {}
+        username = data.get("username")
+        password = data.get("password")
+        # 잘못된 요청이 username 없는 시도("username:")로 함께 세지지 않도록 제한보다 먼저 확인합니다.
+        if not (isinstance(username, str) and username and isinstance(password, str) and password):
+            return json_response(
                 {"message": "username, password를 입력해주세요"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        user = authenticate(username=username, password=password)
-        if user is not None:
-            login(request, user)
-            return Response(
-                {
-                    "user_pk": user.pk,
-                    "username": user.username,
-                    "team": user.team,
-                    "message": f"{user.team} 팀의 {user.username}님, 로그인되었습니다.",
-                },
-                status=status.HTTP_200_OK,
+
+        # 제한된 시도는 DB 조회, 비밀번호 해시 없이 바로 돌려보냅니다.
+        ip = client_ip(request)
+        attempted_at = time.time()
+        retry_after = login_throttle.check(username, ip, attempted_at)
+        if retry_after is not None:
+            return json_response(
+                {"message": f"로그인 시도가 너무 많습니다. {retry_after}초 후 다시 시도해주세요."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(retry_after)},
             )
-        return Response(
-            {"message": "username 또는 password가 일치하지 않습니다."},
-            status=status.HTTP_401_UNAUTHORIZED,
+
+        try:
+            # AUTHENTICATION_BACKENDS 의 조회와 비밀번호 해시, 실패 시 user_login_failed signal 까지 풀에서 실행합니다.
+            user = await hashing_pool.run(
+                partial(authenticate, request, username=username, password=password)
+            )
+        except HashingPoolSaturated:
+            # 해시를 하지 못한 시도는 실패로 세지 않습니다.
+            login_throttle.succeeded(username, ip, attempted_at)
+            raise
+        if user is None:
+            return json_response(
+                {"message": "username 또는 password가 일치하지 않습니다."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        login_throttle.succeeded(username, ip, attempted_at)
+
+        # 세션 로그인과 함께, 세션 없이 사용할 수 있는 bearer 토큰을 발급합니다.
+        await alogin(request, user)
+        return json_response(
+            {
+                "user_pk": user.pk,
+                "username": user.username,
+                "team": user.team,
+                "token": issue_token(user),
+                "message": f"{user.team} 팀의 {user.username}님, 로그인되었습니다.",
+            }
         )
 
 
@@ -85,7 +162,11 @@ class LogoutView(APIView):
         )
 
     def post(self, request):
-        logout(request)
+        if isinstance(request.successful_authenticator, BearerTokenAuthentication):
+            # 토큰으로 로그인한 경우 토큰을 만료될 때까지 사용할 수 없게 합니다.
+            revoke_token(request.auth)
+        else:
+            logout(request)
         return Response(
             {"message": "로그아웃되었습니다."},
             status=status.HTTP_200_OK,